@@ -0,0 +1,71 @@
+"""Measure the built-in HashingEmbedder and semantic search over its vectors.
+
+Run with ``python benchmarks/embedding.py`` (needs ``intent-cache-agent[numpy]``).
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from intent_cache_agent.cache import InMemorySemanticCache
+from intent_cache_agent.embedding import HashingEmbedder
+from intent_cache_agent.models import Artifact
+from intent_cache_agent.vector_store import Float32VectorStore, ListVectorStore
+
+CITIES = ["new york", "boston", "san francisco", "chicago", "seattle", "austin", "denver", "miami"]
+
+
+def _items(count: int, rng: random.Random) -> List[Tuple[str, Dict[str, object]]]:
+    return [
+        (
+            rng.choice(["weather", "flights", "hotels"]),
+            {"city": f"{rng.choice(CITIES)} {rng.randrange(count)}", "days": rng.randrange(14)},
+        )
+        for _ in range(count)
+    ]
+
+
+def _time(label: str, fn: Callable[[], object], repeat: int, unit: str = "us") -> None:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    scale = 1e6 if unit == "us" else 1e3
+    print(f"{label:<40} {elapsed * scale:10.1f} {unit}")
+
+
+def main(entries: int = 20_000, queries: int = 50) -> None:
+    rng = random.Random(0)
+    embedder = HashingEmbedder()
+    items = _items(entries, rng)
+
+    _time("embed one (HashingEmbedder.__call__)", lambda: embedder(*items[0]), 2000)
+    start = time.perf_counter()
+    matrix = embedder.embed_batch(items)
+    print(f"{'embed_batch per vector':<40} {(time.perf_counter() - start) / entries * 1e6:10.1f} us")
+
+    near = np.asarray(embedder("weather", {"city": "new york", "days": 3}))
+    variants = [("near duplicate", {"city": "new york city", "days": 3}), ("other city", {"city": "boston", "days": 3})]
+    for label, slots in variants:
+        print(f"{'cosine to ' + label:<40} {float(near @ np.asarray(embedder('weather', slots))):10.3f}")
+
+    artifact = Artifact(type="intent_cache", payload={}, version="v1", scope={}, ttl_seconds=0)
+    probes = [embedder(*item) for item in _items(queries, rng)]
+    for label, store in [("ListVectorStore", ListVectorStore()), ("Float32VectorStore", Float32VectorStore())]:
+        cache = InMemorySemanticCache(embedder, vector_store=store)
+        for row in matrix:
+            cache.add(row.tolist(), artifact)
+        probe = iter(probes * 2)
+        _time(f"search ({label}, {entries} entries)", lambda: cache.search(next(probe), 0.9), queries, unit="ms")
+
+    probe_matrix = np.asarray(probes, dtype=np.float32)
+    rows = iter(probe_matrix)
+    _time(f"numpy matrix @ query ({entries} entries)", lambda: matrix @ next(rows), queries, unit="ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,74 @@
-from .cache import InMemoryExactCache, InMemorySemanticCache
+import importlib
+import importlib.util
+from typing import Any
+
 from .cache import InMemoryExactCache, InMemorySemanticCache
 from .canonicalization import DefaultCanonicalizer, canonicalize_mapping
 from .core import CachedIntentAgent
-from .models import Artifact, CacheOptions, NormalizedIntent
+from .embedding import HashingEmbedder
+from .models import Artifact, CacheHit, CacheOptions, LazyArtifact, NormalizedIntent, SemanticMatch
 from .registry import SimpleIntentRegistry
+from .sharding import HashRing, ShardedExactCache
+from .tracing import LookupOutcome, TraceRecorder, read_trace
+from .upgrades import UpgradeRegistry
+from .vector_store import Float32VectorStore, Int8VectorStore, ListVectorStore, ProductQuantizedVectorStore
+from .write_behind import WriteBehindCache
 
 __all__ = [
     "Artifact",
+    "CacheHit",
     "CachedIntentAgent",
     "InMemoryExactCache",
     "InMemorySemanticCache",
     "NormalizedIntent",
     "DefaultCanonicalizer",
     "CacheOptions",
+    "HashRing",
+    "Float32VectorStore",
+    "HashingEmbedder",
+    "Int8VectorStore",
+    "LazyArtifact",
+    "ListVectorStore",
+    "LookupOutcome",
+    "ProductQuantizedVectorStore",
+    "SemanticMatch",
+    "ShardedExactCache",
     "SimpleIntentRegistry",
+    "TraceRecorder",
+    "UpgradeRegistry",
+    "WriteBehindCache",
     "canonicalize_mapping",
+    "read_trace",
 ]
 
-try:  # optional ADK integration
-    from .adk_agent import IntentCacheAgent  # type: ignore
+# Optional integrations are imported on first attribute access so that
+# ``import intent_cache_agent`` does not pull in google-adk or redis.
+_LAZY_ATTRS = {
+    "IntentCacheAgent": (".adk_agent", "google.adk"),
+    "RedisExactCache": (".redis_cache", "redis"),
+    "ReplicatedSemanticCache": (".redis_replication", "redis"),
+}
+
+for _name, (_module, _dependency) in _LAZY_ATTRS.items():
+    try:
+        if importlib.util.find_spec(_dependency) is not None:
+            __all__.append(_name)
+    except (ImportError, ValueError):
+        pass
+
 
-    __all__.append("IntentCacheAgent")
-except ImportError:
-    pass
+def __getattr__(name: str) -> Any:
+    target = _LAZY_ATTRS.get(name)
+    if target is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        module = importlib.import_module(target[0], __name__)
+    except ImportError as exc:
+        raise AttributeError(f"{name} requires the optional {target[1]!r} dependency") from exc
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
 
-try:  # optional Redis cache integration
-    from .redis_cache import RedisExactCache  # type: ignore
 
-    __all__.append("RedisExactCache")
-except ImportError:
-    pass
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
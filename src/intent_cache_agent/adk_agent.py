@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import json
-from dataclasses import asdict
 from typing import Any, AsyncGenerator, Dict, Optional
 
 from google.adk.agents import BaseAgent
@@ -9,6 +7,7 @@ from google.adk.events import Event
 from google.genai import types
 
 from .core import CachedIntentAgent
+from .serialization import artifact_json
 
 
 class IntentCacheAgent(BaseAgent):
@@ -29,7 +28,7 @@ class IntentCacheAgent(BaseAgent):
         text = _content_to_text(getattr(ctx, "user_content", None))
         context = _extract_context(ctx)
         result = await self.cached_agent.lookup_async(text, context=context)
-        payload = "null" if result is None else json.dumps(asdict(result), ensure_ascii=True)
+        payload = "null" if result is None else artifact_json(result)
         content = types.Content(parts=[types.Part(text=payload)], role="model")
         yield Event(author=self.name, content=content)
 
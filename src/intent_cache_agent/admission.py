@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from typing import Hashable, List
+
+_HALVE = bytes(value >> 1 for value in range(256))
+_SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+_MASK64 = (1 << 64) - 1
+
+
+class CountMinSketch:
+    """Approximate access counter with saturating 4-bit counters and periodic aging.
+
+    After ``sample_size`` increments every counter is halved, so frequencies
+    reflect recent popularity rather than all-time totals (the TinyLFU reset).
+    """
+
+    max_count = 15
+
+    def __init__(self, width: int, depth: int = 4, sample_size: int | None = None) -> None:
+        if not 1 <= depth <= len(_SEEDS):
+            raise ValueError(f"depth must be between 1 and {len(_SEEDS)}")
+        size = 1
+        while size < max(width, 16):
+            size <<= 1
+        self.width = size
+        self.depth = depth
+        self.sample_size = sample_size or 10 * size
+        self._mask = size - 1
+        self._rows: List[bytearray] = [bytearray(size) for _ in range(depth)]
+        self._additions = 0
+
+    def increment(self, item: Hashable) -> None:
+        for row, index in zip(self._rows, self._indexes(item)):
+            if row[index] < self.max_count:
+                row[index] += 1
+        self._additions += 1
+        if self._additions >= self.sample_size:
+            self.age()
+
+    def frequency(self, item: Hashable) -> int:
+        return min(row[index] for row, index in zip(self._rows, self._indexes(item)))
+
+    def age(self) -> None:
+        self._rows = [bytearray(row.translate(_HALVE)) for row in self._rows]
+        self._additions //= 2
+
+    def _indexes(self, item: Hashable) -> List[int]:
+        value = hash(item) & _MASK64
+        return [(((value ^ seed) * seed & _MASK64) >> 32) & self._mask for seed in _SEEDS[: self.depth]]
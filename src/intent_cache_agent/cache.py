@@ -1,74 +1,571 @@
 from __future__ import annotations
 
-import math
+import heapq
+import threading
 import time
-from dataclasses import dataclass
-from typing import Callable, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Collection, Dict, List, Optional, Tuple, cast
 
-from .models import Artifact
+from .admission import CountMinSketch
+from .canonicalization import canonicalize_mapping
+from .indexing import KeyIndex, index_labels
+from .interfaces import VectorStore
+from .models import Artifact, SemanticMatch
+from .key_builder import key_scope
+from .serialization import artifact_json, encode_artifact
+from .vector_store import ListVectorStore
 
+_MISSING = object()
 
-@dataclass
+
+@dataclass(slots=True)
+class PartitionStats:
+    entries: int = 0
+    bytes: int = 0
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass(slots=True)
+class SemanticPartitionStats:
+    """Per-tenant semantic cache counters.
+
+    Searches are not scoped to a tenant, so a miss belongs to no partition
+    and there is no per-tenant miss count or hit ratio.
+    """
+
+    entries: int = 0
+    hits: int = 0
+    evictions: int = 0
+
+
+@dataclass(slots=True)
+class _Partition:
+    order: "OrderedDict[Any, None]" = field(default_factory=OrderedDict)
+    stats: PartitionStats = field(default_factory=PartitionStats)
+    window: "OrderedDict[Any, None]" = field(default_factory=OrderedDict)
+
+
+@dataclass(slots=True)
 class _CacheEntry:
     artifact: Artifact
     expires_at: Optional[float]
+    labels: Tuple[str, ...] = ()
+    partition: Optional[str] = None
+    size: int = 0
 
 
 class InMemoryExactCache:
-    def __init__(self) -> None:
+    """Dict-backed exact cache with optional LRU capacity limits.
+
+    ``partition_by`` names a scope field (typically the tenant id); each
+    partition then gets its own LRU order, ``max_entries_per_partition`` /
+    ``max_bytes_per_partition`` quotas and usage counters, and a partition
+    that exceeds its quota only evicts its own entries. When the global
+    ``max_entries`` is exceeded the largest partition gives up its LRU entry.
+
+    ``admission="tinylfu"`` switches to W-TinyLFU: new keys enter a small
+    window LRU (``window_ratio`` of the capacity) and, when the window
+    overflows into a full partition, a key only displaces the main LRU victim
+    if a count-min sketch of recent accesses says it is requested more often.
+    One-off keys therefore churn through the window instead of flushing
+    frequently reused artifacts.
+
+    ``clock`` replaces ``time.time`` for expiry checks, e.g. to replay traces.
+    Operations hold an internal lock, so pool threads may share the cache.
+    """
+
+    def __init__(
+        self,
+        *,
+        pre_encode: bool = False,
+        max_entries: Optional[int] = None,
+        partition_by: Optional[str] = None,
+        max_entries_per_partition: Optional[int] = None,
+        max_bytes_per_partition: Optional[int] = None,
+        admission: str = "lru",
+        window_ratio: float = 0.01,
+        sketch_width: Optional[int] = None,
+        clock: Optional[Callable[[], float]] = None,
+    ) -> None:
+        if admission not in ("lru", "tinylfu"):
+            raise ValueError("admission must be 'lru' or 'tinylfu'")
         self._store: Dict[str, _CacheEntry] = {}
+        self._pre_encode = pre_encode
+        self._index: KeyIndex[str] = KeyIndex()
+        self._max_entries = max_entries
+        self._partition_by = partition_by
+        self._max_entries_per_partition = max_entries_per_partition
+        self._max_bytes_per_partition = max_bytes_per_partition
+        self._partitions: Dict[Optional[str], _Partition] = {}
+        self._window_ratio = window_ratio
+        self._sketch: Optional[CountMinSketch] = None
+        self._clock = clock
+        self._lock = threading.RLock()
+        if admission == "tinylfu":
+            width = sketch_width or max_entries or (max_entries_per_partition or 256) * 16
+            self._sketch = CountMinSketch(width)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._store)
 
     def get(self, key: str) -> Optional[Artifact]:
-        entry = self._store.get(key)
-        if not entry:
-            return None
-        if entry.expires_at is not None and time.time() >= entry.expires_at:
-            self._store.pop(key, None)
-            return None
-        return entry.artifact
+        with self._lock:
+            if self._sketch is not None:
+                self._sketch.increment(key)
+            entry = self._store.get(key)
+            if not entry:
+                self._record_miss(key)
+                return None
+            if entry.expires_at is not None and self._now() >= entry.expires_at:
+                self.delete(key)
+                self._record_miss(key)
+                return None
+            partition = self._partitions[entry.partition]
+            if key in partition.order:
+                partition.order.move_to_end(key)
+            else:
+                partition.window.move_to_end(key)
+            partition.stats.hits += 1
+            return entry.artifact
+
+    def set(
+        self,
+        key: str,
+        artifact: Artifact,
+        ttl_seconds: Optional[int] = None,
+        *,
+        intent: Optional[str] = None,
+        tags: Collection[str] = (),
+    ) -> None:
+        with self._lock:
+            ttl = ttl_seconds if ttl_seconds is not None else artifact.ttl_seconds
+            expires_at = self._now() + ttl if ttl else None
+            if self._pre_encode:
+                artifact = encode_artifact(artifact)
+            labels = index_labels(intent=intent, scope=artifact.scope, tags=tags, version=artifact.version)
+            self.delete(key)
+            name = _partition_name(self._partition_by, artifact.scope)
+            size = _artifact_size(key, artifact) if self._max_bytes_per_partition is not None else 0
+            self._store[key] = _CacheEntry(
+                artifact=artifact, expires_at=expires_at, labels=labels, partition=name, size=size
+            )
+            self._index.add(key, labels)
+            partition = self._partition(name)
+            if self._sketch is not None:
+                partition.window[key] = None
+            else:
+                partition.order[key] = None
+            partition.stats.entries += 1
+            partition.stats.bytes += size
+            self._enforce_quotas(partition)
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            entry = self._store.pop(key, None)
+            if entry is None:
+                return False
+            self._index.discard(key, entry.labels)
+            partition = self._partitions[entry.partition]
+            if partition.order.pop(key, _MISSING) is _MISSING:
+                del partition.window[key]
+            partition.stats.entries -= 1
+            partition.stats.bytes -= entry.size
+            return True
+
+    def invalidate(
+        self,
+        *,
+        intent: Optional[str] = None,
+        scope: Optional[Dict[str, Any]] = None,
+        tags: Collection[str] = (),
+        version: Optional[str | int] = None,
+    ) -> int:
+        """Delete every entry matching all of the given intent, scope fields, tags and version."""
+
+        with self._lock:
+            keys = self._index.match(index_labels(intent=intent, scope=scope, tags=tags, version=version))
+            for key in keys:
+                self.delete(key)
+            return len(keys)
+
+    def partition_stats(self) -> Dict[Optional[str], PartitionStats]:
+        with self._lock:
+            return {name: replace(partition.stats) for name, partition in self._partitions.items()}
+
+    def _now(self) -> float:
+        return self._clock() if self._clock is not None else time.time()
 
-    def set(self, key: str, artifact: Artifact, ttl_seconds: Optional[int] = None) -> None:
-        ttl = ttl_seconds if ttl_seconds is not None else artifact.ttl_seconds
-        expires_at = time.time() + ttl if ttl else None
-        self._store[key] = _CacheEntry(artifact=artifact, expires_at=expires_at)
+    def _partition(self, name: Optional[str]) -> _Partition:
+        partition = self._partitions.get(name)
+        if partition is None:
+            partition = self._partitions[name] = _Partition()
+        return partition
 
+    def _record_miss(self, key: str) -> None:
+        name = _partition_name(self._partition_by, key_scope(key)) if self._partition_by else None
+        self._partition(name).stats.misses += 1
 
-@dataclass
+    def _enforce_quotas(self, partition: _Partition) -> None:
+        # Without a per-partition quota, each partition sizes its window from
+        # the global limit and admission starts once the whole cache is full.
+        capacity = self._max_entries_per_partition
+        if capacity is None:
+            capacity = self._max_entries
+        if self._sketch is not None and capacity is not None:
+            self._admit(partition, capacity)
+        while partition.stats.entries > 1 and _over_quota(
+            partition.stats, self._max_entries_per_partition, self._max_bytes_per_partition
+        ):
+            self._evict_from(partition)
+        while self._max_entries is not None and len(self._store) > self._max_entries:
+            self._evict_from(max(self._partitions.values(), key=lambda candidate: candidate.stats.entries))
+
+    def _admit(self, partition: _Partition, capacity: int) -> None:
+        sketch = cast(CountMinSketch, self._sketch)
+        window_capacity = max(1, int(capacity * self._window_ratio))
+        while len(partition.window) > window_capacity:
+            candidate = next(iter(partition.window))
+            full = partition.stats.entries > capacity or (
+                self._max_entries is not None and len(self._store) > self._max_entries
+            )
+            if full and partition.order:
+                victim = next(iter(partition.order))
+                if sketch.frequency(candidate) <= sketch.frequency(victim):
+                    self._evict_key(partition, candidate)
+                    continue
+                self._evict_key(partition, victim)
+            del partition.window[candidate]
+            partition.order[candidate] = None
+
+    def _evict_from(self, partition: _Partition) -> None:
+        if not partition.window:
+            self._evict_key(partition, next(iter(partition.order)))
+            return
+        candidate = next(iter(partition.window))
+        if partition.order:
+            victim = next(iter(partition.order))
+            sketch = cast(CountMinSketch, self._sketch)
+            if sketch.frequency(candidate) > sketch.frequency(victim):
+                candidate = victim
+        self._evict_key(partition, candidate)
+
+    def _evict_key(self, partition: _Partition, key: str) -> None:
+        self.delete(key)
+        partition.stats.evictions += 1
+
+
+@dataclass(slots=True)
 class _SemanticEntry:
-    vector: List[float]
     artifact: Artifact
+    expires_at: Optional[float]
+    key: Optional[str] = None
+    intent: Optional[str] = None
+    slots: Optional[Dict[str, Any]] = None
+    labels: Tuple[str, ...] = ()
+    partition: Optional[str] = None
 
 
 class InMemorySemanticCache:
-    def __init__(self, embedder: Callable[[str, Dict[str, object]], List[float]]) -> None:
+    """Brute-force vector search over cached artifacts.
+
+    ``partition_by`` and ``max_entries_per_partition`` bound how many entries
+    one scope value (tenant) may hold; a tenant over quota evicts its own
+    oldest (or least recently hit) entries. Searches are not scoped, so
+    ``partition_stats()`` reports entries, hits and evictions but no misses.
+
+    Lookups purge expired entries and may compact storage, so every
+    operation holds an internal lock; searches from pool threads serialize.
+    """
+
+    def __init__(
+        self,
+        embedder: Callable[[str, Dict[str, object]], List[float]],
+        *,
+        vector_store: Optional[VectorStore] = None,
+        rescore_k: int = 16,
+        max_entries: Optional[int] = None,
+        eviction: str = "lru",
+        compact_ratio: float = 0.25,
+        pre_encode: bool = False,
+        partition_by: Optional[str] = None,
+        max_entries_per_partition: Optional[int] = None,
+    ) -> None:
+        if eviction not in ("lru", "fifo"):
+            raise ValueError("eviction must be 'lru' or 'fifo'")
         self._embedder = embedder
-        self._entries: List[_SemanticEntry] = []
+        self._vectors: VectorStore = vector_store if vector_store is not None else ListVectorStore()
+        self._rescore_k = max(rescore_k, 1)
+        self._max_entries = max_entries
+        self._eviction = eviction
+        self._compact_ratio = compact_ratio
+        self._pre_encode = pre_encode
+        self._entries: List[Optional[_SemanticEntry]] = []
+        self._keys: Dict[str, int] = {}
+        self._order: "OrderedDict[int, None]" = OrderedDict()
+        self._index: KeyIndex[int] = KeyIndex()
+        self._partition_by = partition_by
+        self._max_entries_per_partition = max_entries_per_partition
+        self._partitions: Dict[Optional[str], _Partition] = {}
+        self._tombstones = 0
+        # (expires_at, slot, entry) for entries with a TTL; items for removed entries are skipped when popped.
+        self._expiries: List[Tuple[float, int, _SemanticEntry]] = []
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._order)
+
+    def add(
+        self,
+        vector: List[float],
+        artifact: Artifact,
+        *,
+        key: Optional[str] = None,
+        ttl_seconds: Optional[int] = None,
+        intent: Optional[str] = None,
+        slots: Optional[Dict[str, Any]] = None,
+        tags: Collection[str] = (),
+    ) -> None:
+        with self._lock:
+            ttl = ttl_seconds if ttl_seconds is not None else artifact.ttl_seconds
+            expires_at = time.time() + ttl if ttl else None
+            if self._pre_encode:
+                artifact = encode_artifact(artifact)
+            if key is not None:
+                self.remove(key)
+            labels = index_labels(intent=intent, scope=artifact.scope, tags=tags, version=artifact.version)
+            name = _partition_name(self._partition_by, artifact.scope)
+            slot = self._vectors.add(vector)
+            entry = _SemanticEntry(
+                artifact=artifact,
+                expires_at=expires_at,
+                key=key,
+                intent=intent,
+                slots=canonicalize_mapping(slots) if slots is not None else None,
+                labels=labels,
+                partition=name,
+            )
+            self._entries.append(entry)
+            if expires_at is not None:
+                heapq.heappush(self._expiries, (expires_at, slot, entry))
+            self._order[slot] = None
+            self._index.add(slot, labels)
+            partition = self._partition(name)
+            partition.order[slot] = None
+            partition.stats.entries += 1
+            if key is not None:
+                self._keys[key] = slot
+            self._evict(partition)
+            self._maybe_compact()
+
+    def remove(self, key: str) -> bool:
+        with self._lock:
+            slot = self._keys.get(key)
+            if slot is None:
+                return False
+            self._tombstone(slot)
+            self._maybe_compact()
+            return True
+
+    def invalidate(
+        self,
+        predicate: Optional[Callable[[Artifact], bool]] = None,
+        *,
+        intent: Optional[str] = None,
+        scope: Optional[Dict[str, Any]] = None,
+        tags: Collection[str] = (),
+        version: Optional[str | int] = None,
+    ) -> int:
+        """Drop entries matching all of the given criteria and ``predicate``.
+
+        Intent, scope, tag and version criteria are resolved through the
+        secondary index; a predicate alone scans every live entry.
+        """
+
+        with self._lock:
+            labels = index_labels(intent=intent, scope=scope, tags=tags, version=version)
+            if labels:
+                candidates: Collection[int] = sorted(self._index.match(labels))
+            elif predicate is not None:
+                candidates = list(self._order)
+            else:
+                raise ValueError("invalidate needs a predicate or at least one of intent, scope, tags or version")
+            doomed = [
+                slot
+                for slot in candidates
+                if predicate is None or predicate(cast(_SemanticEntry, self._entries[slot]).artifact)
+            ]
+            for slot in doomed:
+                self._tombstone(slot)
+            self._maybe_compact()
+            return len(doomed)
 
-    def add(self, vector: List[float], artifact: Artifact) -> None:
-        self._entries.append(_SemanticEntry(vector=vector, artifact=artifact))
+    def compact(self) -> None:
+        with self._lock:
+            keep = [slot for slot, entry in enumerate(self._entries) if entry is not None]
+            remap = {old: new for new, old in enumerate(keep)}
+            self._expiries = [
+                (expires_at, remap[slot], entry)
+                for expires_at, slot, entry in self._expiries
+                if self._entries[slot] is entry
+            ]
+            heapq.heapify(self._expiries)
+            self._vectors.compact(keep)
+            self._entries = [self._entries[slot] for slot in keep]
+            self._keys = {key: remap[slot] for key, slot in self._keys.items()}
+            self._order = OrderedDict((remap[slot], None) for slot in self._order)
+            self._index = KeyIndex()
+            for slot, entry in enumerate(self._entries):
+                self._index.add(slot, cast(_SemanticEntry, entry).labels)
+            for partition in self._partitions.values():
+                partition.order = OrderedDict((remap[slot], None) for slot in partition.order)
+            self._tombstones = 0
+
+    def partition_stats(self) -> Dict[Optional[str], SemanticPartitionStats]:
+        with self._lock:
+            return {
+                name: SemanticPartitionStats(partition.stats.entries, partition.stats.hits, partition.stats.evictions)
+                for name, partition in self._partitions.items()
+            }
 
     def embed(self, intent: str, slots: Dict[str, object]) -> List[float]:
         return self._embedder(intent, slots)
 
     def search(self, vector: List[float], min_score: float) -> Optional[Tuple[Artifact, float]]:
-        best_score = -1.0
-        best_artifact: Optional[Artifact] = None
-        for entry in self._entries:
-            score = _cosine_similarity(vector, entry.vector)
-            if score > best_score:
-                best_score = score
-                best_artifact = entry.artifact
-        if best_artifact is None or best_score < min_score:
+        matches = self.search_top_k(vector, min_score, 1)
+        if not matches:
             return None
-        return best_artifact, best_score
-
-
-def _cosine_similarity(a: List[float], b: List[float]) -> float:
-    if not a or not b or len(a) != len(b):
-        return -1.0
-    dot = sum(x * y for x, y in zip(a, b))
-    norm_a = math.sqrt(sum(x * x for x in a))
-    norm_b = math.sqrt(sum(y * y for y in b))
-    if norm_a == 0 or norm_b == 0:
-        return -1.0
-    return dot / (norm_a * norm_b)
+        return matches[0].artifact, matches[0].score
+
+    def search_top_k(self, vector: List[float], min_score: float, k: int) -> List[SemanticMatch]:
+        """Return up to ``k`` matches, best first, recording a hit for the first one only."""
+
+        with self._lock:
+            matches = self.peek_top_k(vector, min_score, k)
+            if matches:
+                self.record_hit(matches[0])
+            return matches
+
+    def peek_top_k(self, vector: List[float], min_score: float, k: int) -> List[SemanticMatch]:
+        """Like ``search_top_k`` but without touching LRU order or hit counts.
+
+        Pass the match a caller actually serves to ``record_hit``.
+        """
+
+        with self._lock:
+            self._purge_expired(time.time())
+            self._maybe_compact()
+            if not self._order or k < 1:
+                return []
+            live = list(self._order)
+            scores = self._vectors.scores(vector)
+            if self._vectors.approximate:
+                candidates = heapq.nlargest(max(self._rescore_k, k), live, key=scores.__getitem__)
+                scores = dict(zip(candidates, self._vectors.rescore(vector, candidates)))
+                best_slots = heapq.nlargest(k, candidates, key=scores.__getitem__)
+            else:
+                best_slots = heapq.nlargest(k, live, key=scores.__getitem__)
+            matches: List[SemanticMatch] = []
+            for slot in best_slots:
+                if scores[slot] < min_score:
+                    break
+                entry = cast(_SemanticEntry, self._entries[slot])
+                matches.append(
+                    SemanticMatch(
+                        artifact=entry.artifact,
+                        score=scores[slot],
+                        intent=entry.intent,
+                        slots=entry.slots,
+                        handle=(slot, entry),
+                    )
+                )
+            return matches
+
+    def record_hit(self, match: SemanticMatch) -> None:
+        """Count ``match`` as served and, with LRU eviction, mark it recently used."""
+
+        with self._lock:
+            if match.handle is None:
+                return
+            slot, entry = match.handle
+            # The entry may have been removed or the store compacted since the search.
+            if slot >= len(self._entries) or self._entries[slot] is not entry:
+                return
+            partition = self._partitions[entry.partition]
+            partition.stats.hits += 1
+            if self._eviction == "lru":
+                self._order.move_to_end(slot)
+                partition.order.move_to_end(slot)
+
+    def _purge_expired(self, now: float) -> None:
+        expiries = self._expiries
+        while expiries and expiries[0][0] <= now:
+            _, slot, entry = heapq.heappop(expiries)
+            if self._entries[slot] is entry:
+                self._tombstone(slot)
+
+    def _partition(self, name: Optional[str]) -> _Partition:
+        partition = self._partitions.get(name)
+        if partition is None:
+            partition = self._partitions[name] = _Partition()
+        return partition
+
+    def _evict(self, partition: _Partition) -> None:
+        quota = self._max_entries_per_partition
+        over_quota = quota is not None and len(partition.order) > quota
+        over_capacity = self._max_entries is not None and len(self._order) > self._max_entries
+        if not over_quota and not over_capacity:
+            return
+        self._purge_expired(time.time())
+        while quota is not None and len(partition.order) > quota:
+            self._evict_from(partition)
+        while self._max_entries is not None and len(self._order) > self._max_entries:
+            self._evict_from(max(self._partitions.values(), key=lambda candidate: len(candidate.order)))
+
+    def _evict_from(self, partition: _Partition) -> None:
+        self._tombstone(next(iter(partition.order)))
+        partition.stats.evictions += 1
+
+    def _tombstone(self, slot: int) -> None:
+        entry = self._entries[slot]
+        if entry is None:
+            return
+        if entry.key is not None and self._keys.get(entry.key) == slot:
+            del self._keys[entry.key]
+        self._index.discard(slot, entry.labels)
+        partition = self._partitions[entry.partition]
+        del partition.order[slot]
+        partition.stats.entries -= 1
+        self._entries[slot] = None
+        self._order.pop(slot, None)
+        self._tombstones += 1
+
+    def _maybe_compact(self) -> None:
+        if self._tombstones and self._tombstones >= self._compact_ratio * len(self._entries):
+            self.compact()
+
+
+def _partition_name(partition_by: Optional[str], scope: Optional[Dict[str, Any]]) -> Optional[str]:
+    if partition_by is None or not scope or scope.get(partition_by) is None:
+        return None
+    return str(scope[partition_by])
+
+
+def _over_quota(stats: PartitionStats, max_entries: Optional[int], max_bytes: Optional[int]) -> bool:
+    if max_entries is not None and stats.entries > max_entries:
+        return True
+    return max_bytes is not None and stats.bytes > max_bytes
+
+
+def _artifact_size(key: str, artifact: Artifact) -> int:
+    return len(key) + len(artifact.encoded_json or artifact_json(artifact))
+
@@ -1,13 +1,35 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import inspect
-from dataclasses import replace
-from typing import Any, Awaitable, Dict, Optional, cast
+import logging
+import time
+from concurrent.futures import Executor
+from functools import partial
+from typing import Any, Awaitable, Callable, Collection, Dict, List, Optional, Set, cast
 
 from .canonicalization import DefaultCanonicalizer
 from .interfaces import Canonicalizer, ExactCache, IntentRegistry, Normalizer, SemanticCache
 from .key_builder import build_cache_key
-from .models import Artifact, CacheOptions, NormalizedIntent
+from .models import Artifact, CacheHit, CacheOptions, NormalizedIntent, SemanticMatch
+from .normalizers import CascadeNormalizer
+from .resilience import CircuitBreaker, LatencyBudget
+from .tracing import LookupOutcome, LookupTrace, TraceRecorder, elapsed_us
+from .upgrades import UpgradeRegistry
+
+OFFLOAD_STAGES = frozenset({"normalize", "exact_get", "exact_set", "embed", "search"})
+DEFAULT_OFFLOAD_STAGES = frozenset({"exact_get", "embed", "search"})
+_TRACE_SCORE_FLOOR = -1.0
+_STAGE_TIERS = {
+    "normalize": "normalizer",
+    "exact_get": "exact_cache",
+    "exact_set": "exact_cache",
+    "embed": "semantic_cache",
+    "search": "semantic_cache",
+}
+_SKIPPED = object()
+_log = logging.getLogger(__name__)
 
 
 class CachedIntentAgent:
@@ -20,13 +42,44 @@ class CachedIntentAgent:
         exact_cache: ExactCache,
         semantic_cache: Optional[SemanticCache] = None,
         default_options: Optional[CacheOptions] = None,
+        executor: Optional[Executor] = None,
+        offload_stages: Collection[str] = DEFAULT_OFFLOAD_STAGES,
+        max_concurrent_offloads: Optional[int] = None,
+        trace_recorder: Optional[TraceRecorder] = None,
+        breaker_failure_threshold: int = 5,
+        breaker_cooldown_seconds: float = 30.0,
+        upgrades: Optional[UpgradeRegistry] = None,
     ) -> None:
+        unknown = set(offload_stages) - OFFLOAD_STAGES
+        if unknown:
+            raise ValueError(f"unknown offload stages: {sorted(unknown)}")
         self._normalizer = normalizer
         self._canonicalizer = canonicalizer
         self._registry = registry
         self._exact_cache = exact_cache
         self._semantic_cache = semantic_cache
         self._default_options = default_options or CacheOptions()
+        self._executor = executor
+        self._offload_stages = frozenset(offload_stages)
+        self._max_concurrent_offloads = max_concurrent_offloads
+        self._offload_slots: Optional[asyncio.Semaphore] = None
+        self._offload_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._trace_recorder = trace_recorder
+        self._upgrades = upgrades
+        self._background: Set[asyncio.Future[Any]] = set()
+        self._breakers = {
+            tier: CircuitBreaker(breaker_failure_threshold, breaker_cooldown_seconds)
+            for tier in sorted(set(_STAGE_TIERS.values()))
+        }
+
+    @property
+    def circuit_breakers(self) -> Dict[str, CircuitBreaker]:
+        """Breakers keyed by tier: ``normalizer``, ``exact_cache`` and ``semantic_cache``."""
+
+        return dict(self._breakers)
+
+    def breaker_stats(self) -> Dict[str, Dict[str, object]]:
+        return {tier: breaker.stats() for tier, breaker in self._breakers.items()}
 
     def lookup(
         self,
@@ -34,104 +87,542 @@ class CachedIntentAgent:
         *,
         context: Optional[Dict[str, Any]] = None,
         options: Optional[CacheOptions] = None,
+    ) -> Optional[Artifact]:
+        if self._trace_recorder is None:
+            return self._lookup(text, context, options, None)
+        trace = LookupTrace(timestamp=time.time())
+        result = self._lookup(text, context, options, trace)
+        self._trace_recorder.record(trace)
+        return result
+
+    async def lookup_async(
+        self,
+        text: str,
+        *,
+        context: Optional[Dict[str, Any]] = None,
+        options: Optional[CacheOptions] = None,
+    ) -> Optional[Artifact]:
+        if self._trace_recorder is None:
+            return await self._lookup_async(text, context, options, None)
+        trace = LookupTrace(timestamp=time.time())
+        result = await self._lookup_async(text, context, options, trace)
+        self._trace_recorder.record(trace)
+        return result
+
+    def _lookup(
+        self,
+        text: str,
+        context: Optional[Dict[str, Any]],
+        options: Optional[CacheOptions],
+        trace: Optional[LookupTrace],
     ) -> Optional[Artifact]:
         resolved = options or self._default_options
         if resolved.cache_bypass:
+            _set_outcome(trace, LookupOutcome.BYPASS)
             return None
-        normalized = self._normalizer.normalize(text, context)
+        budget = _budget(resolved)
+        started = time.perf_counter()
+        normalized = self._call_sync("normalize", budget, _SKIPPED, self._normalizer.normalize, text, context)
         if inspect.isawaitable(normalized):
             raise RuntimeError("Async normalizer detected. Use lookup_async instead.")
+        if trace is not None:
+            trace.normalize_us = elapsed_us(started)
+        if normalized is _SKIPPED:
+            _set_outcome(trace, LookupOutcome.DEGRADED)
+            return None
         if not normalized:
+            _set_outcome(trace, LookupOutcome.NO_INTENT)
             return None
 
         if not self._registry.is_allowed(normalized.intent):
+            _set_outcome(trace, LookupOutcome.REJECTED, intent=normalized.intent)
             return None
-        if not self._registry.validate_slots(normalized.intent, normalized.slots):
+        slots = _checked_slots(self._registry, normalized)
+        if slots is None:
+            _set_outcome(trace, LookupOutcome.REJECTED, intent=normalized.intent)
             return None
 
-        canonical = self._canonicalizer.canonicalize(normalized.intent, normalized.slots)
+        canonical = self._canonicalizer.canonicalize(normalized.intent, slots)
+        scope = resolved.scope or context
         key = build_cache_key(
             intent=canonical.intent,
             slots=canonical.slots,
-            scope=resolved.scope or context,
+            scope=scope,
             artifact_type=resolved.artifact_type,
             schema_version=resolved.schema_version,
         )
+        if trace is not None:
+            trace.key, trace.intent, trace.scope = key, canonical.intent, scope
 
-        exact_hit = self._exact_cache.get(key)
+        started = time.perf_counter()
+        exact_hit = self._call_sync("exact_get", budget, None, self._exact_cache.get, key)
+        if not exact_hit:
+            for version, old_key in self._fallback_keys(canonical, scope, resolved):
+                upgraded = self._upgrade(
+                    self._call_sync("exact_get", budget, None, self._exact_cache.get, old_key), version, resolved
+                )
+                if upgraded is not None:
+                    # Best effort: a failed write-back only means the next lookup upgrades again.
+                    with contextlib.suppress(Exception):
+                        self._call_sync("exact_set", None, None, self._exact_cache.set, key, upgraded)
+                    if trace is not None:
+                        trace.exact_us = elapsed_us(started)
+                    _set_outcome(trace, LookupOutcome.EXACT_HIT)
+                    return _with_provenance(upgraded, source="upgrade", key=old_key, score=None)
+        if trace is not None:
+            trace.exact_us = elapsed_us(started)
         if exact_hit:
+            _set_outcome(trace, LookupOutcome.EXACT_HIT)
             return _with_provenance(exact_hit, source="cache", key=key, score=None)
 
         if not resolved.enable_semantic or self._semantic_cache is None:
+            _set_outcome(trace, LookupOutcome.MISS)
             return None
 
-        vector = self._semantic_cache.embed(canonical.intent, canonical.slots)
-        semantic_hit = self._semantic_cache.search(vector, resolved.min_score)
+        started = time.perf_counter()
+        semantic_cache = self._semantic_cache
+        vector = self._call_sync("embed", budget, None, semantic_cache.embed, canonical.intent, canonical.slots)
+        semantic_hit = None if vector is None else self._semantic_search(vector, canonical, resolved, trace, budget)
+        if trace is not None:
+            trace.semantic_us = elapsed_us(started)
         if not semantic_hit:
+            _set_outcome(trace, LookupOutcome.MISS)
             return None
 
         artifact, score = semantic_hit
+        _set_outcome(trace, LookupOutcome.SEMANTIC_HIT)
         return _with_provenance(artifact, source="semantic", key=key, score=score)
 
-    async def lookup_async(
+    async def _lookup_async(
         self,
         text: str,
-        *,
-        context: Optional[Dict[str, Any]] = None,
-        options: Optional[CacheOptions] = None,
+        context: Optional[Dict[str, Any]],
+        options: Optional[CacheOptions],
+        trace: Optional[LookupTrace],
     ) -> Optional[Artifact]:
         resolved = options or self._default_options
         if resolved.cache_bypass:
+            _set_outcome(trace, LookupOutcome.BYPASS)
             return None
 
-        normalized = await _normalize_async(self._normalizer, text, context)
+        budget = _budget(resolved)
+        started = time.perf_counter()
+        probe = None
+        if isinstance(self._normalizer, CascadeNormalizer):
+            normalized, probe = await self._normalize_cascade(self._normalizer, text, context, resolved, budget)
+        else:
+            normalized = await self._call_backend(
+                "normalize", self._normalizer, "normalize", text, context, budget=budget, default=_SKIPPED
+            )
+        if trace is not None:
+            trace.normalize_us = elapsed_us(started)
+        if probe is not None:
+            hit, key, canonical, scope = probe
+            if trace is not None:
+                trace.key, trace.intent, trace.scope = key, canonical.intent, scope
+            _set_outcome(trace, LookupOutcome.EXACT_HIT)
+            return _with_provenance(hit, source="cache", key=key, score=None)
+        if normalized is _SKIPPED:
+            _set_outcome(trace, LookupOutcome.DEGRADED)
+            return None
         if not normalized:
+            _set_outcome(trace, LookupOutcome.NO_INTENT)
             return None
 
         if not self._registry.is_allowed(normalized.intent):
+            _set_outcome(trace, LookupOutcome.REJECTED, intent=normalized.intent)
             return None
-        if not self._registry.validate_slots(normalized.intent, normalized.slots):
+        slots = _checked_slots(self._registry, normalized)
+        if slots is None:
+            _set_outcome(trace, LookupOutcome.REJECTED, intent=normalized.intent)
             return None
 
-        canonical = self._canonicalizer.canonicalize(normalized.intent, normalized.slots)
+        canonical = self._canonicalizer.canonicalize(normalized.intent, slots)
+        scope = resolved.scope or context
         key = build_cache_key(
             intent=canonical.intent,
             slots=canonical.slots,
-            scope=resolved.scope or context,
+            scope=scope,
             artifact_type=resolved.artifact_type,
             schema_version=resolved.schema_version,
         )
+        if trace is not None:
+            trace.key, trace.intent, trace.scope = key, canonical.intent, scope
 
-        exact_hit = self._exact_cache.get(key)
+        started = time.perf_counter()
+        exact_hit = await self._call_backend("exact_get", self._exact_cache, "get", key, budget=budget)
+        if not exact_hit:
+            for version, old_key in self._fallback_keys(canonical, scope, resolved):
+                old = await self._call_backend("exact_get", self._exact_cache, "get", old_key, budget=budget)
+                upgraded = self._upgrade(old, version, resolved)
+                if upgraded is not None:
+                    self._write_back(key, upgraded)
+                    if trace is not None:
+                        trace.exact_us = elapsed_us(started)
+                    _set_outcome(trace, LookupOutcome.EXACT_HIT)
+                    return _with_provenance(upgraded, source="upgrade", key=old_key, score=None)
+        if trace is not None:
+            trace.exact_us = elapsed_us(started)
         if exact_hit:
+            _set_outcome(trace, LookupOutcome.EXACT_HIT)
             return _with_provenance(exact_hit, source="cache", key=key, score=None)
 
         if not resolved.enable_semantic or self._semantic_cache is None:
+            _set_outcome(trace, LookupOutcome.MISS)
             return None
 
-        vector = self._semantic_cache.embed(canonical.intent, canonical.slots)
-        semantic_hit = self._semantic_cache.search(vector, resolved.min_score)
+        started = time.perf_counter()
+        vector = await self._call_backend(
+            "embed", self._semantic_cache, "embed", canonical.intent, canonical.slots, budget=budget
+        )
+        semantic_hit = None
+        if vector is not None:
+            semantic_hit = await self._semantic_search_async(vector, canonical, resolved, trace, budget)
+        if trace is not None:
+            trace.semantic_us = elapsed_us(started)
         if not semantic_hit:
+            _set_outcome(trace, LookupOutcome.MISS)
             return None
 
         artifact, score = semantic_hit
+        _set_outcome(trace, LookupOutcome.SEMANTIC_HIT)
         return _with_provenance(artifact, source="semantic", key=key, score=score)
 
+    async def _normalize_cascade(
+        self,
+        cascade: CascadeNormalizer,
+        text: str,
+        context: Optional[Dict[str, Any]],
+        options: CacheOptions,
+        budget: Optional[LatencyBudget],
+    ) -> tuple[Any, Optional[tuple[Artifact, str, NormalizedIntent, Optional[Dict[str, Any]]]]]:
+        """Normalize through ``cascade``, probing the exact cache with a low-confidence candidate.
+
+        The fallback normalizer starts immediately and is cancelled when the
+        probe hits; the second element of the result is then the hit.
+        """
 
-def _with_provenance(artifact: Artifact, *, source: str, key: str, score: Optional[float]) -> Artifact:
-    provenance = dict(artifact.provenance) if artifact.provenance else {}
-    provenance.update({"source": source, "key": key, "score": score})
-    return replace(artifact, provenance=provenance)
+        candidate, confident = cascade.candidate(text, context)
+        if confident:
+            return candidate, None
+        fallback = self._call_backend(
+            "normalize", cascade, "normalize_fallback", text, context, budget=budget, default=_SKIPPED
+        )
+        target = self._candidate_key(candidate, context, options)
+        if target is None:
+            return await fallback, None
+        task = asyncio.ensure_future(fallback)
+        canonical, key, scope = target
+        try:
+            hit = await self._call_backend("exact_get", self._exact_cache, "get", key, budget=budget)
+        except BaseException:
+            task.cancel()
+            raise
+        if not hit:
+            return await task, None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            # The fallback failed (e.g. rate limited) before it could be
+            # cancelled; its breaker already counted that, and the hit stands.
+            _log.debug("cascade fallback failed after the exact-cache probe hit", exc_info=True)
+        return None, (hit, key, canonical, scope)
+
+    def _candidate_key(
+        self, candidate: Optional[NormalizedIntent], context: Optional[Dict[str, Any]], options: CacheOptions
+    ) -> Optional[tuple[NormalizedIntent, str, Optional[Dict[str, Any]]]]:
+        if candidate is None or not self._registry.is_allowed(candidate.intent):
+            return None
+        slots = _checked_slots(self._registry, candidate)
+        if slots is None:
+            return None
+        canonical = self._canonicalizer.canonicalize(candidate.intent, slots)
+        scope = options.scope or context
+        key = build_cache_key(
+            intent=canonical.intent,
+            slots=canonical.slots,
+            scope=scope,
+            artifact_type=options.artifact_type,
+            schema_version=options.schema_version,
+        )
+        return canonical, key, scope
+
+    def _fallback_keys(
+        self, canonical: NormalizedIntent, scope: Optional[Dict[str, Any]], options: CacheOptions
+    ) -> List[tuple[str, str]]:
+        if self._upgrades is None:
+            return []
+        return [
+            (
+                version,
+                build_cache_key(
+                    intent=canonical.intent,
+                    slots=canonical.slots,
+                    scope=scope,
+                    artifact_type=options.artifact_type,
+                    schema_version=version,
+                ),
+            )
+            for version in options.fallback_schema_versions
+            if self._upgrades.can_upgrade(version, options.schema_version)
+        ]
+
+    def _upgrade(self, artifact: Optional[Artifact], version: str, options: CacheOptions) -> Optional[Artifact]:
+        if not artifact:
+            return None
+        stored = artifact.artifact if isinstance(artifact, CacheHit) else artifact
+        return cast(UpgradeRegistry, self._upgrades).upgrade(stored, version, options.schema_version)
+
+    def _write_back(self, key: str, artifact: Artifact) -> None:
+        """Store an upgraded artifact under its new key without delaying the lookup."""
 
+        task = asyncio.ensure_future(self._call_backend("exact_set", self._exact_cache, "set", key, artifact))
+        self._background.add(task)
+        task.add_done_callback(self._finish_background)
 
-async def _normalize_async(normalizer: Any, text: str, context: Optional[Dict[str, Any]]):
-    normalize_async = getattr(normalizer, "normalize_async", None)
-    if callable(normalize_async):
-        result = normalize_async(text, context)
+    def _finish_background(self, task: asyncio.Future[Any]) -> None:
+        self._background.discard(task)
+        # Write-back failures are already counted by the exact-cache breaker.
+        if not task.cancelled():
+            task.exception()
+
+    async def drain(self) -> None:
+        """Wait for pending background write-backs, e.g. before shutdown or in tests."""
+
+        if self._background:
+            await asyncio.gather(*list(self._background), return_exceptions=True)
+
+    def _semantic_search(
+        self,
+        vector: list[float],
+        canonical: NormalizedIntent,
+        options: CacheOptions,
+        trace: Optional[LookupTrace] = None,
+        budget: Optional[LatencyBudget] = None,
+    ) -> Optional[tuple[Artifact, float]]:
+        semantic_cache = cast(SemanticCache, self._semantic_cache)
+        threshold = _semantic_threshold(self._registry, canonical.intent, options)
+        peek = _can_peek(semantic_cache, "peek_top_k")
+        floor = _trace_floor(peek, threshold, trace)
+        if not _wants_top_k(semantic_cache, options) and floor == threshold:
+            hit = self._call_sync("search", budget, None, semantic_cache.search, vector, threshold)
+            return _above(hit, threshold, trace)
+        search_top_k = getattr(semantic_cache, "peek_top_k" if peek else "search_top_k")
+        matches = self._call_sync("search", budget, [], search_top_k, vector, floor, max(options.semantic_top_k, 1))
+        return self._serve_match(semantic_cache, peek, matches, canonical, options, threshold, trace)
+
+    async def _semantic_search_async(
+        self,
+        vector: list[float],
+        canonical: NormalizedIntent,
+        options: CacheOptions,
+        trace: Optional[LookupTrace] = None,
+        budget: Optional[LatencyBudget] = None,
+    ) -> Optional[tuple[Artifact, float]]:
+        semantic_cache = cast(SemanticCache, self._semantic_cache)
+        threshold = _semantic_threshold(self._registry, canonical.intent, options)
+        peek = _can_peek(semantic_cache, "peek_top_k", "peek_top_k_async")
+        floor = _trace_floor(peek, threshold, trace)
+        if not _wants_top_k(semantic_cache, options) and floor == threshold:
+            hit = await self._call_backend("search", semantic_cache, "search", vector, threshold, budget=budget)
+            return _above(hit, threshold, trace)
+        matches = await self._call_backend(
+            "search",
+            semantic_cache,
+            "peek_top_k" if peek else "search_top_k",
+            vector,
+            floor,
+            max(options.semantic_top_k, 1),
+            budget=budget,
+            default=[],
+        )
+        return self._serve_match(semantic_cache, peek, matches, canonical, options, threshold, trace)
+
+    def _serve_match(
+        self,
+        semantic_cache: Any,
+        peek: bool,
+        matches: List[SemanticMatch],
+        canonical: NormalizedIntent,
+        options: CacheOptions,
+        threshold: float,
+        trace: Optional[LookupTrace],
+    ) -> Optional[tuple[Artifact, float]]:
+        # Candidates were peeked at; only the one actually served counts as a hit.
+        match = self._pick_match(matches, canonical, options)
+        hit = _above((match.artifact, match.score) if match is not None else None, threshold, trace)
+        if hit is not None and peek:
+            semantic_cache.record_hit(match)
+        return hit
+
+    def _pick_match(
+        self, matches: List[SemanticMatch], canonical: NormalizedIntent, options: CacheOptions
+    ) -> Optional[SemanticMatch]:
+        if options.semantic_rerank:
+            key_slots = _semantic_key_slots(self._registry, canonical.intent)
+            matches = [match for match in matches if _slots_agree(match, canonical, key_slots)]
+        return matches[0] if matches else None
+
+    def _call_sync(
+        self, stage: str, budget: Optional[LatencyBudget], default: Any, call: Callable[..., Any], *args: Any
+    ) -> Any:
+        # A sync call cannot be interrupted: a late result is discarded and
+        # counted against the tier's breaker instead.
+        timeout = budget.timeout_for(stage) if budget is not None else None
+        if timeout is not None and timeout <= 0:
+            return default
+        breaker = self._breakers[_STAGE_TIERS[stage]]
+        if not breaker.allow():
+            return default
+        started = time.perf_counter()
+        try:
+            result = call(*args)
+        except Exception:
+            breaker.record_failure(timed_out=False)
+            raise
+        if timeout is not None and time.perf_counter() - started > timeout:
+            breaker.record_failure(timed_out=True)
+            return default
+        breaker.record_success()
+        return result
+
+    async def _call_backend(
+        self,
+        stage: str,
+        backend: Any,
+        method: str,
+        *args: Any,
+        budget: Optional[LatencyBudget] = None,
+        default: Any = None,
+    ) -> Any:
+        timeout = budget.timeout_for(stage) if budget is not None else None
+        if timeout is not None and timeout <= 0:
+            return default
+        breaker = self._breakers[_STAGE_TIERS[stage]]
+        if not breaker.allow():
+            return default
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(self._invoke(stage, backend, method, *args), timeout)
+        except asyncio.TimeoutError:
+            breaker.record_failure(timed_out=True)
+            return default
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception:
+            breaker.record_failure(timed_out=False)
+            raise
+        # Sync backends called on the loop block it and cannot be cancelled.
+        if timeout is not None and time.perf_counter() - started > timeout:
+            breaker.record_failure(timed_out=True)
+            return default
+        breaker.record_success()
+        return result
+
+    async def _invoke(self, stage: str, backend: Any, method: str, *args: Any) -> Any:
+        native = getattr(backend, f"{method}_async", None)
+        if callable(native):
+            result = native(*args)
+        elif self._executor is not None and stage in self._offload_stages:
+            async with self._offload_semaphore():
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._executor, partial(getattr(backend, method), *args))
+        else:
+            result = getattr(backend, method)(*args)
         if inspect.isawaitable(result):
             return await cast(Awaitable[Any], result)
         return result
-    result: Any = normalizer.normalize(text, context)
-    if inspect.isawaitable(result):
-        return await cast(Awaitable[Any], result)
-    return result
+
+    def _offload_semaphore(self) -> Any:
+        if self._max_concurrent_offloads is None:
+            return contextlib.nullcontext()
+        loop = asyncio.get_running_loop()
+        if self._offload_slots is None or self._offload_loop is not loop:
+            self._offload_slots = asyncio.Semaphore(self._max_concurrent_offloads)
+            self._offload_loop = loop
+        return self._offload_slots
+
+
+def _budget(options: CacheOptions) -> Optional[LatencyBudget]:
+    if options.latency_budget_ms is None:
+        return None
+    return LatencyBudget(options.latency_budget_ms, options.stage_budget_shares)
+
+
+def _set_outcome(trace: Optional[LookupTrace], outcome: LookupOutcome, *, intent: Optional[str] = None) -> None:
+    if trace is None:
+        return
+    trace.outcome = outcome
+    if intent is not None:
+        trace.intent = intent
+
+
+def _above(
+    hit: Optional[tuple[Artifact, float]], threshold: float, trace: Optional[LookupTrace]
+) -> Optional[tuple[Artifact, float]]:
+    if trace is None or hit is None:
+        return hit
+    trace.semantic_score = hit[1]
+    return hit if hit[1] >= threshold else None
+
+
+def _checked_slots(registry: Any, normalized: NormalizedIntent) -> Optional[Dict[str, Any]]:
+    coerce_slots = getattr(registry, "coerce_slots", None)
+    if callable(coerce_slots):
+        return coerce_slots(normalized.intent, normalized.slots)
+    if not registry.validate_slots(normalized.intent, normalized.slots):
+        return None
+    return normalized.slots
+
+
+def _wants_top_k(semantic_cache: Any, options: CacheOptions) -> bool:
+    if options.semantic_top_k <= 1 and not options.semantic_rerank:
+        return False
+    return callable(getattr(semantic_cache, "search_top_k", None)) or callable(
+        getattr(semantic_cache, "search_top_k_async", None)
+    )
+
+
+def _trace_floor(peek: bool, threshold: float, trace: Optional[LookupTrace]) -> float:
+    # Traces record the best score even below the threshold, but only a
+    # side-effect-free peek may return such matches: anything else would
+    # promote and count entries the lookup never serves.
+    return _TRACE_SCORE_FLOOR if trace is not None and peek else threshold
+
+
+def _can_peek(semantic_cache: Any, *methods: str) -> bool:
+    if not callable(getattr(semantic_cache, "record_hit", None)):
+        return False
+    return any(callable(getattr(semantic_cache, method, None)) for method in methods)
+
+
+def _semantic_threshold(registry: Any, intent: str, options: CacheOptions) -> float:
+    semantic_threshold = getattr(registry, "semantic_threshold", None)
+    if callable(semantic_threshold):
+        threshold = semantic_threshold(intent)
+        if threshold is not None:
+            return threshold
+    return options.min_score
+
+
+def _semantic_key_slots(registry: Any, intent: str) -> Set[str]:
+    semantic_key_slots = getattr(registry, "semantic_key_slots", None)
+    if callable(semantic_key_slots):
+        return set(semantic_key_slots(intent))
+    return set()
+
+
+def _slots_agree(match: SemanticMatch, canonical: NormalizedIntent, key_slots: Set[str]) -> bool:
+    if match.intent is None or match.slots is None:
+        return False
+    if match.intent != canonical.intent:
+        return False
+    return all(match.slots.get(slot) == canonical.slots.get(slot) for slot in key_slots)
+
+
+def _with_provenance(artifact: Artifact, *, source: str, key: str, score: Optional[float]) -> Artifact:
+    return CacheHit(artifact=artifact, source=source, key=key, score=score)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Any, List, Mapping, Sequence, Tuple
+
+_MIX_1 = 0xFF51AFD7ED558CCD
+_MIX_2 = 0xC4CEB9FE1A85EC53
+_NGRAM_BASE = 0x100000001B3
+
+
+class HashingEmbedder:
+    """Deterministic offline embedder over canonical ``(intent, slots)``.
+
+    Each vector is a signed feature hash of the intent, one ``name=value``
+    token per slot and the character n-grams of every slot value, all
+    salted with the intent and slot name and L2-normalised. Slot values
+    that differ by a few characters ("new york" / "new york city") stay
+    close, while different intents land on unrelated features.
+
+    Pass an instance as ``InMemorySemanticCache``'s ``embedder``;
+    ``embed_batch`` embeds many items in one NumPy pass. Requires NumPy.
+    """
+
+    def __init__(
+        self,
+        dim: int = 256,
+        *,
+        ngram_sizes: Sequence[int] = (3, 4),
+        intent_weight: float = 0.5,
+        token_weight: float = 0.5,
+        seed: int = 0,
+    ) -> None:
+        try:
+            import numpy as np
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise ImportError("numpy is required for HashingEmbedder") from exc
+        if dim < 2:
+            raise ValueError("dim must be at least 2")
+        if not ngram_sizes or min(ngram_sizes) < 1:
+            raise ValueError("ngram_sizes must be positive")
+        self._np = np
+        self.dim = dim
+        self._ngram_sizes = tuple(ngram_sizes)
+        self._intent_weight = intent_weight
+        self._token_weight = token_weight
+        self._seed = seed
+        self._powers = {
+            n: [np.uint64(pow(_NGRAM_BASE, n - 1 - i, 1 << 64)) for i in range(n)] for n in self._ngram_sizes
+        }
+
+    def __call__(self, intent: str, slots: Mapping[str, object]) -> List[float]:
+        return self.embed_batch([(intent, slots)])[0].tolist()
+
+    def embed_batch(self, items: Sequence[Tuple[str, Mapping[str, object]]]) -> Any:
+        """Embed ``(intent, slots)`` pairs into a ``(len(items), dim)`` float32 array.
+
+        All slot values of the batch are packed into one byte buffer so the
+        n-gram hashing runs as a handful of array operations per batch.
+        """
+
+        np = self._np
+        tokens: List[int] = []
+        token_weights: List[float] = []
+        token_rows: List[int] = []
+        texts: List[bytes] = []
+        text_salts: List[int] = []
+        text_rows: List[int] = []
+        for row, (intent, slots) in enumerate(items):
+            intent_salt = _crc(intent, self._seed)
+            tokens.append(intent_salt)
+            token_weights.append(self._intent_weight)
+            token_rows.append(row)
+            for name in sorted(slots):
+                text = _slot_text(slots[name])
+                salt = _crc(name, intent_salt)
+                tokens.append(_crc(text, salt))
+                token_weights.append(self._token_weight)
+                token_rows.append(row)
+                texts.append(f"\x02{text}\x03".encode("utf-8"))
+                text_salts.append(salt)
+                text_rows.append(row)
+        if not items:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        gram_hashes, gram_weights, gram_rows = self._ngram_features(texts, text_salts, text_rows)
+        mixed = _mix(np, np.concatenate([np.array(tokens, dtype=np.uint64), gram_hashes]))
+        weights = np.concatenate([np.array(token_weights), gram_weights])
+        rows = np.concatenate([np.array(token_rows, dtype=np.int64), gram_rows])
+        signs = np.where(mixed >> np.uint64(63), -1.0, 1.0)
+        flat = rows * self.dim + (mixed % np.uint64(self.dim)).astype(np.int64)
+        vectors = np.bincount(flat, weights=signs * weights, minlength=len(items) * self.dim)
+        vectors = vectors.reshape(len(items), self.dim)
+        norms = np.sqrt(np.einsum("ij,ij->i", vectors, vectors))[:, None]
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors.astype(np.float32)
+
+    def _ngram_features(self, texts: List[bytes], salts: List[int], rows: List[int]) -> Tuple[Any, Any, Any]:
+        np = self._np
+        if not texts:
+            return np.zeros(0, dtype=np.uint64), np.zeros(0), np.zeros(0, dtype=np.int64)
+        data = np.frombuffer(b"".join(texts), dtype=np.uint8).astype(np.uint64)
+        lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+        segment = np.repeat(np.arange(len(texts)), lengths)
+        hashes, segments = [], []
+        for n, powers in self._powers.items():
+            count = len(data) - n + 1
+            if count <= 0:
+                continue
+            rolled = data[:count] * powers[0]
+            for offset in range(1, n):
+                rolled += data[offset : offset + count] * powers[offset]
+            inside = segment[:count] == segment[n - 1 :]
+            hashes.append(rolled[inside] ^ np.uint64(n))
+            segments.append(segment[:count][inside])
+        if not hashes:
+            return np.zeros(0, dtype=np.uint64), np.zeros(0), np.zeros(0, dtype=np.int64)
+        gram_segments = np.concatenate(segments)
+        counts = np.bincount(gram_segments, minlength=len(texts))
+        gram_hashes = np.concatenate(hashes) + np.array(salts, dtype=np.uint64)[gram_segments] * np.uint64(_MIX_1)
+        gram_weights = 1.0 / np.sqrt(counts[gram_segments])
+        return gram_hashes, gram_weights, np.array(rows, dtype=np.int64)[gram_segments]
+
+
+def _slot_text(value: object) -> str:
+    if isinstance(value, str):
+        return " ".join(value.lower().split())
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _crc(text: str, salt: int) -> int:
+    return zlib.crc32(text.encode("utf-8"), salt & 0xFFFFFFFF) | (salt & 0xFFFFFFFF) << 32
+
+
+def _mix(np: Any, values: Any) -> Any:
+    values = values ^ (values >> np.uint64(33))
+    values = values * np.uint64(_MIX_1)
+    values = values ^ (values >> np.uint64(33))
+    values = values * np.uint64(_MIX_2)
+    return values ^ (values >> np.uint64(33))
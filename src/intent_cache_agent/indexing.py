@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import json
+import sys
+from typing import Any, Collection, Dict, Generic, Hashable, Iterable, Mapping, Optional, Set, Tuple, TypeVar
+
+from .canonicalization import canonicalize_mapping
+
+Member = TypeVar("Member", bound=Hashable)
+
+
+def index_labels(
+    *,
+    intent: Optional[str] = None,
+    scope: Optional[Mapping[str, Any]] = None,
+    tags: Collection[str] = (),
+    version: Optional[str | int] = None,
+) -> Tuple[str, ...]:
+    """Secondary-index labels for an entry, or the labels a query must match."""
+
+    labels = []
+    if intent is not None:
+        labels.append(f"intent:{intent}")
+    if scope:
+        for name, value in canonicalize_mapping(dict(scope), drop_empty=False).items():
+            labels.append(f"scope:{name}={json.dumps(value, sort_keys=True, separators=(',', ':'))}")
+    for tag in sorted(set(tags)):
+        labels.append(f"tag:{tag}")
+    if version is not None:
+        labels.append(f"version:{version}")
+    return tuple(sys.intern(label) for label in labels)
+
+
+class KeyIndex(Generic[Member]):
+    """In-memory mapping from index labels to the members carrying them."""
+
+    def __init__(self) -> None:
+        self._members: Dict[str, Set[Member]] = {}
+
+    def add(self, member: Member, labels: Iterable[str]) -> None:
+        for label in labels:
+            self._members.setdefault(label, set()).add(member)
+
+    def discard(self, member: Member, labels: Iterable[str]) -> None:
+        for label in labels:
+            members = self._members.get(label)
+            if members is None:
+                continue
+            members.discard(member)
+            if not members:
+                del self._members[label]
+
+    def match(self, labels: Collection[str]) -> Set[Member]:
+        if not labels:
+            raise ValueError("at least one of intent, scope, tags or version is required")
+        candidates = sorted((self._members.get(label, set()) for label in labels), key=len)
+        matched = set(candidates[0])
+        for members in candidates[1:]:
+            matched &= members
+        return matched
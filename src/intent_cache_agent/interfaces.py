@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional, Protocol
+from typing import Any, Dict, List, Optional, Protocol, Sequence
 
 from .models import Artifact, NormalizedIntent
 
@@ -29,3 +29,17 @@ class SemanticCache(Protocol):
     def embed(self, intent: str, slots: Dict[str, Any]) -> list[float]: ...
 
     def search(self, vector: list[float], min_score: float) -> Optional[tuple[Artifact, float]]: ...
+
+
+class VectorStore(Protocol):
+    approximate: bool
+
+    def __len__(self) -> int: ...
+
+    def add(self, vector: Sequence[float]) -> int: ...
+
+    def scores(self, query: Sequence[float]) -> List[float]: ...
+
+    def rescore(self, query: Sequence[float], slots: Sequence[int]) -> List[float]: ...
+
+    def compact(self, keep: Sequence[int]) -> None: ...
@@ -25,3 +25,17 @@ def build_cache_key(
         f"|scope={scope_json}"
         f"|schema_v={schema_version}"
     )
+
+
+def key_scope(key: str) -> Optional[Dict[str, Any]]:
+    """Recover the scope mapping embedded in a key produced by ``build_cache_key``."""
+
+    end = key.rfind("|schema_v=")
+    start = key.rfind("|scope=", 0, end)
+    if start < 0 or end < 0:
+        return None
+    try:
+        scope = json.loads(key[start + len("|scope=") : end])
+    except json.JSONDecodeError:
+        return None
+    return scope if isinstance(scope, dict) else None
@@ -0,0 +1,332 @@
+"""Offline load generator for ``CachedIntentAgent.lookup_async`` and ``IntentCacheAgent``.
+
+Run ``python -m intent_cache_agent.loadtest --sessions 2000 --requests 20`` to
+drive thousands of concurrent simulated sessions through stub backends and
+report throughput, latency percentiles and event-loop lag.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from .cache import InMemoryExactCache
+from .core import CachedIntentAgent
+from .key_builder import build_cache_key
+from .models import Artifact, CacheOptions, NormalizedIntent
+from .registry import SimpleIntentRegistry
+
+_INTENT = "load"
+
+
+@dataclass(frozen=True)
+class Latency:
+    """Latency distribution in milliseconds: ``fixed``, ``uniform`` (low, high) or ``lognormal`` (median, sigma)."""
+
+    kind: str = "fixed"
+    first: float = 0.0
+    second: float = 0.0
+
+    @classmethod
+    def parse(cls, text: str) -> "Latency":
+        """Parse ``"fixed:2"``, ``"uniform:1,5"`` or ``"lognormal:3,0.5"``."""
+
+        kind, _, args = text.partition(":")
+        values = [float(value) for value in args.split(",") if value]
+        if kind not in ("fixed", "uniform", "lognormal") or len(values) != (1 if kind == "fixed" else 2):
+            raise ValueError(f"invalid latency spec {text!r}")
+        return cls(kind, *values)
+
+    def sample(self, rng: random.Random) -> float:
+        """Return one delay in seconds."""
+
+        if self.kind == "fixed":
+            millis = self.first
+        elif self.kind == "uniform":
+            millis = rng.uniform(self.first, self.second)
+        else:
+            millis = self.first * math.exp(rng.gauss(0.0, self.second))
+        return max(millis, 0.0) / 1000.0
+
+
+@dataclass(frozen=True)
+class LoadProfile:
+    sessions: int = 1000
+    requests_per_session: int = 10
+    exact_hit_ratio: float = 0.7
+    semantic_hit_ratio: float = 0.1
+    distinct_prompts: int = 1000
+    normalize_latency: Latency = field(default_factory=lambda: Latency("lognormal", 2.0, 0.5))
+    normalize_cpu_us: float = 0.0
+    embed_latency: Latency = field(default_factory=lambda: Latency("fixed", 1.0))
+    search_latency: Latency = field(default_factory=lambda: Latency("fixed", 0.5))
+    think_time: Latency = field(default_factory=Latency)
+    lag_interval_ms: float = 10.0
+    seed: int = 0
+
+
+@dataclass
+class LoadReport:
+    requests: int
+    exact_hits: int
+    semantic_hits: int
+    misses: int
+    errors: int
+    duration_s: float
+    latencies_ms: List[float] = field(repr=False)
+    loop_lag_ms: List[float] = field(repr=False)
+    upgrade_hits: int = 0
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.duration_s if self.duration_s else 0.0
+
+    def latency_percentile(self, percentile: float) -> float:
+        return _percentile(self.latencies_ms, percentile)
+
+    def lag_percentile(self, percentile: float) -> float:
+        return _percentile(self.loop_lag_ms, percentile)
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "throughput_rps": round(self.throughput, 1),
+            "p50_ms": round(self.latency_percentile(50), 3),
+            "p95_ms": round(self.latency_percentile(95), 3),
+            "p99_ms": round(self.latency_percentile(99), 3),
+            "max_ms": round(max(self.latencies_ms, default=0.0), 3),
+            "loop_lag_p99_ms": round(self.lag_percentile(99), 3),
+            "loop_lag_max_ms": round(max(self.loop_lag_ms, default=0.0), 3),
+            "exact_hits": self.exact_hits,
+            "upgrade_hits": self.upgrade_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "errors": self.errors,
+        }
+
+
+class StubNormalizer:
+    """Async normalizer that sleeps for a sampled latency and optionally burns CPU on the loop."""
+
+    def __init__(self, latency: Latency, rng: random.Random, *, cpu_us: float = 0.0) -> None:
+        self._latency = latency
+        self._rng = rng
+        self._cpu_seconds = cpu_us / 1_000_000
+
+    async def normalize_async(self, text: str, context: Optional[Dict[str, Any]]) -> Optional[NormalizedIntent]:
+        if self._cpu_seconds:
+            deadline = time.perf_counter() + self._cpu_seconds
+            while time.perf_counter() < deadline:
+                pass
+        await asyncio.sleep(self._latency.sample(self._rng))
+        return NormalizedIntent(intent=_INTENT, slots={"prompt": text}, meta=None)
+
+    def normalize(self, text: str, context: Optional[Dict[str, Any]]) -> Optional[NormalizedIntent]:
+        return NormalizedIntent(intent=_INTENT, slots={"prompt": text}, meta=None)
+
+
+class StubSemanticCache:
+    """Semantic cache stub that hits for prompts starting with ``semantic-``."""
+
+    def __init__(self, embed_latency: Latency, search_latency: Latency, rng: random.Random, artifact: Artifact) -> None:
+        self._embed_latency = embed_latency
+        self._search_latency = search_latency
+        self._rng = rng
+        self._artifact = artifact
+
+    def embed(self, intent: str, slots: Dict[str, object]) -> List[float]:
+        return [1.0 if str(slots.get("prompt", "")).startswith("semantic-") else 0.0]
+
+    async def embed_async(self, intent: str, slots: Dict[str, object]) -> List[float]:
+        await asyncio.sleep(self._embed_latency.sample(self._rng))
+        return self.embed(intent, slots)
+
+    def search(self, vector: List[float], min_score: float) -> Optional[tuple[Artifact, float]]:
+        return (self._artifact, 0.99) if vector[0] else None
+
+    async def search_async(self, vector: List[float], min_score: float) -> Optional[tuple[Artifact, float]]:
+        await asyncio.sleep(self._search_latency.sample(self._rng))
+        return self.search(vector, min_score)
+
+
+def build_agent(profile: LoadProfile, rng: random.Random) -> CachedIntentAgent:
+    """Wire stub backends into a ``CachedIntentAgent`` with every ``hit-*`` prompt pre-cached."""
+
+    options = CacheOptions(enable_semantic=True)
+    artifact = Artifact(type=options.artifact_type, payload={"rows": []}, version="v1", scope={}, ttl_seconds=0)
+    exact_cache = InMemoryExactCache()
+    for index in range(profile.distinct_prompts):
+        key = build_cache_key(
+            intent=_INTENT,
+            slots={"prompt": f"hit-{index}"},
+            scope=None,
+            artifact_type=options.artifact_type,
+            schema_version=options.schema_version,
+        )
+        exact_cache.set(key, artifact)
+    return CachedIntentAgent(
+        normalizer=StubNormalizer(profile.normalize_latency, rng, cpu_us=profile.normalize_cpu_us),
+        registry=SimpleIntentRegistry(allowed_intents={_INTENT}),
+        exact_cache=exact_cache,
+        semantic_cache=StubSemanticCache(profile.embed_latency, profile.search_latency, rng, artifact),
+        default_options=options,
+    )
+
+
+def lookup_target(agent: CachedIntentAgent) -> Callable[[str], Awaitable[Optional[str]]]:
+    """Call ``lookup_async`` and report the hit's provenance source (None on a miss)."""
+
+    async def call(prompt: str) -> Optional[str]:
+        result = await agent.lookup_async(prompt)
+        return None if result is None else result.provenance["source"]
+
+    return call
+
+
+def adk_target(agent: CachedIntentAgent) -> Callable[[str], Awaitable[Optional[str]]]:
+    """Drive ``IntentCacheAgent._run_async_impl`` with a minimal invocation context (needs google-adk)."""
+
+    from google.genai import types
+
+    from .adk_agent import IntentCacheAgent
+
+    adk_agent = IntentCacheAgent(name="intent_cache", cached_agent=agent)
+
+    async def call(prompt: str) -> Optional[str]:
+        ctx = SimpleNamespace(
+            user_content=types.Content(parts=[types.Part(text=prompt)], role="user"),
+            session=SimpleNamespace(state={}),
+        )
+        text = None
+        async for event in adk_agent._run_async_impl(ctx):
+            text = event.content.parts[0].text
+        return None if text in (None, "null") else json.loads(text)["provenance"]["source"]
+
+    return call
+
+
+async def run_load_async(
+    profile: LoadProfile,
+    target_factory: Callable[[CachedIntentAgent], Callable[[str], Awaitable[Optional[str]]]] = lookup_target,
+) -> LoadReport:
+    """Run ``profile`` against the agent built by ``build_agent``.
+
+    Hits and misses are counted from what the target reports, not from the
+    prompt mix, so a lookup path that stops hitting shows up in the report.
+    """
+
+    rng = random.Random(profile.seed)
+    call = target_factory(build_agent(profile, rng))
+    latencies: List[float] = []
+    lags: List[float] = []
+    counts = {"cache": 0, "upgrade": 0, "semantic": 0, None: 0, "error": 0}
+    stop = asyncio.Event()
+
+    async def monitor_lag() -> None:
+        interval = profile.lag_interval_ms / 1000.0
+        while not stop.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(interval)
+            lags.append(max(0.0, (time.perf_counter() - started - interval) * 1000.0))
+
+    async def session(session_id: int) -> None:
+        session_rng = random.Random(profile.seed * 1_000_003 + session_id)
+        for _ in range(profile.requests_per_session):
+            prompt = _pick_prompt(profile, session_rng)
+            started = time.perf_counter()
+            try:
+                source = await call(prompt)
+            except Exception:
+                counts["error"] += 1
+            else:
+                counts[source] += 1
+            latencies.append((time.perf_counter() - started) * 1000.0)
+            pause = profile.think_time.sample(session_rng)
+            if pause:
+                await asyncio.sleep(pause)
+
+    monitor = asyncio.ensure_future(monitor_lag())
+    started = time.perf_counter()
+    await asyncio.gather(*(session(index) for index in range(profile.sessions)))
+    duration = time.perf_counter() - started
+    stop.set()
+    await monitor
+    return LoadReport(
+        requests=len(latencies),
+        exact_hits=counts["cache"],
+        semantic_hits=counts["semantic"],
+        misses=counts[None],
+        errors=counts["error"],
+        duration_s=duration,
+        latencies_ms=latencies,
+        loop_lag_ms=lags,
+        upgrade_hits=counts["upgrade"],
+    )
+
+
+def run_load(
+    profile: LoadProfile,
+    target_factory: Callable[[CachedIntentAgent], Callable[[str], Awaitable[Optional[str]]]] = lookup_target,
+) -> LoadReport:
+    return asyncio.run(run_load_async(profile, target_factory))
+
+
+def _pick_prompt(profile: LoadProfile, rng: random.Random) -> str:
+    index = rng.randrange(profile.distinct_prompts)
+    roll = rng.random()
+    if roll < profile.exact_hit_ratio:
+        return f"hit-{index}"
+    if roll < profile.exact_hit_ratio + profile.semantic_hit_ratio:
+        return f"semantic-{index}"
+    return f"miss-{index}"
+
+
+def _percentile(values: Sequence[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percentile / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=1000, help="concurrent simulated sessions")
+    parser.add_argument("--requests", type=int, default=10, help="lookups per session")
+    parser.add_argument("--exact-hit-ratio", type=float, default=0.7)
+    parser.add_argument("--semantic-hit-ratio", type=float, default=0.1)
+    parser.add_argument("--normalize-latency", type=Latency.parse, default=Latency("lognormal", 2.0, 0.5))
+    parser.add_argument("--normalize-cpu-us", type=float, default=0.0, help="blocking CPU time per normalize call")
+    parser.add_argument("--embed-latency", type=Latency.parse, default=Latency("fixed", 1.0))
+    parser.add_argument("--search-latency", type=Latency.parse, default=Latency("fixed", 0.5))
+    parser.add_argument("--think-time", type=Latency.parse, default=Latency())
+    parser.add_argument("--adk", action="store_true", help="drive IntentCacheAgent._run_async_impl (needs google-adk)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    profile = LoadProfile(
+        sessions=args.sessions,
+        requests_per_session=args.requests,
+        exact_hit_ratio=args.exact_hit_ratio,
+        semantic_hit_ratio=args.semantic_hit_ratio,
+        normalize_latency=args.normalize_latency,
+        normalize_cpu_us=args.normalize_cpu_us,
+        embed_latency=args.embed_latency,
+        search_latency=args.search_latency,
+        think_time=args.think_time,
+        seed=args.seed,
+    )
+    report = run_load(profile, adk_target if args.adk else lookup_target)
+    for name, value in report.summary().items():
+        print(f"{name:<18} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,32 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+import json
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NormalizedIntent:
     intent: str
     slots: Dict[str, Any] = field(default_factory=dict)
     meta: Optional[Dict[str, Any]] = None
 
 
-@dataclass(frozen=True)
-class Artifact:
+class _EncodedBody:
+    # The JSON body set by ``encode_artifact`` lives in a slot outside the
+    # dataclass fields, so ``fields``/``asdict``/``replace`` and equality ignore it.
+    __slots__ = ("_encoded_json",)
+
+    @property
+    def encoded_json(self) -> Optional[str]:
+        try:
+            return self._encoded_json  # type: ignore[no-any-return]
+        except AttributeError:
+            return None
+
+
+@dataclass(frozen=True, slots=True)
+class Artifact(_EncodedBody):
     type: str
     payload: Any
     version: str | int
@@ -21,11 +35,199 @@ class Artifact:
     provenance: Dict[str, Any] = field(default_factory=dict)
 
 
+_HIT_FIELDS = frozenset({"source", "key", "score"})
+_ARTIFACT_FIELDS = tuple(item.name for item in fields(Artifact))
+
+
+def _same_fields(artifact: Artifact, other: object) -> Any:
+    # CacheHit and LazyArtifact compare equal to any Artifact with the same field values.
+    if not isinstance(other, Artifact):
+        return NotImplemented
+    return all(getattr(artifact, name) == getattr(other, name) for name in _ARTIFACT_FIELDS)
+
+
+def _forward(name: str) -> property:
+    return property(lambda self: getattr(self.artifact, name), doc=f"``{name}`` of the cached artifact.")
+
+
+class CacheHit(Artifact):
+    """Artifact returned on a cache hit.
+
+    Field reads are forwarded to the stored artifact, which is referenced
+    rather than copied, and the provenance dict (stored provenance plus
+    ``source``/``key``/``score``) is only built when first read. Passing a
+    CacheHit to ``dataclasses.replace`` yields a plain Artifact.
+    """
+
+    __slots__ = ("artifact", "source", "key", "score", "_provenance")
+
+    type = _forward("type")  # type: ignore[assignment]
+    payload = _forward("payload")
+    version = _forward("version")  # type: ignore[assignment]
+    scope = _forward("scope")  # type: ignore[assignment]
+    ttl_seconds = _forward("ttl_seconds")  # type: ignore[assignment]
+    encoded_json = _forward("encoded_json")  # type: ignore[assignment]
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> Any:
+        if "artifact" not in kwargs:
+            return Artifact(*args, **kwargs)
+        return object.__new__(cls)
+
+    def __init__(self, *, artifact: Artifact, source: str, key: str, score: Optional[float]) -> None:
+        object.__setattr__(self, "artifact", artifact)
+        object.__setattr__(self, "source", source)
+        object.__setattr__(self, "key", key)
+        object.__setattr__(self, "score", score)
+        object.__setattr__(self, "_provenance", None)
+
+    def __reduce__(self) -> Any:
+        return _restore_cache_hit, (self.artifact, self.source, self.key, self.score)
+
+    def __eq__(self, other: object) -> Any:
+        return _same_fields(self, other)
+
+    __hash__ = Artifact.__hash__
+
+    @property  # type: ignore[override]
+    def provenance(self) -> Dict[str, Any]:
+        provenance = self._provenance
+        if provenance is None:
+            stored = self.artifact.provenance
+            provenance = dict(stored) if stored else {}
+            provenance.update({"source": self.source, "key": self.key, "score": self.score})
+            object.__setattr__(self, "_provenance", provenance)
+        return provenance
+
+    def provenance_json(self) -> str:
+        """``provenance`` encoded as JSON, without building the merged dict if it was never read."""
+
+        if self._provenance is not None:
+            return json.dumps(self._provenance, ensure_ascii=True)
+        stored = self.artifact.provenance
+        if stored and not _HIT_FIELDS.isdisjoint(stored):
+            return json.dumps(self.provenance, ensure_ascii=True)
+        head = json.dumps(stored, ensure_ascii=True)[:-1] + ", " if stored else "{"
+        source, key, score = (json.dumps(value, ensure_ascii=True) for value in (self.source, self.key, self.score))
+        return f'{head}"source": {source}, "key": {key}, "score": {score}}}'
+
+
+def _restore_cache_hit(artifact: Artifact, source: str, key: str, score: Optional[float]) -> CacheHit:
+    return CacheHit(artifact=artifact, source=source, key=key, score=score)
+
+
+class LazyArtifact(Artifact):
+    """Artifact whose payload is decoded from its stored JSON on first access.
+
+    Metadata fields are plain attributes. ``payload_chunks()`` yields the raw
+    JSON bytes of the payload without decoding it, fetching chunk by chunk
+    when the backend stored it in pieces, so large payloads can be streamed
+    onward. Passing a LazyArtifact to ``dataclasses.replace`` yields a plain
+    Artifact.
+    """
+
+    __slots__ = ("payload_size", "_load", "_stream", "_payload", "_encoded")
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> Any:
+        if "load_payload" not in kwargs:
+            return Artifact(*args, **kwargs)
+        return object.__new__(cls)
+
+    def __init__(
+        self,
+        *,
+        type: str,
+        version: str | int,
+        scope: Dict[str, Any],
+        ttl_seconds: int,
+        provenance: Dict[str, Any],
+        payload_size: int,
+        load_payload: Callable[[], bytes],
+        stream_payload: Callable[[], Iterator[bytes]],
+    ) -> None:
+        object.__setattr__(self, "type", type)
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "scope", scope)
+        object.__setattr__(self, "ttl_seconds", ttl_seconds)
+        object.__setattr__(self, "provenance", provenance)
+        object.__setattr__(self, "payload_size", payload_size)
+        object.__setattr__(self, "_load", load_payload)
+        object.__setattr__(self, "_stream", stream_payload)
+        object.__setattr__(self, "_payload", _UNDECODED)
+        object.__setattr__(self, "_encoded", None)
+
+    def __reduce__(self) -> Any:
+        return Artifact, (self.type, self.payload, self.version, self.scope, self.ttl_seconds, self.provenance)
+
+    def __eq__(self, other: object) -> Any:
+        return _same_fields(self, other)
+
+    __hash__ = Artifact.__hash__
+
+    @property  # type: ignore[override]
+    def payload(self) -> Any:
+        payload = self._payload
+        if payload is _UNDECODED:
+            payload = json.loads(self._load())
+            object.__setattr__(self, "_payload", payload)
+        return payload
+
+    @property
+    def payload_decoded(self) -> bool:
+        return self._payload is not _UNDECODED
+
+    @property  # type: ignore[override]
+    def encoded_json(self) -> Optional[str]:
+        """JSON body built around the stored payload bytes, so serializing a hit never re-encodes the payload."""
+
+        encoded = self._encoded
+        if encoded is None:
+            head = json.dumps({"type": self.type}, ensure_ascii=True)
+            tail = json.dumps(
+                {"version": self.version, "scope": self.scope, "ttl_seconds": self.ttl_seconds}, ensure_ascii=True
+            )
+            payload = self._load().decode("utf-8")
+            encoded = f'{head[:-1]}, "payload": {payload}, {tail[1:]}'
+            object.__setattr__(self, "_encoded", encoded)
+        return encoded
+
+    def payload_chunks(self) -> Iterator[bytes]:
+        return self._stream()
+
+
+_UNDECODED = object()
+
+
+@dataclass(frozen=True, slots=True)
+class SemanticMatch:
+    artifact: Artifact
+    score: float
+    intent: Optional[str] = None
+    slots: Optional[Dict[str, Any]] = None
+    # Backend reference to the matched entry, passed back to ``record_hit``.
+    handle: Any = field(default=None, compare=False, repr=False)
+
+
+@dataclass(frozen=True, slots=True)
+class CacheWrite:
+    """One queued ``ExactCache.set`` call; see ``RedisExactCache.set_many``."""
+
+    key: str
+    artifact: Artifact
+    ttl_seconds: Optional[int] = None
+    intent: Optional[str] = None
+    tags: Tuple[str, ...] = ()
+
+
 @dataclass(frozen=True)
 class CacheOptions:
     enable_semantic: bool = False
     min_score: float = 0.85
+    semantic_top_k: int = 1
+    semantic_rerank: bool = False
     cache_bypass: bool = False
     artifact_type: str = "intent_cache"
     schema_version: str = "v1"
     scope: Optional[Dict[str, Any]] = None
+    latency_budget_ms: Optional[float] = None
+    stage_budget_shares: Optional[Dict[str, float]] = None
+    fallback_schema_versions: Tuple[str, ...] = ()
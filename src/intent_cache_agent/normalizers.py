@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import inspect
 import json
+import time
 from dataclasses import dataclass
-from typing import Any, Awaitable, Callable, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
 
+from .interfaces import Normalizer
 from .models import NormalizedIntent
 
 
@@ -28,6 +32,79 @@ class CallableNormalizer:
         return self._fn(text, context)
 
 
+class CascadeNormalizer:
+    """Tries cheap deterministic normalizers before a slow fallback (usually an LLM).
+
+    ``tiers`` run in order and the first result whose ``meta["confidence"]``
+    (1.0 when absent) reaches ``min_confidence`` wins. Otherwise the
+    ``fallback`` normalizer decides. ``CachedIntentAgent.lookup_async``
+    recognises a cascade and, when a tier matched with low confidence,
+    probes the exact cache with that candidate while the fallback runs.
+    """
+
+    def __init__(
+        self,
+        tiers: Sequence[Normalizer],
+        fallback: Optional[Normalizer] = None,
+        *,
+        min_confidence: float = 0.0,
+    ) -> None:
+        self._tiers = list(tiers)
+        self._fallback = fallback
+        self._min_confidence = min_confidence
+
+    @property
+    def has_fallback(self) -> bool:
+        return self._fallback is not None
+
+    def candidate(self, text: str, context: Dict[str, Any] | None) -> Tuple[Optional[NormalizedIntent], bool]:
+        """Return the best deterministic match and whether it is confident enough to skip the fallback."""
+
+        best: Optional[NormalizedIntent] = None
+        best_confidence = -1.0
+        for tier in self._tiers:
+            normalized = tier.normalize(text, context)
+            if normalized is None:
+                continue
+            confidence = _confidence(normalized)
+            if confidence >= self._min_confidence:
+                return normalized, True
+            if confidence > best_confidence:
+                best, best_confidence = normalized, confidence
+        return best, self._fallback is None and best is not None
+
+    def normalize(self, text: str, context: Dict[str, Any] | None) -> Optional[NormalizedIntent]:
+        candidate, confident = self.candidate(text, context)
+        if confident or self._fallback is None:
+            return candidate
+        return self.normalize_fallback(text, context)
+
+    async def normalize_async(self, text: str, context: Dict[str, Any] | None) -> Optional[NormalizedIntent]:
+        candidate, confident = self.candidate(text, context)
+        if confident or self._fallback is None:
+            return candidate
+        return await self.normalize_fallback_async(text, context)
+
+    def normalize_fallback(self, text: str, context: Dict[str, Any] | None) -> Optional[NormalizedIntent]:
+        if self._fallback is None:
+            return None
+        result = self._fallback.normalize(text, context)
+        if inspect.isawaitable(result):
+            raise RuntimeError("Async fallback normalizer detected. Use normalize_async instead.")
+        return result
+
+    async def normalize_fallback_async(
+        self, text: str, context: Dict[str, Any] | None
+    ) -> Optional[NormalizedIntent]:
+        if self._fallback is None:
+            return None
+        native = getattr(self._fallback, "normalize_async", None)
+        result = native(text, context) if callable(native) else self._fallback.normalize(text, context)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+
 class AdkLlmNormalizer:
     """Adapter for ADK-based LLM normalization.
 
@@ -59,6 +136,185 @@ class AdkLlmNormalizer:
         return _parse_normalized(result)
 
 
+BatchItem = Tuple[str, Optional[Dict[str, Any]]]
+BatchResult = Union[str, Dict[str, Any], Sequence[Optional[Union[dict, str]]], None]
+
+
+class BatchingNormalizer:
+    """Micro-batches concurrent LLM normalizations into one structured-output call.
+
+    ``normalize_async`` callers arriving within ``max_wait_ms`` of each other
+    (or until ``max_batch_size`` are waiting) are sent together to
+    ``run_batch``, which receives the ``(text, context)`` pairs and returns
+    one result per item: a list in item order, a JSON string of that list,
+    or ``{"results": [...]}``. Results carrying an integer ``"index"`` are
+    matched by index instead of position (see ``batch_prompt``). Each result
+    has the ``AdkLlmNormalizer`` schema. ``max_concurrent_batches`` bounds
+    in-flight calls and ``tokens_per_second`` throttles them with a token
+    bucket fed by ``estimate_tokens`` (about four characters per token).
+    """
+
+    def __init__(
+        self,
+        *,
+        run_batch: Callable[[List[BatchItem]], Union[BatchResult, Awaitable[BatchResult]]],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+        max_concurrent_batches: Optional[int] = None,
+        tokens_per_second: Optional[float] = None,
+        token_burst: Optional[float] = None,
+        estimate_tokens: Optional[Callable[[str], int]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be positive")
+        if max_concurrent_batches is not None and max_concurrent_batches < 1:
+            raise ValueError("max_concurrent_batches must be positive")
+        if tokens_per_second is not None and tokens_per_second <= 0:
+            raise ValueError("tokens_per_second must be positive")
+        self._run_batch = run_batch
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait_ms / 1000.0
+        self._max_concurrent_batches = max_concurrent_batches
+        self._estimate_tokens = estimate_tokens or _estimate_tokens
+        self._bucket = (
+            _TokenBucket(tokens_per_second, token_burst or tokens_per_second, clock)
+            if tokens_per_second is not None
+            else None
+        )
+        self._pending: List[Tuple[str, Optional[Dict[str, Any]], asyncio.Future[Optional[NormalizedIntent]]]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: Set[asyncio.Future[None]] = set()
+        self.batches = 0
+
+    def normalize(self, text: str, context: Dict[str, Any] | None) -> Optional[NormalizedIntent]:
+        result = self._run_batch([(text, context)])
+        if inspect.isawaitable(result):
+            raise RuntimeError("Async run_batch detected. Use normalize_async instead.")
+        return _demultiplex(result, 1)[0]
+
+    async def normalize_async(self, text: str, context: Dict[str, Any] | None) -> Optional[NormalizedIntent]:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._pending, self._flush_handle, self._batch_slots, self._loop = [], None, None, loop
+        future: asyncio.Future[Optional[NormalizedIntent]] = loop.create_future()
+        self._pending.append((text, context, future))
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._max_wait, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        # Callers cancelled while waiting (e.g. by a cascade probe hit) are dropped.
+        batch = [entry for entry in self._pending if not entry[2].done()]
+        self._pending = []
+        if batch:
+            task = asyncio.ensure_future(self._send(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(
+        self, batch: List[Tuple[str, Optional[Dict[str, Any]], asyncio.Future[Optional[NormalizedIntent]]]]
+    ) -> None:
+        futures = [future for _, _, future in batch]
+        try:
+            async with self._slots():
+                if self._bucket is not None:
+                    await self._bucket.acquire(sum(self._estimate_tokens(text) for text, _, _ in batch))
+                self.batches += 1
+                result = self._run_batch([(text, context) for text, context, _ in batch])
+                if inspect.isawaitable(result):
+                    result = await result
+            parsed = _demultiplex(result, len(batch))
+        except asyncio.CancelledError:
+            for future in futures:
+                future.cancel()
+            raise
+        except Exception as exc:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for future, normalized in zip(futures, parsed):
+            if not future.done():
+                future.set_result(normalized)
+
+    def _slots(self) -> Any:
+        if self._max_concurrent_batches is None:
+            return contextlib.nullcontext()
+        if self._batch_slots is None:
+            self._batch_slots = asyncio.Semaphore(self._max_concurrent_batches)
+        return self._batch_slots
+
+
+def batch_prompt(items: Sequence[BatchItem], instructions: str = "") -> str:
+    """Render a batch as one prompt asking for ``{"results": [{"index": i, "intent": ..., "slots": ...}]}``."""
+
+    requests = [{"index": index, "text": text, "context": context} for index, (text, context) in enumerate(items)]
+    return (
+        (instructions + "\n\n" if instructions else "")
+        + 'Normalize every request below. Reply with JSON {"results": [...]} holding one object per request '
+        + 'with its "index", "intent" and "slots".\n'
+        + json.dumps(requests, default=str)
+    )
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float]) -> None:
+        self._rate = rate
+        self._capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+
+    async def acquire(self, tokens: float) -> None:
+        # A batch larger than the burst waits for a full bucket rather than forever.
+        tokens = min(tokens, self._capacity)
+        while True:
+            now = self._clock()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return
+            await asyncio.sleep((tokens - self._tokens) / self._rate)
+
+
+def _estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def _demultiplex(result: BatchResult, count: int) -> List[Optional[NormalizedIntent]]:
+    if isinstance(result, str):
+        try:
+            result = json.loads(result)
+        except json.JSONDecodeError:
+            return [None] * count
+    if isinstance(result, dict):
+        result = result.get("results")
+    if not isinstance(result, (list, tuple)):
+        return [None] * count
+    items = list(result)
+    if items and all(isinstance(item, dict) and isinstance(item.get("index"), int) for item in items):
+        by_index = {item["index"]: item for item in items}
+        items = [by_index.get(index) for index in range(count)]
+    items = items[:count] + [None] * (count - len(items))
+    return [_parse_normalized(item) for item in items]
+
+
+def _confidence(normalized: NormalizedIntent) -> float:
+    meta = normalized.meta
+    if isinstance(meta, dict) and isinstance(meta.get("confidence"), (int, float)):
+        return float(meta["confidence"])
+    return 1.0
+
+
 def _parse_normalized(result: Optional[dict | str]) -> Optional[NormalizedIntent]:
         if result is None:
             return None
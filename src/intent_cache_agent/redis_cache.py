@@ -1,33 +1,333 @@
 from __future__ import annotations
 
-import json
-from dataclasses import asdict
-from typing import Any, cast
+import threading
+import time
+import uuid
+from typing import Any, Collection, Dict, Iterator, List, Optional, Sequence, cast
 
 import redis
 
-from .models import Artifact
+from .bloom import BloomFilter, BloomFilterStats
+from .indexing import index_labels
+from .models import Artifact, CacheWrite
+from .serialization import decode_envelope, encode_envelope
+
+_INVALIDATE_BATCH = 500
+
+# Removes the value at KEYS[1] from the index sets named in its envelope and
+# retires its chunk list, after ARGV[3] seconds or (for 0) at once.
+# ARGV: key prefix, key, grace seconds, ...
+_RETIRE = r"""
+local prefix, key = ARGV[1], ARGV[2]
+local old = redis.call('GET', KEYS[1])
+local header = old and string.match(old, '^{"envelope": 1[^\n]*')
+if header then
+  header = cjson.decode(header)
+  for _, label in ipairs(header.labels or {}) do
+    redis.call('SREM', prefix .. 'idx:' .. label, key)
+  end
+  if header.chunks > 0 then
+    local chunks = prefix .. 'chunks:' .. key
+    if header.generation then
+      chunks = chunks .. ':' .. header.generation
+    end
+    if tonumber(ARGV[3]) > 0 then
+      redis.call('EXPIRE', chunks, ARGV[3])
+    else
+      redis.call('DEL', chunks)
+    end
+  end
+end
+"""
+
+# ARGV: key prefix, key, grace seconds, value, ttl (0 = none), generation ('' if inline),
+# label count, labels..., chunks...
+_SET_SCRIPT = _RETIRE + r"""
+local ttl = tonumber(ARGV[5])
+if ttl > 0 then
+  redis.call('SET', KEYS[1], ARGV[4], 'EX', ttl)
+else
+  redis.call('SET', KEYS[1], ARGV[4])
+end
+local count = tonumber(ARGV[7])
+if ARGV[6] ~= '' then
+  local chunks = prefix .. 'chunks:' .. key .. ':' .. ARGV[6]
+  redis.call('RPUSH', chunks, unpack(ARGV, 8 + count))
+  if ttl > 0 then
+    redis.call('EXPIRE', chunks, ttl)
+  end
+end
+for i = 8, 7 + count do
+  local index = prefix .. 'idx:' .. ARGV[i]
+  -- Sample a few members and drop those whose value expired, so index sets
+  -- stay within a small factor of their live members.
+  for _, member in ipairs(redis.call('SRANDMEMBER', index, 4)) do
+    if redis.call('EXISTS', prefix .. member) == 0 then
+      redis.call('SREM', index, member)
+    end
+  end
+  redis.call('SADD', index, key)
+  if ttl > 0 then
+    redis.call('EXPIRE', index, ttl, 'NX')
+    redis.call('EXPIRE', index, ttl, 'GT')
+  else
+    redis.call('PERSIST', index)
+  end
+end
+"""
+
+# ARGV: key prefix, key, 0. Returns the number of values deleted (0 or 1).
+_DELETE_SCRIPT = _RETIRE + r"""
+return redis.call('DEL', KEYS[1])
+"""
 
 
 class RedisExactCache:
-    def __init__(self, client: redis.Redis, prefix: str = "intent_cache:") -> None:
+    """Exact cache backed by Redis.
+
+    With ``bloom_capacity`` set, an in-process Bloom filter of stored keys is
+    built from a key scan at startup, updated on ``set`` and rebuilt every
+    ``bloom_resync_seconds`` by a background thread (lookups keep using the
+    old filter meanwhile, and keys set during the scan are carried over);
+    lookups for keys it has never seen return without a Redis round trip.
+    Keys written by other processes are only visible after the next resync.
+
+    Values are stored as an envelope (metadata line plus payload JSON) and
+    ``get`` returns a ``LazyArtifact`` whose payload is only decoded when
+    read. Payloads larger than ``chunk_threshold`` bytes are split into
+    ``chunk_size`` pieces kept in a list at ``{prefix}chunks:{key}:{generation}``,
+    so ``payload_chunks()`` can stream them without loading the whole
+    payload. Every write gets a new generation, named in the envelope; a
+    Lua script swaps the value and retires the previous chunk list
+    atomically, leaving it readable for ``chunk_grace_seconds`` so artifacts
+    already handed out keep streaming their own payload, after which they
+    raise ``LookupError``. The envelope also lists the value's index labels,
+    so the same scripts remove a key from its index sets when it is
+    overwritten or deleted. Values written in the older whole-JSON format
+    are still readable.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        prefix: str = "intent_cache:",
+        *,
+        bloom_capacity: Optional[int] = None,
+        bloom_false_positive_rate: float = 0.01,
+        bloom_resync_seconds: Optional[float] = 300.0,
+        chunk_threshold: Optional[int] = 512 * 1024,
+        chunk_size: int = 256 * 1024,
+        chunk_grace_seconds: int = 60,
+    ) -> None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
         self._client = client
         self._prefix = prefix
+        self._bloom_capacity = bloom_capacity
+        self._bloom_false_positive_rate = bloom_false_positive_rate
+        self._bloom_resync_seconds = bloom_resync_seconds
+        self._bloom: Optional[BloomFilter] = None
+        self._bloom_synced_at = 0.0
+        self._bloom_lock = threading.Lock()
+        # One list per scan in progress, collecting keys set while it runs.
+        self._scan_writes: List[List[str]] = []
+        self._resync_thread: Optional[threading.Thread] = None
+        self.bloom_stats = BloomFilterStats()
+        self._chunk_threshold = chunk_threshold
+        self._chunk_size = chunk_size
+        self._chunk_grace_seconds = chunk_grace_seconds
+        if bloom_capacity is not None:
+            self.resync_bloom_filter()
 
     def get(self, key: str) -> Artifact | None:
+        if self._bloom is not None:
+            self._maybe_resync()
+            if key not in self._bloom:
+                self.bloom_stats.avoided_round_trips += 1
+                return None
         raw = self._client.get(self._prefix + key)
         if not raw:
+            if self._bloom is not None:
+                self.bloom_stats.false_positives += 1
             return None
-        raw_text = cast(Any, raw)
-        if not isinstance(raw_text, str):
-            raw_text = raw_text.decode("utf-8")
-        payload = json.loads(raw_text)
-        return Artifact(**payload)
-
-    def set(self, key: str, artifact: Artifact, ttl_seconds: int | None = None) -> None:
-        ttl = ttl_seconds if ttl_seconds is not None else artifact.ttl_seconds
-        raw = json.dumps(asdict(artifact), ensure_ascii=True)
-        if ttl:
-            self._client.setex(self._prefix + key, ttl, raw)
+        return self._decode(key, raw)
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, Artifact]:
+        """Fetch several keys with one ``MGET``; missing keys are left out of the result."""
+
+        if self._bloom is not None:
+            self._maybe_resync()
+            candidates = [key for key in keys if key in self._bloom]
+            self.bloom_stats.avoided_round_trips += len(keys) - len(candidates)
         else:
-            self._client.set(self._prefix + key, raw)
+            candidates = list(keys)
+        if not candidates:
+            return {}
+        found: Dict[str, Artifact] = {}
+        raws = cast(List[Any], self._client.mget([self._prefix + key for key in candidates]))
+        for key, raw in zip(candidates, raws):
+            if raw:
+                found[key] = self._decode(key, raw)
+            elif self._bloom is not None:
+                self.bloom_stats.false_positives += 1
+        return found
+
+    def set(
+        self,
+        key: str,
+        artifact: Artifact,
+        ttl_seconds: int | None = None,
+        *,
+        intent: Optional[str] = None,
+        tags: Collection[str] = (),
+    ) -> None:
+        self.set_many([CacheWrite(key, artifact, ttl_seconds, intent, tuple(tags))])
+
+    def set_many(self, writes: Sequence[CacheWrite]) -> None:
+        """Store several artifacts in one ``MULTI`` (a single round trip)."""
+
+        if not writes:
+            return
+        pipe = self._client.pipeline(transaction=True)
+        for write in writes:
+            self._queue_set(pipe, write)
+        pipe.execute()
+        if self._bloom is not None:
+            keys = [write.key for write in writes]
+            with self._bloom_lock:
+                cast(BloomFilter, self._bloom).update(keys)
+                for written in self._scan_writes:
+                    written.extend(keys)
+
+    def delete(self, key: str) -> bool:
+        return bool(self._client.eval(_DELETE_SCRIPT, 1, self._prefix + key, self._prefix, key, 0))
+
+    def invalidate(
+        self,
+        *,
+        intent: Optional[str] = None,
+        scope: Optional[Dict[str, Any]] = None,
+        tags: Collection[str] = (),
+        version: Optional[str | int] = None,
+    ) -> int:
+        """Delete every key indexed under all of the given intent, scope fields, tags and version.
+
+        Index sets live at ``{prefix}idx:{label}`` and expire with their
+        longest-lived member (``EXPIRE NX``/``GT`` needs Redis 7). Each
+        write samples the sets it adds to and drops members whose value has
+        expired; members found here without a value are dropped as well.
+        """
+
+        labels = index_labels(intent=intent, scope=scope, tags=tags, version=version)
+        if not labels:
+            raise ValueError("at least one of intent, scope, tags or version is required")
+        index_keys = [self._index_key(label) for label in labels]
+        members = self._client.sinter(index_keys)
+        keys = [member.decode("utf-8") if isinstance(member, bytes) else member for member in members]
+        if not keys:
+            return 0
+        deleted = 0
+        for start in range(0, len(keys), _INVALIDATE_BATCH):
+            batch = keys[start : start + _INVALIDATE_BATCH]
+            pipe = self._client.pipeline(transaction=False)
+            for key in batch:
+                pipe.eval(_DELETE_SCRIPT, 1, self._prefix + key, self._prefix, key, 0)
+            for index_key in index_keys:
+                pipe.srem(index_key, *batch)
+            deleted += sum(pipe.execute()[: len(batch)])
+        return deleted
+
+    def _queue_set(self, pipe: Any, write: CacheWrite) -> None:
+        key, artifact = write.key, write.artifact
+        ttl = write.ttl_seconds if write.ttl_seconds is not None else artifact.ttl_seconds
+        labels = index_labels(intent=write.intent, scope=artifact.scope, tags=write.tags, version=artifact.version)
+        generation = uuid.uuid4().hex
+        raw, chunks = encode_envelope(
+            artifact,
+            chunk_threshold=self._chunk_threshold,
+            chunk_size=self._chunk_size,
+            generation=generation,
+            labels=labels,
+        )
+        pipe.eval(
+            _SET_SCRIPT,
+            1,
+            self._prefix + key,
+            self._prefix,
+            key,
+            self._chunk_grace_seconds,
+            raw,
+            ttl or 0,
+            generation if chunks else "",
+            len(labels),
+            *labels,
+            *chunks,
+        )
+
+    def _index_key(self, label: str) -> str:
+        return f"{self._prefix}idx:{label}"
+
+    def _chunk_key(self, key: str, generation: Optional[str] = None) -> str:
+        # Envelopes written without a generation used the bare key.
+        if generation is None:
+            return f"{self._prefix}chunks:{key}"
+        return f"{self._prefix}chunks:{key}:{generation}"
+
+    def _decode(self, key: str, raw: Any) -> Artifact:
+        def fetch_chunks(count: int, generation: Optional[str]) -> Iterator[bytes]:
+            chunk_key = self._chunk_key(key, generation)
+            for index in range(count):
+                chunk = self._client.lindex(chunk_key, index)
+                if chunk is None:
+                    raise LookupError(
+                        f"payload chunk {index} of {key!r} (generation {generation}) is gone; "
+                        "the value was overwritten or deleted after it was read"
+                    )
+                yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+
+        return decode_envelope(raw, fetch_chunks)
+
+    def resync_bloom_filter(self) -> None:
+        """Rebuild the Bloom filter from a scan of the stored keys (blocking)."""
+
+        capacity = self._bloom_capacity or 1
+        written: List[str] = []
+        with self._bloom_lock:
+            self._scan_writes.append(written)
+        try:
+            keys = []
+            for raw_key in self._client.scan_iter(match=self._prefix + "*", count=1000):
+                name = raw_key.decode("utf-8") if isinstance(raw_key, bytes) else raw_key
+                if name.startswith((self._prefix + "idx:", self._prefix + "chunks:")):
+                    continue
+                keys.append(name[len(self._prefix) :])
+            bloom = BloomFilter(max(capacity, 2 * len(keys)), self._bloom_false_positive_rate)
+            bloom.update(keys)
+            with self._bloom_lock:
+                bloom.update(written)
+                self._bloom = bloom
+        finally:
+            with self._bloom_lock:
+                self._scan_writes.remove(written)
+        self._bloom_synced_at = time.monotonic()
+        self.bloom_stats.resyncs += 1
+
+    def _maybe_resync(self) -> None:
+        if self._bloom_resync_seconds is None:
+            return
+        if time.monotonic() - self._bloom_synced_at < self._bloom_resync_seconds:
+            return
+        with self._bloom_lock:
+            if self._resync_thread is not None and self._resync_thread.is_alive():
+                return
+            self._resync_thread = threading.Thread(
+                target=self._resync_in_background, name="intent-cache-bloom-resync", daemon=True
+            )
+            self._resync_thread.start()
+
+    def _resync_in_background(self) -> None:
+        try:
+            self.resync_bloom_filter()
+        except Exception:
+            # Keep serving from the old filter and try again after the interval.
+            self._bloom_synced_at = time.monotonic()
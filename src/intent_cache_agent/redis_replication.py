@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import json
+import math
+import time
+import uuid
+from typing import Any, Callable, Collection, Dict, Iterable, List, Optional, Tuple
+
+import redis
+
+from .cache import InMemorySemanticCache
+from .models import Artifact, SemanticMatch
+from .serialization import artifact_to_dict
+
+
+class ReplicatedSemanticCache:
+    """Shares ``InMemorySemanticCache`` entries across nodes through a Redis Stream.
+
+    ``add`` stores the entry locally and appends ``(vector, artifact, key,
+    intent, slots, tags, expiry)`` to ``stream``; partitions follow from the
+    artifact scope. Searches stay local: before searching, entries written
+    by other nodes are pulled with a non-blocking ``XREAD`` at most every
+    ``poll_interval_seconds`` (``poll()`` forces it). The local index lives
+    in memory, so every new process (including a restarted node) loads the
+    compacted snapshot that ``publish_snapshot()`` writes to
+    ``{stream}:snapshot`` and then replays the stream after it. The last
+    applied stream ID is also written to ``{stream}:offsets:{node_id}`` for
+    monitoring replication lag; it is never read back.
+
+    The stream is capped at about ``max_stream_length`` entries; publish
+    snapshots more often than that many adds, or a new node misses entries
+    trimmed in between. Removals and invalidations stay local.
+    """
+
+    def __init__(
+        self,
+        local: InMemorySemanticCache,
+        client: redis.Redis,
+        stream: str = "intent_cache:semantic",
+        *,
+        node_id: Optional[str] = None,
+        max_stream_length: Optional[int] = 100_000,
+        poll_interval_seconds: float = 1.0,
+        read_batch: int = 500,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._local = local
+        self._client = client
+        self._stream = stream
+        self._node_id = node_id or uuid.uuid4().hex
+        # Distinguishes this process from an earlier run of the same node, whose
+        # entries are gone from memory and must be replayed.
+        self._origin = uuid.uuid4().hex
+        self._max_stream_length = max_stream_length
+        self._poll_interval = poll_interval_seconds
+        self._read_batch = read_batch
+        self._clock = clock
+        self._offset: Optional[str] = None
+        self._polled_at = -math.inf
+        self.applied = 0
+
+    @property
+    def local(self) -> InMemorySemanticCache:
+        return self._local
+
+    @property
+    def offset(self) -> Optional[str]:
+        return self._offset
+
+    def __len__(self) -> int:
+        return len(self._local)
+
+    def __getattr__(self, name: str) -> Any:
+        # remove, invalidate, compact, partition_stats, ... act on the local index.
+        return getattr(self._local, name)
+
+    def add(
+        self,
+        vector: List[float],
+        artifact: Artifact,
+        *,
+        key: Optional[str] = None,
+        ttl_seconds: Optional[int] = None,
+        intent: Optional[str] = None,
+        slots: Optional[Dict[str, Any]] = None,
+        tags: Collection[str] = (),
+    ) -> None:
+        self._local.add(vector, artifact, key=key, ttl_seconds=ttl_seconds, intent=intent, slots=slots, tags=tags)
+        ttl = ttl_seconds if ttl_seconds is not None else artifact.ttl_seconds
+        entry = {
+            "vector": [float(value) for value in vector],
+            "artifact": artifact_to_dict(artifact),
+            "key": key,
+            "intent": intent,
+            "slots": slots,
+            "tags": sorted(tags),
+            "expires_at": self._clock() + ttl if ttl else None,
+        }
+        fields = {"origin": self._origin, "entry": json.dumps(entry, ensure_ascii=True, default=str)}
+        if self._max_stream_length is None:
+            self._client.xadd(self._stream, fields)
+        else:
+            self._client.xadd(self._stream, fields, maxlen=self._max_stream_length, approximate=True)
+
+    def embed(self, intent: str, slots: Dict[str, object]) -> List[float]:
+        return self._local.embed(intent, slots)
+
+    def search(self, vector: List[float], min_score: float) -> Optional[Tuple[Artifact, float]]:
+        self._maybe_poll()
+        return self._local.search(vector, min_score)
+
+    def search_top_k(self, vector: List[float], min_score: float, k: int) -> List[SemanticMatch]:
+        self._maybe_poll()
+        return self._local.search_top_k(vector, min_score, k)
+
+    def peek_top_k(self, vector: List[float], min_score: float, k: int) -> List[SemanticMatch]:
+        self._maybe_poll()
+        return self._local.peek_top_k(vector, min_score, k)
+
+    def poll(self) -> int:
+        """Apply every stream entry not yet seen; return how many were added locally."""
+
+        self._polled_at = self._clock()
+        offset = self._offset if self._offset is not None else self._bootstrap()
+        applied = 0
+        while True:
+            response = self._client.xread({self._stream: offset}, count=self._read_batch)
+            messages = response[0][1] if response else []
+            for message_id, fields in messages:
+                applied += self._apply(fields)
+                offset = _text(message_id)
+            if messages:
+                self._client.set(self._offset_key, offset)
+            self._offset = offset
+            if len(messages) < self._read_batch:
+                break
+        self.applied += applied
+        return applied
+
+    def publish_snapshot(self) -> int:
+        """Compact the stream into ``{stream}:snapshot`` and return the number of live entries in it.
+
+        Entries replace earlier ones with the same key and expired entries
+        are dropped. Any node (or a periodic job) can call this.
+        """
+
+        raw = self._client.get(self._snapshot_key)
+        snapshot = json.loads(raw) if raw else {"last_id": "0", "entries": []}
+        last_id = snapshot["last_id"]
+        entries = snapshot["entries"]
+        while True:
+            start = f"({last_id}" if last_id != "0" else "-"
+            messages = self._client.xrange(self._stream, min=start, count=self._read_batch)
+            for message_id, fields in messages:
+                entries.append(json.loads(_text(_field(fields, "entry"))))
+                last_id = _text(message_id)
+            if len(messages) < self._read_batch:
+                break
+        now = self._clock()
+        live = _coalesce(entry for entry in entries if not _expired(entry, now))
+        self._client.set(self._snapshot_key, json.dumps({"last_id": last_id, "entries": live}, ensure_ascii=True))
+        return len(live)
+
+    @property
+    def _offset_key(self) -> str:
+        return f"{self._stream}:offsets:{self._node_id}"
+
+    @property
+    def _snapshot_key(self) -> str:
+        return f"{self._stream}:snapshot"
+
+    def _maybe_poll(self) -> None:
+        if self._clock() - self._polled_at >= self._poll_interval:
+            self.poll()
+
+    def _bootstrap(self) -> str:
+        raw = self._client.get(self._snapshot_key)
+        if not raw:
+            return "0"
+        snapshot = json.loads(raw)
+        now = self._clock()
+        for entry in snapshot["entries"]:
+            if not _expired(entry, now):
+                self._add_local(entry, now)
+                self.applied += 1
+        return str(snapshot["last_id"])
+
+    def _apply(self, fields: Dict[Any, Any]) -> int:
+        if _text(_field(fields, "origin")) == self._origin:
+            return 0
+        entry = json.loads(_text(_field(fields, "entry")))
+        now = self._clock()
+        if _expired(entry, now):
+            return 0
+        self._add_local(entry, now)
+        return 1
+
+    def _add_local(self, entry: Dict[str, Any], now: float) -> None:
+        expires_at = entry.get("expires_at")
+        ttl = max(1, math.ceil(expires_at - now)) if expires_at is not None else 0
+        self._local.add(
+            entry["vector"],
+            Artifact(**entry["artifact"]),
+            key=entry.get("key"),
+            ttl_seconds=ttl,
+            intent=entry.get("intent"),
+            slots=entry.get("slots"),
+            tags=entry.get("tags") or (),
+        )
+
+
+def _coalesce(entries: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    keyed: Dict[str, int] = {}
+    live: List[Optional[Dict[str, Any]]] = []
+    for entry in entries:
+        key = entry.get("key")
+        if key is not None and key in keyed:
+            live[keyed[key]] = None
+        if key is not None:
+            keyed[key] = len(live)
+        live.append(entry)
+    return [entry for entry in live if entry is not None]
+
+
+def _expired(entry: Dict[str, Any], now: float) -> bool:
+    expires_at = entry.get("expires_at")
+    return expires_at is not None and expires_at <= now
+
+
+def _field(fields: Dict[Any, Any], name: str) -> Any:
+    return fields[name] if name in fields else fields[name.encode()]
+
+
+def _text(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Callable, Dict, Optional, Set
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Set, Type
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
 
 
 SlotValidator = Callable[[Dict[str, object]], bool]
@@ -13,22 +16,74 @@ class SimpleIntentRegistry:
     allowed_slots: Dict[str, Set[str]] = field(default_factory=dict)
     required_slots: Dict[str, Set[str]] = field(default_factory=dict)
     validators: Dict[str, SlotValidator] = field(default_factory=dict)
+    semantic_thresholds: Dict[str, float] = field(default_factory=dict)
+    semantic_match_slots: Dict[str, Set[str]] = field(default_factory=dict)
+    slot_schemas: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    _compiled: Dict[str, Type[BaseModel]] = field(default_factory=dict, init=False, repr=False, compare=False)
 
     def is_allowed(self, intent: str) -> bool:
         return intent in self.allowed_intents
 
     def validate_slots(self, intent: str, slots: Dict[str, object]) -> bool:
+        return self.coerce_slots(intent, slots) is not None
+
+    def coerce_slots(self, intent: str, slots: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Validate ``slots`` and coerce them to the intent's declared slot types.
+
+        Returns the coerced slots, or None when they are not acceptable.
+        Schemas in ``slot_schemas`` map slot names to types and are compiled
+        into a pydantic model on first use.
+        """
+
         if intent not in self.allowed_intents:
-            return False
+            return None
+        model = self._schema_model(intent)
+        if model is not None:
+            from pydantic import ValidationError
+
+            try:
+                slots = model.model_validate(slots).model_dump(exclude_unset=True)
+            except ValidationError:
+                return None
+        keys = slots.keys()
         allowed = self.allowed_slots.get(intent)
-        if allowed is not None:
-            if not set(slots).issubset(allowed):
-                return False
+        if allowed is not None and not keys <= allowed:
+            return None
         required = self.required_slots.get(intent)
-        if required is not None:
-            if not required.issubset(set(slots)):
-                return False
+        if required is not None and not required <= keys:
+            return None
         validator: Optional[SlotValidator] = self.validators.get(intent)
         if validator is not None and not validator(slots):
-            return False
-        return True
+            return None
+        return slots
+
+    def semantic_threshold(self, intent: str) -> Optional[float]:
+        return self.semantic_thresholds.get(intent)
+
+    def semantic_key_slots(self, intent: str) -> Set[str]:
+        match_slots = self.semantic_match_slots.get(intent)
+        if match_slots is not None:
+            return match_slots
+        return self.required_slots.get(intent, set())
+
+    def _schema_model(self, intent: str) -> Optional[Type[BaseModel]]:
+        model = self._compiled.get(intent)
+        if model is not None:
+            return model
+        schema = self.slot_schemas.get(intent)
+        if schema is None:
+            return None
+        from pydantic import ConfigDict, create_model
+
+        required = self.required_slots.get(intent, set())
+        fields: Dict[str, Any] = {
+            name: (slot_type, ...) if name in required else (Optional[slot_type], None)
+            for name, slot_type in schema.items()
+        }
+        model = create_model(  # type: ignore[call-overload]
+            f"{intent.title().replace('_', '')}Slots",
+            __config__=ConfigDict(extra="forbid", protected_namespaces=()),
+            **fields,
+        )
+        self._compiled[intent] = model
+        return model
@@ -0,0 +1,128 @@
+"""Replay recorded lookup traces against simulated cache configurations.
+
+Run ``python -m intent_cache_agent.replay trace.bin --capacity 1000 --capacity 10000``
+to compare hit ratios and memory for several capacities and admission policies.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import math
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence
+
+from .cache import InMemoryExactCache
+from .models import Artifact
+from .tracing import LookupOutcome, TraceEvent, read_trace
+
+_CACHEABLE = frozenset({LookupOutcome.EXACT_HIT, LookupOutcome.SEMANTIC_HIT, LookupOutcome.MISS})
+
+
+@dataclass(frozen=True)
+class ReplayConfig:
+    capacity: Optional[int] = None
+    admission: str = "lru"
+    ttl_seconds: Optional[int] = None
+    semantic_threshold: Optional[float] = None
+    entry_bytes: int = 2048
+
+
+@dataclass
+class ReplayReport:
+    config: ReplayConfig
+    events: int = 0
+    uncacheable: int = 0
+    exact_hits: int = 0
+    semantic_hits: int = 0
+    misses: int = 0
+    peak_entries: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        return (self.exact_hits + self.semantic_hits) / lookups if lookups else 0.0
+
+    @property
+    def calls_saved(self) -> int:
+        """Lookups that would not have reached the downstream pipeline."""
+
+        return self.exact_hits + self.semantic_hits
+
+    @property
+    def projected_bytes(self) -> int:
+        return self.peak_entries * self.config.entry_bytes
+
+
+def replay(events: Iterable[TraceEvent], config: ReplayConfig) -> ReplayReport:
+    """Simulate ``config`` over recorded events, using their timestamps as the clock.
+
+    Misses are stored in an ``InMemoryExactCache`` keyed by the recorded key
+    hash. A lookup that misses the simulated exact cache counts as a semantic
+    hit when ``semantic_threshold`` is set and the recorded best semantic
+    score reaches it; scores exist only for lookups that missed the exact
+    cache when the trace was recorded.
+    """
+
+    now = 0.0
+    cache = InMemoryExactCache(max_entries=config.capacity, admission=config.admission, clock=lambda: now)
+    placeholder = Artifact(type="replay", payload=None, version=0, scope={}, ttl_seconds=config.ttl_seconds or 0)
+    report = ReplayReport(config)
+    for event in events:
+        report.events += 1
+        if event.outcome not in _CACHEABLE:
+            report.uncacheable += 1
+            continue
+        now = event.timestamp
+        key = str(event.key_hash)
+        if cache.get(key) is not None:
+            report.exact_hits += 1
+            continue
+        threshold = config.semantic_threshold
+        if threshold is not None and not math.isnan(event.semantic_score) and event.semantic_score >= threshold:
+            report.semantic_hits += 1
+            continue
+        report.misses += 1
+        cache.set(key, placeholder)
+        report.peak_entries = max(report.peak_entries, len(cache))
+    return report
+
+
+def replay_grid(events: Sequence[TraceEvent], configs: Iterable[ReplayConfig]) -> List[ReplayReport]:
+    return [replay(events, config) for config in configs]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("trace", help="trace file written by TraceRecorder")
+    parser.add_argument("--capacity", type=int, action="append", help="max entries (repeatable; default unbounded)")
+    parser.add_argument("--admission", choices=("lru", "tinylfu"), action="append", help="repeatable; default lru")
+    parser.add_argument("--ttl", type=int, default=None, help="entry TTL in seconds")
+    parser.add_argument("--semantic-threshold", type=float, default=None)
+    parser.add_argument("--entry-bytes", type=int, default=2048, help="assumed size of one cached artifact")
+    args = parser.parse_args(argv)
+
+    events = list(read_trace(args.trace))
+    configs = [
+        ReplayConfig(
+            capacity=capacity,
+            admission=admission,
+            ttl_seconds=args.ttl,
+            semantic_threshold=args.semantic_threshold,
+            entry_bytes=args.entry_bytes,
+        )
+        for capacity, admission in itertools.product(args.capacity or [None], args.admission or ["lru"])
+    ]
+    print(f"{len(events)} events")
+    columns = ("capacity", "admission", "hit ratio", "exact", "semantic", "saved", "peak MB")
+    print(" ".join(f"{name:>{width}}" for name, width in zip(columns, (10, 9, 9, 8, 8, 8, 8))))
+    for report in replay_grid(events, configs):
+        config = report.config
+        print(
+            f"{config.capacity or 'inf':>10} {config.admission:>9} {report.hit_ratio:9.3f} {report.exact_hits:8d} "
+            f"{report.semantic_hits:8d} {report.calls_saved:8d} {report.projected_bytes / 1e6:8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import time
+from typing import Callable, Dict, Mapping, Optional, Sequence
+
+STAGES: Sequence[str] = ("normalize", "exact_get", "embed", "search")
+DEFAULT_STAGE_SHARES: Mapping[str, float] = {"normalize": 0.4, "exact_get": 0.2, "embed": 0.2, "search": 0.2}
+
+
+class LatencyBudget:
+    """Splits a per-lookup latency budget between the lookup stages.
+
+    A stage may use its share of whatever budget is still left, so time saved
+    by earlier stages (or by stages that were skipped) carries over to later
+    ones.
+    """
+
+    def __init__(
+        self,
+        total_ms: float,
+        shares: Optional[Mapping[str, float]] = None,
+        *,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self._shares = dict(DEFAULT_STAGE_SHARES)
+        if shares:
+            unknown = set(shares) - set(STAGES)
+            if unknown:
+                raise ValueError(f"unknown budget stages: {sorted(unknown)}")
+            self._shares.update(shares)
+        self._clock = clock
+        self._deadline = clock() + total_ms / 1000.0
+
+    def remaining(self) -> float:
+        return max(0.0, self._deadline - self._clock())
+
+    def timeout_for(self, stage: str) -> float:
+        """Seconds ``stage`` may take: its share of the budget still left for it and the stages after it."""
+
+        later = STAGES[STAGES.index(stage) :]
+        total_share = sum(self._shares[name] for name in later)
+        if total_share <= 0:
+            return self.remaining()
+        return self.remaining() * self._shares[stage] / total_share
+
+
+class CircuitBreaker:
+    """Skips a backend tier after repeated timeouts or errors.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    ``allow`` returns False for ``cooldown_seconds``. It then lets a single
+    trial call through; success closes it again and another failure reopens
+    it for a further cooldown.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        cooldown_seconds: float = 30.0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be positive")
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.timeouts = 0
+        self.errors = 0
+        self.short_circuits = 0
+        self.opened = 0
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.cooldown_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_running:
+            self._trial_running = True
+            return True
+        self.short_circuits += 1
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    def release(self) -> None:
+        """Forget a trial call that was cancelled before it finished."""
+
+        self._trial_running = False
+
+    def record_failure(self, *, timed_out: bool) -> None:
+        if timed_out:
+            self.timeouts += 1
+        else:
+            self.errors += 1
+        self._failures += 1
+        if self._trial_running or (self._opened_at is None and self._failures >= self.failure_threshold):
+            self._opened_at = self._clock()
+            self.opened += 1
+        self._trial_running = False
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "state": self.state,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "short_circuits": self.short_circuits,
+            "opened": self.opened,
+        }
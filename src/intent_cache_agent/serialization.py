@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import json
+from dataclasses import replace
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .models import Artifact, CacheHit, LazyArtifact
+
+_ENVELOPE_PREFIX = b'{"envelope": 1'
+_STREAM_CHUNK = 64 * 1024
+
+
+def artifact_body(artifact: Artifact) -> Dict[str, Any]:
+    return {
+        "type": artifact.type,
+        "payload": artifact.payload,
+        "version": artifact.version,
+        "scope": artifact.scope,
+        "ttl_seconds": artifact.ttl_seconds,
+    }
+
+
+def artifact_to_dict(artifact: Artifact) -> Dict[str, Any]:
+    body = artifact_body(artifact)
+    body["provenance"] = artifact.provenance
+    return body
+
+
+def encode_artifact(artifact: Artifact) -> Artifact:
+    """Return ``artifact`` carrying its JSON body (everything but provenance) pre-encoded."""
+
+    if artifact.encoded_json is not None:
+        return artifact
+    encoded = replace(artifact)
+    object.__setattr__(encoded, "_encoded_json", json.dumps(artifact_body(artifact), ensure_ascii=True))
+    return encoded
+
+
+def artifact_json(artifact: Artifact) -> str:
+    """Serialize ``artifact`` to JSON, splicing provenance into a pre-encoded body when present."""
+
+    if isinstance(artifact, CacheHit):
+        provenance = artifact.provenance_json()
+    else:
+        provenance = json.dumps(artifact.provenance, ensure_ascii=True)
+    if artifact.encoded_json is None:
+        body = json.dumps(artifact_body(artifact), ensure_ascii=True)
+    else:
+        body = artifact.encoded_json
+    return f'{body[:-1]}, "provenance": {provenance}}}'
+
+
+def encode_envelope(
+    artifact: Artifact,
+    *,
+    chunk_threshold: Optional[int] = None,
+    chunk_size: int = 256 * 1024,
+    generation: Optional[str] = None,
+    labels: Sequence[str] = (),
+) -> Tuple[bytes, List[bytes]]:
+    """Encode ``artifact`` as an envelope: one metadata JSON line, then the payload JSON.
+
+    A payload JSON longer than ``chunk_threshold`` bytes is instead returned
+    as a list of chunks of at most ``chunk_size`` bytes, to be stored
+    separately; the envelope then holds only the metadata line, starting
+    with ``generation`` (a short hex ID naming that chunk list) when given.
+    ``labels`` (the value's secondary-index labels) are recorded in the
+    header so the store can unindex the value when it is replaced.
+    """
+
+    payload = _payload_bytes(artifact)
+    chunks: List[bytes] = []
+    if chunk_threshold is not None and len(payload) > chunk_threshold:
+        chunks = [payload[start : start + chunk_size] for start in range(0, len(payload), chunk_size)]
+    header: Dict[str, Any] = {"envelope": 1}
+    if chunks and generation is not None:
+        # Kept first so RedisExactCache's scripts can read it from a short prefix.
+        header["generation"] = generation
+    header.update(
+        type=artifact.type,
+        version=artifact.version,
+        scope=artifact.scope,
+        ttl_seconds=artifact.ttl_seconds,
+        provenance=artifact.provenance,
+        payload_bytes=len(payload),
+        chunks=len(chunks),
+    )
+    if labels:
+        header["labels"] = list(labels)
+    line = json.dumps(header, ensure_ascii=True).encode("ascii")
+    if chunks:
+        return line, chunks
+    return line + b"\n" + payload, []
+
+
+def decode_envelope(
+    raw: bytes | str, fetch_chunks: Callable[[int, Optional[str]], Iterator[bytes]]
+) -> Artifact:
+    """Decode a stored value into a ``LazyArtifact``; values written before envelopes decode eagerly.
+
+    ``fetch_chunks(count, generation)`` must yield the payload chunks
+    stored under ``generation`` in order (``generation`` is None for
+    envelopes written without one).
+    """
+
+    data = raw.encode("utf-8") if isinstance(raw, str) else raw
+    if not data.startswith(_ENVELOPE_PREFIX):
+        return Artifact(**json.loads(data))
+    line, _, inline = data.partition(b"\n")
+    header = json.loads(line)
+    count = header["chunks"]
+    generation = header.get("generation")
+    if count:
+
+        def load() -> bytes:
+            return b"".join(fetch_chunks(count, generation))
+
+        def stream() -> Iterator[bytes]:
+            return fetch_chunks(count, generation)
+
+    else:
+
+        def load() -> bytes:
+            return inline
+
+        def stream() -> Iterator[bytes]:
+            return (inline[start : start + _STREAM_CHUNK] for start in range(0, len(inline), _STREAM_CHUNK))
+
+    return LazyArtifact(
+        type=header["type"],
+        version=header["version"],
+        scope=header["scope"],
+        ttl_seconds=header["ttl_seconds"],
+        provenance=header["provenance"],
+        payload_size=header["payload_bytes"],
+        load_payload=load,
+        stream_payload=stream,
+    )
+
+
+def _payload_bytes(artifact: Artifact) -> bytes:
+    stored = artifact.artifact if isinstance(artifact, CacheHit) else artifact
+    if isinstance(stored, LazyArtifact):
+        return b"".join(stored.payload_chunks())
+    return json.dumps(artifact.payload, ensure_ascii=True).encode("ascii")
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import bisect
+import hashlib
+import itertools
+from typing import Any, Collection, Dict, List, Mapping, Optional, Sequence, cast
+
+from .interfaces import ExactCache
+from .models import Artifact
+
+
+class HashRing:
+    """Consistent-hash ring mapping keys to node names.
+
+    Each node owns ``virtual_nodes`` points on a 64-bit ring; a key belongs
+    to the first point clockwise of its hash. Adding or removing a node only
+    moves the keys on the arcs that node gains or loses, about ``1/N`` of
+    them.
+    """
+
+    def __init__(self, nodes: Collection[str] = (), *, virtual_nodes: int = 128) -> None:
+        if virtual_nodes < 1:
+            raise ValueError("virtual_nodes must be positive")
+        self._virtual_nodes = virtual_nodes
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        self._nodes: List[str] = []
+        for node in nodes:
+            self.add(node)
+
+    @property
+    def nodes(self) -> List[str]:
+        return list(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def add(self, node: str) -> None:
+        if node in self._nodes:
+            raise ValueError(f"node {node!r} is already on the ring")
+        self._nodes.append(node)
+        for replica in range(self._virtual_nodes):
+            point = _hash(f"{node}#{replica}")
+            index = bisect.bisect(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+
+    def remove(self, node: str) -> None:
+        self._nodes.remove(node)
+        kept = [(point, owner) for point, owner in zip(self._points, self._owners) if owner != node]
+        self._points = [point for point, _ in kept]
+        self._owners = [owner for _, owner in kept]
+
+    def lookup(self, key: str, count: int = 1) -> List[str]:
+        """Return up to ``count`` distinct nodes for ``key``, primary first."""
+
+        if not self._points:
+            raise LookupError("hash ring has no nodes")
+        count = min(count, len(self._nodes))
+        start = bisect.bisect(self._points, _hash(key))
+        found: List[str] = []
+        for offset in range(len(self._points)):
+            owner = self._owners[(start + offset) % len(self._points)]
+            if owner not in found:
+                found.append(owner)
+                if len(found) == count:
+                    break
+        return found
+
+
+class ShardedExactCache:
+    """Spreads keys over several ``ExactCache`` backends with consistent hashing.
+
+    With ``replicas > 1`` each key is written to that many distinct nodes and
+    reads rotate between them, spreading hot keys. Adding a node does not
+    migrate data: the keys it takes over miss once and are refilled by the
+    caller. ``get_many`` groups keys by node and uses a backend's own
+    ``get_many`` (e.g. ``RedisExactCache``'s ``MGET``) when it has one.
+    """
+
+    def __init__(
+        self,
+        nodes: Mapping[str, ExactCache],
+        *,
+        virtual_nodes: int = 128,
+        replicas: int = 1,
+    ) -> None:
+        if replicas < 1:
+            raise ValueError("replicas must be positive")
+        self._nodes: Dict[str, ExactCache] = dict(nodes)
+        self._ring = HashRing(self._nodes, virtual_nodes=virtual_nodes)
+        self._replicas = replicas
+        self._read_turn = itertools.count()
+
+    @property
+    def nodes(self) -> Dict[str, ExactCache]:
+        return dict(self._nodes)
+
+    def add_node(self, name: str, cache: ExactCache) -> None:
+        self._ring.add(name)
+        self._nodes[name] = cache
+
+    def remove_node(self, name: str) -> ExactCache:
+        self._ring.remove(name)
+        return self._nodes.pop(name)
+
+    def nodes_for(self, key: str) -> List[str]:
+        return self._ring.lookup(key, self._replicas)
+
+    def get(self, key: str) -> Optional[Artifact]:
+        owners = self.nodes_for(key)
+        return self._nodes[self._read_node(owners)].get(key)
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, Artifact]:
+        by_node: Dict[str, List[str]] = {}
+        for key in keys:
+            by_node.setdefault(self._read_node(self.nodes_for(key)), []).append(key)
+        found: Dict[str, Artifact] = {}
+        for name, node_keys in by_node.items():
+            backend = self._nodes[name]
+            get_many = getattr(backend, "get_many", None)
+            if get_many is not None:
+                found.update(get_many(node_keys))
+                continue
+            for key in node_keys:
+                artifact = backend.get(key)
+                if artifact is not None:
+                    found[key] = artifact
+        return found
+
+    def set(
+        self,
+        key: str,
+        artifact: Artifact,
+        ttl_seconds: Optional[int] = None,
+        *,
+        intent: Optional[str] = None,
+        tags: Collection[str] = (),
+    ) -> None:
+        labels: Dict[str, Any] = {}
+        if intent is not None:
+            labels["intent"] = intent
+        if tags:
+            labels["tags"] = tags
+        for name in self.nodes_for(key):
+            cast(Any, self._nodes[name]).set(key, artifact, ttl_seconds, **labels)
+
+    def delete(self, key: str) -> bool:
+        deleted = False
+        for name in self.nodes_for(key):
+            deleted = bool(cast(Any, self._nodes[name]).delete(key)) or deleted
+        return deleted
+
+    def invalidate(
+        self,
+        *,
+        intent: Optional[str] = None,
+        scope: Optional[Dict[str, Any]] = None,
+        tags: Collection[str] = (),
+        version: Optional[str | int] = None,
+    ) -> int:
+        """Run ``invalidate`` on every node; replicated keys are counted once per copy."""
+
+        return sum(
+            cast(Any, backend).invalidate(intent=intent, scope=scope, tags=tags, version=version)
+            for backend in self._nodes.values()
+        )
+
+    def _read_node(self, owners: List[str]) -> str:
+        if len(owners) == 1:
+            return owners[0]
+        return owners[next(self._read_turn) % len(owners)]
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "little")
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import IO, Any, BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from .canonicalization import canonicalize_mapping
+
+_MAGIC = b"ICTR\x01"
+_CHUNK = struct.Struct("<4sII")
+_STRING = struct.Struct("<IH")
+_EVENT = struct.Struct("<dQIIBfIII")
+
+
+class LookupOutcome(IntEnum):
+    BYPASS = 0
+    NO_INTENT = 1
+    REJECTED = 2
+    EXACT_HIT = 3
+    SEMANTIC_HIT = 4
+    MISS = 5
+    DEGRADED = 6
+
+
+@dataclass(slots=True)
+class LookupTrace:
+    """Mutable record filled in by ``CachedIntentAgent`` while a lookup runs."""
+
+    timestamp: float = 0.0
+    key: Optional[str] = None
+    intent: Optional[str] = None
+    scope: Optional[Dict[str, Any]] = None
+    outcome: LookupOutcome = LookupOutcome.MISS
+    semantic_score: Optional[float] = None
+    normalize_us: int = 0
+    exact_us: int = 0
+    semantic_us: int = 0
+
+
+class TraceEvent(NamedTuple):
+    timestamp: float
+    key_hash: int
+    intent: str
+    scope: str
+    outcome: LookupOutcome
+    semantic_score: float
+    normalize_us: int
+    exact_us: int
+    semantic_us: int
+
+
+class TraceRecorder:
+    """Appends lookup traces to a compact binary file.
+
+    Events are fixed-size records (41 bytes) holding the key hash rather than
+    the key; intent and scope strings are interned into a table written
+    alongside each flushed chunk. Read traces back with ``read_trace``.
+    """
+
+    def __init__(self, target: str | BinaryIO, *, buffer_events: int = 4096) -> None:
+        self._owns_file = isinstance(target, str)
+        self._file: IO[bytes] = open(target, "wb") if isinstance(target, str) else target
+        self._file.write(_MAGIC)
+        self._buffer_events = max(buffer_events, 1)
+        self._lock = threading.Lock()
+        self._string_ids: Dict[str, int] = {"": 0}
+        self._new_strings: List[Tuple[int, bytes]] = []
+        self._events: List[bytes] = []
+
+    def record(self, trace: LookupTrace) -> None:
+        key_hash = hash_key(trace.key) if trace.key is not None else 0
+        scope = _scope_text(trace.scope)
+        score = trace.semantic_score if trace.semantic_score is not None else math.nan
+        with self._lock:
+            packed = _EVENT.pack(
+                trace.timestamp,
+                key_hash,
+                self._string_id(trace.intent or ""),
+                self._string_id(scope),
+                int(trace.outcome),
+                score,
+                _clamp_us(trace.normalize_us),
+                _clamp_us(trace.exact_us),
+                _clamp_us(trace.semantic_us),
+            )
+            self._events.append(packed)
+            if len(self._events) >= self._buffer_events:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            self._file.flush()
+
+    def close(self) -> None:
+        self.flush()
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self) -> "TraceRecorder":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _string_id(self, text: str) -> int:
+        string_id = self._string_ids.get(text)
+        if string_id is None:
+            string_id = self._string_ids[text] = len(self._string_ids)
+            self._new_strings.append((string_id, text.encode("utf-8")))
+        return string_id
+
+    def _flush_locked(self) -> None:
+        if not self._events and not self._new_strings:
+            return
+        parts = [_CHUNK.pack(b"CHNK", len(self._new_strings), len(self._events))]
+        for string_id, encoded in self._new_strings:
+            parts.append(_STRING.pack(string_id, len(encoded)))
+            parts.append(encoded)
+        parts.extend(self._events)
+        self._file.write(b"".join(parts))
+        self._new_strings = []
+        self._events = []
+
+
+def read_trace(source: str | BinaryIO) -> Iterator[TraceEvent]:
+    """Yield the events of a trace written by ``TraceRecorder``."""
+
+    if isinstance(source, str):
+        with open(source, "rb") as handle:
+            data = handle.read()
+    else:
+        data = source.read()
+    if not data.startswith(_MAGIC):
+        raise ValueError("not an intent cache trace")
+    strings: Dict[int, str] = {0: ""}
+    offset = len(_MAGIC)
+    while offset < len(data):
+        marker, string_count, event_count = _CHUNK.unpack_from(data, offset)
+        if marker != b"CHNK":
+            raise ValueError(f"corrupt trace chunk at byte {offset}")
+        offset += _CHUNK.size
+        for _ in range(string_count):
+            string_id, length = _STRING.unpack_from(data, offset)
+            offset += _STRING.size
+            strings[string_id] = data[offset : offset + length].decode("utf-8")
+            offset += length
+        end = offset + event_count * _EVENT.size
+        for timestamp, key_hash, intent, scope, outcome, score, normalize, exact, semantic in _EVENT.iter_unpack(
+            data[offset:end]
+        ):
+            yield TraceEvent(
+                timestamp,
+                key_hash,
+                strings[intent],
+                strings[scope],
+                LookupOutcome(outcome),
+                score,
+                normalize,
+                exact,
+                semantic,
+            )
+        offset = end
+
+
+def hash_key(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def elapsed_us(started: float) -> int:
+    return int((time.perf_counter() - started) * 1_000_000)
+
+
+def _scope_text(scope: Optional[Dict[str, Any]]) -> str:
+    if not scope:
+        return ""
+    return json.dumps(canonicalize_mapping(scope, drop_empty=False), sort_keys=True, separators=(",", ":"))
+
+
+def _clamp_us(value: int) -> int:
+    return max(0, min(int(value), 0xFFFFFFFF))
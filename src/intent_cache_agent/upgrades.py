@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from .models import Artifact
+
+Upgrader = Callable[[Artifact], Optional[Artifact]]
+
+
+class UpgradeRegistry:
+    """Converts artifacts cached under an older schema version to a newer one.
+
+    Upgraders are registered per ``(from_version, to_version)`` step and
+    chained when no direct step exists (``v1 -> v2 -> v3``). An upgrader may
+    return None to reject an artifact that cannot be converted.
+    """
+
+    def __init__(self) -> None:
+        self._steps: Dict[str, Dict[str, Upgrader]] = {}
+        self._paths: Dict[Tuple[str, str], Optional[List[Upgrader]]] = {}
+
+    def register(
+        self, from_version: str, to_version: str, upgrader: Optional[Upgrader] = None
+    ) -> Callable[[Upgrader], Upgrader]:
+        """Register ``upgrader``; without it, return a decorator that registers the decorated function."""
+
+        def add(function: Upgrader) -> Upgrader:
+            self._steps.setdefault(from_version, {})[to_version] = function
+            self._paths.clear()
+            return function
+
+        if upgrader is not None:
+            add(upgrader)
+        return add
+
+    def can_upgrade(self, from_version: str, to_version: str) -> bool:
+        return self._path(from_version, to_version) is not None
+
+    def upgrade(self, artifact: Artifact, from_version: str, to_version: str) -> Optional[Artifact]:
+        path = self._path(from_version, to_version)
+        if path is None:
+            return None
+        upgraded: Optional[Artifact] = artifact
+        for step in path:
+            upgraded = step(upgraded)
+            if upgraded is None:
+                return None
+        return upgraded
+
+    def _path(self, from_version: str, to_version: str) -> Optional[List[Upgrader]]:
+        cache_key = (from_version, to_version)
+        if cache_key not in self._paths:
+            self._paths[cache_key] = self._shortest_path(from_version, to_version)
+        return self._paths[cache_key]
+
+    def _shortest_path(self, from_version: str, to_version: str) -> Optional[List[Upgrader]]:
+        if from_version == to_version:
+            return []
+        queue: Deque[Tuple[str, List[Upgrader]]] = deque([(from_version, [])])
+        seen = {from_version}
+        while queue:
+            version, path = queue.popleft()
+            for target, step in self._steps.get(version, {}).items():
+                if target == to_version:
+                    return path + [step]
+                if target not in seen:
+                    seen.add(target)
+                    queue.append((target, path + [step]))
+        return None
@@ -0,0 +1,363 @@
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Any, List, Optional, Sequence, cast
+
+
+class ListVectorStore:
+    """Stores vectors as plain Python lists (the historical behaviour)."""
+
+    approximate = False
+
+    def __init__(self) -> None:
+        self._vectors: List[List[float]] = []
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def add(self, vector: Sequence[float]) -> int:
+        self._vectors.append(list(vector))
+        return len(self._vectors) - 1
+
+    def scores(self, query: Sequence[float]) -> List[float]:
+        return [_cosine_similarity(query, vector) for vector in self._vectors]
+
+    def rescore(self, query: Sequence[float], slots: Sequence[int]) -> List[float]:
+        return [_cosine_similarity(query, self._vectors[slot]) for slot in slots]
+
+    def compact(self, keep: Sequence[int]) -> None:
+        self._vectors = [self._vectors[slot] for slot in keep]
+
+
+class Float32VectorStore:
+    """Packs vectors into one contiguous float32 buffer (4 bytes per dimension).
+
+    Scoring is one matrix-vector product when NumPy is installed.
+    """
+
+    approximate = False
+
+    def __init__(self) -> None:
+        self._dim: Optional[int] = None
+        self._data = array("f")
+        self._norms = array("f")
+        self._np = _optional_numpy()
+
+    def __len__(self) -> int:
+        return len(self._norms)
+
+    def add(self, vector: Sequence[float]) -> int:
+        self._dim = _check_dim(self._dim, vector)
+        self._data.extend(vector)
+        self._norms.append(_norm(vector))
+        return len(self._norms) - 1
+
+    def scores(self, query: Sequence[float]) -> List[float]:
+        return self.rescore(query, range(len(self)))
+
+    def rescore(self, query: Sequence[float], slots: Sequence[int]) -> List[float]:
+        query_norm = _query_norm(self._dim, query)
+        if query_norm is None:
+            return [-1.0 for _ in slots]
+        dim = cast(int, self._dim)
+        if self._np is not None:
+            return _numpy_scores(self._np, self._data, None, self._norms, dim, query, query_norm, slots)
+        view = memoryview(self._data)
+        return [
+            _scaled_cosine(_dot(query, view[slot * dim : (slot + 1) * dim]), 1.0, query_norm, self._norms[slot])
+            for slot in slots
+        ]
+
+    def compact(self, keep: Sequence[int]) -> None:
+        self._data = _gather(self._data, keep, self._dim or 0)
+        self._norms = _gather(self._norms, keep, 1)
+
+
+class Int8VectorStore:
+    """Scalar-quantizes vectors to int8 with a per-vector scale (1 byte per dimension).
+
+    Scores are approximate; set ``keep_originals`` to keep a float32 copy that is
+    used to re-score the top candidates exactly. Without it there is nothing
+    exact to re-score against, so ``approximate`` is False and the cache ranks
+    on the int8 scores directly. Scoring uses NumPy when it is installed.
+    """
+
+    approximate = True
+
+    def __init__(self, *, keep_originals: bool = False) -> None:
+        self._dim: Optional[int] = None
+        self._codes = array("b")
+        self._scales = array("f")
+        self._norms = array("f")
+        self._originals: Optional[Float32VectorStore] = Float32VectorStore() if keep_originals else None
+        self.approximate = keep_originals
+        self._np = _optional_numpy()
+
+    def __len__(self) -> int:
+        return len(self._norms)
+
+    def add(self, vector: Sequence[float]) -> int:
+        self._dim = _check_dim(self._dim, vector)
+        peak = max((abs(value) for value in vector), default=0.0)
+        scale = peak / 127.0 if peak else 1.0
+        self._codes.extend(max(-127, min(127, round(value / scale))) for value in vector)
+        self._scales.append(scale)
+        self._norms.append(_norm(vector))
+        if self._originals is not None:
+            self._originals.add(vector)
+        return len(self._norms) - 1
+
+    def scores(self, query: Sequence[float]) -> List[float]:
+        return self._approximate_scores(query, range(len(self)))
+
+    def rescore(self, query: Sequence[float], slots: Sequence[int]) -> List[float]:
+        if self._originals is not None:
+            return self._originals.rescore(query, slots)
+        return self._approximate_scores(query, slots)
+
+    def compact(self, keep: Sequence[int]) -> None:
+        self._codes = _gather(self._codes, keep, self._dim or 0)
+        self._scales = _gather(self._scales, keep, 1)
+        self._norms = _gather(self._norms, keep, 1)
+        if self._originals is not None:
+            self._originals.compact(keep)
+
+    def _approximate_scores(self, query: Sequence[float], slots: Sequence[int]) -> List[float]:
+        query_norm = _query_norm(self._dim, query)
+        if query_norm is None:
+            return [-1.0 for _ in slots]
+        dim = cast(int, self._dim)
+        if self._np is not None:
+            return _numpy_scores(self._np, self._codes, self._scales, self._norms, dim, query, query_norm, slots)
+        view = memoryview(self._codes)
+        return [
+            _scaled_cosine(
+                _dot(query, view[slot * dim : (slot + 1) * dim]),
+                self._scales[slot],
+                query_norm,
+                self._norms[slot],
+            )
+            for slot in slots
+        ]
+
+
+class ProductQuantizedVectorStore:
+    """Product-quantized vectors scored with asymmetric distance computation.
+
+    The first ``train_size`` vectors are held in float32 and searched exactly;
+    once that many have been added, per-subspace codebooks are trained with
+    k-means and every vector is stored as ``num_subvectors`` one-byte codes.
+    Requires NumPy.
+    """
+
+    approximate = True
+
+    def __init__(
+        self,
+        *,
+        num_subvectors: int = 8,
+        num_centroids: int = 256,
+        train_size: int = 1024,
+        iterations: int = 10,
+        keep_originals: bool = False,
+        seed: int = 0,
+    ) -> None:
+        try:
+            import numpy as np
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise ImportError("numpy is required for ProductQuantizedVectorStore") from exc
+        if not 1 <= num_centroids <= 256:
+            raise ValueError("num_centroids must be between 1 and 256")
+        self._np = np
+        self._num_subvectors = num_subvectors
+        self._num_centroids = num_centroids
+        self._train_size = max(train_size, 1)
+        self._iterations = iterations
+        self._seed = seed
+        self._dim: Optional[int] = None
+        self._pending: Optional[Float32VectorStore] = Float32VectorStore()
+        self._codebooks: Any = None
+        self._codes = array("B")
+        self._norms = array("f")
+        self._originals: Optional[Float32VectorStore] = Float32VectorStore() if keep_originals else None
+
+    @property
+    def trained(self) -> bool:
+        return self._codebooks is not None
+
+    def __len__(self) -> int:
+        return len(self._norms)
+
+    def add(self, vector: Sequence[float]) -> int:
+        if len(vector) % self._num_subvectors:
+            raise ValueError("vector dimension must be divisible by num_subvectors")
+        self._dim = _check_dim(self._dim, vector)
+        self._norms.append(_norm(vector))
+        if self._originals is not None:
+            self._originals.add(vector)
+        if self._pending is not None:
+            self._pending.add(vector)
+            if len(self._pending) >= self._train_size:
+                self._train()
+        else:
+            self._codes.extend(self._encode(self._np.asarray([vector], dtype=self._np.float32))[0])
+        return len(self._norms) - 1
+
+    def scores(self, query: Sequence[float]) -> List[float]:
+        if self._pending is not None:
+            return self._pending.scores(query)
+        return self._approximate_scores(query, None)
+
+    def rescore(self, query: Sequence[float], slots: Sequence[int]) -> List[float]:
+        if self._originals is not None:
+            return self._originals.rescore(query, slots)
+        if self._pending is not None:
+            return self._pending.rescore(query, slots)
+        return self._approximate_scores(query, slots)
+
+    def compact(self, keep: Sequence[int]) -> None:
+        self._norms = _gather(self._norms, keep, 1)
+        if self._originals is not None:
+            self._originals.compact(keep)
+        if self._pending is not None:
+            self._pending.compact(keep)
+        else:
+            self._codes = _gather(self._codes, keep, self._num_subvectors)
+
+    def _approximate_scores(self, query: Sequence[float], slots: Optional[Sequence[int]]) -> List[float]:
+        count = len(self) if slots is None else len(slots)
+        query_norm = _query_norm(self._dim, query)
+        if query_norm is None:
+            return [-1.0] * count
+        np = self._np
+        sub_query = np.asarray(query, dtype=np.float32).reshape(self._num_subvectors, -1)
+        table = np.einsum("mkd,md->mk", self._codebooks, sub_query)
+        codes = np.frombuffer(self._codes, dtype=np.uint8).reshape(-1, self._num_subvectors)
+        norms = np.frombuffer(self._norms, dtype=np.float32)
+        if slots is not None:
+            index = np.asarray(slots, dtype=np.int64)
+            codes, norms = codes[index], norms[index]
+        dots = table[np.arange(self._num_subvectors), codes].sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.where(norms > 0, dots / (norms * query_norm), -1.0)
+        return scores.tolist()
+
+    def _train(self) -> None:
+        np = self._np
+        pending = cast(Float32VectorStore, self._pending)
+        data = np.frombuffer(pending._data, dtype=np.float32).reshape(len(pending), -1)
+        sub_dim = data.shape[1] // self._num_subvectors
+        centroids = min(self._num_centroids, len(data))
+        rng = np.random.default_rng(self._seed)
+        codebooks = np.zeros((self._num_subvectors, centroids, sub_dim), dtype=np.float32)
+        for m in range(self._num_subvectors):
+            codebooks[m] = _kmeans(np, data[:, m * sub_dim : (m + 1) * sub_dim], centroids, self._iterations, rng)
+        self._codebooks = codebooks
+        self._codes = array("B", self._encode(data).tobytes())
+        self._pending = None
+
+    def _encode(self, data: Any) -> Any:
+        np = self._np
+        sub = data.reshape(len(data), self._num_subvectors, -1)
+        codes = np.empty((len(data), self._num_subvectors), dtype=np.uint8)
+        for m in range(self._num_subvectors):
+            codes[:, m] = _nearest(np, sub[:, m, :], self._codebooks[m])
+        return codes
+
+
+def _kmeans(np: Any, data: Any, k: int, iterations: int, rng: Any) -> Any:
+    centroids = data[rng.choice(len(data), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = _nearest(np, data, centroids)
+        for index in range(k):
+            members = data[assignment == index]
+            if len(members):
+                centroids[index] = members.mean(axis=0)
+    return centroids
+
+
+def _nearest(np: Any, data: Any, centroids: Any) -> Any:
+    distances = (centroids**2).sum(axis=1)[None, :] - 2.0 * data @ centroids.T
+    return distances.argmin(axis=1)
+
+
+def _optional_numpy() -> Any:
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+    return numpy
+
+
+def _numpy_scores(
+    np: Any,
+    data: array,
+    scales: Optional[array],
+    norms: array,
+    dim: int,
+    query: Sequence[float],
+    query_norm: float,
+    slots: Sequence[int],
+) -> List[float]:
+    if not len(slots):
+        return []
+    index = np.asarray(slots, dtype=np.int64)
+    dtype = np.float32 if data.typecode == "f" else np.int8
+    matrix = np.frombuffer(data, dtype=dtype).reshape(-1, dim)
+    if slots != range(len(matrix)):
+        matrix = matrix[index]
+    dots = matrix @ np.asarray(query, dtype=np.float32)
+    if scales is not None:
+        dots = dots * np.frombuffer(scales, dtype=np.float32)[index]
+    vector_norms = np.frombuffer(norms, dtype=np.float32)[index]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.where(vector_norms > 0, dots / (vector_norms * query_norm), -1.0)
+    return scores.tolist()
+
+
+def _gather(data: array, keep: Sequence[int], width: int) -> array:
+    packed = array(data.typecode)
+    for slot in keep:
+        packed.extend(data[slot * width : (slot + 1) * width])
+    return packed
+
+
+def _check_dim(dim: Optional[int], vector: Sequence[float]) -> int:
+    if len(vector) == 0:
+        raise ValueError("cannot store an empty vector")
+    if dim is not None and len(vector) != dim:
+        raise ValueError(f"expected vector of dimension {dim}, got {len(vector)}")
+    return len(vector)
+
+
+def _query_norm(dim: Optional[int], query: Sequence[float]) -> Optional[float]:
+    if dim is None or len(query) != dim:
+        return None
+    norm = _norm(query)
+    return norm or None
+
+
+def _norm(vector: Sequence[float]) -> float:
+    return math.sqrt(sum(x * x for x in vector))
+
+
+def _dot(a: Sequence[float], b: Any) -> float:
+    return sum(x * y for x, y in zip(a, b))
+
+
+def _scaled_cosine(dot: float, scale: float, query_norm: float, norm: float) -> float:
+    if norm == 0:
+        return -1.0
+    return dot * scale / (query_norm * norm)
+
+
+def _cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
+    if not a or not b or len(a) != len(b):
+        return -1.0
+    dot = sum(x * y for x, y in zip(a, b))
+    norm_a = math.sqrt(sum(x * x for x in a))
+    norm_b = math.sqrt(sum(y * y for y in b))
+    if norm_a == 0 or norm_b == 0:
+        return -1.0
+    return dot / (norm_a * norm_b)
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Collection, Dict, List, Optional, Sequence, Tuple, Union, cast
+
+from .interfaces import ExactCache, SemanticCache
+from .models import Artifact, CacheWrite
+
+
+@dataclass
+class WriteBehindStats:
+    queued: int = 0
+    coalesced: int = 0
+    dropped: int = 0
+    written: int = 0
+    batches: int = 0
+    errors: int = 0
+
+
+@dataclass(frozen=True)
+class _SemanticWrite:
+    intent: str
+    slots: Dict[str, Any]
+    artifact: Artifact
+    key: Optional[str]
+    ttl_seconds: Optional[int]
+    tags: Tuple[str, ...]
+
+
+_Pending = Union[CacheWrite, _SemanticWrite]
+
+
+class WriteBehindCache:
+    """Queues cache writes and flushes them from a background thread.
+
+    ``set`` (and ``add_semantic``, which also defers the embedding) return
+    once the write is queued. The worker flushes up to ``batch_size`` writes
+    per batch, through ``set_many`` when the exact cache has it (one Redis
+    pipeline) and ``set`` otherwise. A batch is flushed once it is full or
+    ``flush_interval_ms`` after its first write was queued, whichever comes
+    first. A newer write to a queued key replaces
+    the older one. ``get`` serves queued artifacts first, so a lookup right
+    after a store still hits.
+
+    At most ``max_pending`` writes wait. When the queue is full, ``set``
+    waits up to ``block_timeout_seconds`` for room and then drops the write
+    (``stats.dropped``); ``block_timeout_seconds=0`` drops immediately.
+    ``close()`` (or leaving a ``with`` block) flushes what is queued and
+    stops the worker. The backends are written from the worker thread while
+    callers read them, so they must be thread-safe; Redis clients and the
+    in-memory caches are.
+    """
+
+    def __init__(
+        self,
+        exact_cache: ExactCache,
+        semantic_cache: Optional[SemanticCache] = None,
+        *,
+        max_pending: int = 10_000,
+        batch_size: int = 100,
+        flush_interval_ms: float = 5.0,
+        block_timeout_seconds: Optional[float] = 1.0,
+    ) -> None:
+        if max_pending < 1 or batch_size < 1:
+            raise ValueError("max_pending and batch_size must be positive")
+        self._exact = exact_cache
+        self._semantic = semantic_cache
+        self._max_pending = max_pending
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval_ms / 1000.0
+        self._block_timeout = block_timeout_seconds
+        # Insertion-ordered; keyed writes coalesce, unkeyed semantic adds get a unique slot.
+        self._pending: Dict[Any, _Pending] = {}
+        self._in_flight: Dict[Any, _Pending] = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._closed = False
+        self.stats = WriteBehindStats()
+        self.last_error: Optional[BaseException] = None
+        self._worker = threading.Thread(target=self._run, name="intent-cache-write-behind", daemon=True)
+        self._worker.start()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def __getattr__(self, name: str) -> Any:
+        # get_many, partition_stats, ... go straight to the exact cache.
+        return getattr(self._exact, name)
+
+    def get(self, key: str) -> Optional[Artifact]:
+        with self._lock:
+            pending = self._pending.get(("exact", key)) or self._in_flight.get(("exact", key))
+        if isinstance(pending, CacheWrite):
+            return pending.artifact
+        return self._exact.get(key)
+
+    def set(
+        self,
+        key: str,
+        artifact: Artifact,
+        ttl_seconds: Optional[int] = None,
+        *,
+        intent: Optional[str] = None,
+        tags: Collection[str] = (),
+    ) -> bool:
+        """Queue a write; return False if it was dropped because the queue stayed full."""
+
+        return self._enqueue(("exact", key), CacheWrite(key, artifact, ttl_seconds, intent, tuple(tags)))
+
+    def add_semantic(
+        self,
+        intent: str,
+        slots: Dict[str, Any],
+        artifact: Artifact,
+        *,
+        key: Optional[str] = None,
+        ttl_seconds: Optional[int] = None,
+        tags: Collection[str] = (),
+    ) -> bool:
+        """Queue an embed-and-add into the semantic cache; return False if dropped."""
+
+        if self._semantic is None:
+            raise ValueError("WriteBehindCache was created without a semantic_cache")
+        slot = ("semantic", key) if key is not None else ("semantic", object())
+        return self._enqueue(slot, _SemanticWrite(intent, slots, artifact, key, ttl_seconds, tuple(tags)))
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            dropped = self._pending.pop(("exact", key), None) is not None
+        deleted = bool(cast(Any, self._exact).delete(key))
+        return deleted or dropped
+
+    def invalidate(self, **criteria: Any) -> int:
+        # Queued writes that match must not land after the invalidation.
+        self.flush()
+        return int(cast(Any, self._exact).invalidate(**criteria))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued write has been attempted; return False on timeout."""
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._changed:
+            self._changed.notify_all()
+            while self._pending or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._changed.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Flush queued writes and stop the worker."""
+
+        with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+        self._worker.join(timeout)
+
+    def __enter__(self) -> "WriteBehindCache":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _enqueue(self, slot: Any, write: _Pending) -> bool:
+        with self._changed:
+            if self._closed:
+                raise RuntimeError("WriteBehindCache is closed")
+            if slot in self._pending:
+                # Re-queue at the end so the newest value is written last.
+                del self._pending[slot]
+                self._pending[slot] = write
+                self.stats.coalesced += 1
+                return True
+            if len(self._pending) >= self._max_pending:
+                if self._block_timeout != 0:
+                    self._changed.wait_for(lambda: len(self._pending) < self._max_pending, self._block_timeout)
+                if len(self._pending) >= self._max_pending:
+                    self.stats.dropped += 1
+                    return False
+            self._pending[slot] = write
+            self.stats.queued += 1
+            # The first write starts the flush_interval timer; a full batch flushes at once.
+            if len(self._pending) == 1 or len(self._pending) >= self._batch_size:
+                self._changed.notify_all()
+            return True
+
+    def _run(self) -> None:
+        while True:
+            with self._changed:
+                if not self._pending and not self._closed:
+                    self._changed.wait()
+                if len(self._pending) < self._batch_size and not self._closed:
+                    # Give concurrent writers a moment to fill the batch.
+                    self._changed.wait(self._flush_interval)
+                if not self._pending:
+                    if self._closed:
+                        return
+                    continue
+                slots = list(self._pending)[: self._batch_size]
+                self._in_flight = {slot: self._pending.pop(slot) for slot in slots}
+                batch = list(self._in_flight.values())
+                self._changed.notify_all()
+            try:
+                self._write(batch)
+            finally:
+                with self._changed:
+                    self._in_flight = {}
+                    self._changed.notify_all()
+
+    def _write(self, batch: List[_Pending]) -> None:
+        exact = [write for write in batch if isinstance(write, CacheWrite)]
+        semantic = [write for write in batch if isinstance(write, _SemanticWrite)]
+        self.stats.batches += 1
+        if exact:
+            self._guard(self._write_exact, exact)
+        for write in semantic:
+            self._guard(self._write_semantic, write)
+
+    def _write_exact(self, writes: Sequence[CacheWrite]) -> None:
+        set_many = getattr(self._exact, "set_many", None)
+        if callable(set_many):
+            set_many(writes)
+        else:
+            for write in writes:
+                if write.intent is None and not write.tags:
+                    self._exact.set(write.key, write.artifact, write.ttl_seconds)
+                else:
+                    cast(Any, self._exact).set(
+                        write.key, write.artifact, write.ttl_seconds, intent=write.intent, tags=write.tags
+                    )
+        self.stats.written += len(writes)
+
+    def _write_semantic(self, write: _SemanticWrite) -> None:
+        semantic = cast(Any, self._semantic)
+        vector = semantic.embed(write.intent, write.slots)
+        semantic.add(
+            vector,
+            write.artifact,
+            key=write.key,
+            ttl_seconds=write.ttl_seconds,
+            intent=write.intent,
+            slots=write.slots,
+            tags=write.tags,
+        )
+        self.stats.written += 1
+
+    def _guard(self, write: Any, argument: Any) -> None:
+        # A failed flush loses those writes, like a cache eviction; the worker keeps going.
+        try:
+            write(argument)
+        except Exception as exc:
+            self.stats.errors += 1
+            self.last_error = exc
@@ -0,0 +1,88 @@
+import bisect
+import itertools
+import random
+
+from intent_cache_agent.admission import CountMinSketch
+from intent_cache_agent.cache import InMemoryExactCache
+from intent_cache_agent.models import Artifact
+
+ARTIFACT = Artifact(type="intent_cache", payload={}, version="v1", scope={}, ttl_seconds=0)
+
+
+def _zipf_trace(length: int, universe: int, skew: float = 1.0, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    weights = list(itertools.accumulate(1.0 / (rank**skew) for rank in range(1, universe + 1)))
+    return [f"key-{bisect.bisect(weights, rng.random() * weights[-1])}" for _ in range(length)]
+
+
+def _scan_heavy_trace(length: int, seed: int = 2) -> list:
+    hot = _zipf_trace(length, 500, seed=seed)
+    trace = []
+    scan_id = itertools.count()
+    for index, key in enumerate(hot):
+        trace.append(key)
+        if index % 4 == 0:
+            trace.append(f"one-off-{next(scan_id)}")
+    return trace
+
+
+def _hit_ratio(cache: InMemoryExactCache, trace: list) -> float:
+    hits = 0
+    for key in trace:
+        if cache.get(key) is not None:
+            hits += 1
+        else:
+            cache.set(key, ARTIFACT)
+    return hits / len(trace)
+
+
+def test_count_min_sketch_estimates_and_ages() -> None:
+    sketch = CountMinSketch(width=64, sample_size=1000)
+    for _ in range(5):
+        sketch.increment("hot")
+    sketch.increment("cold")
+
+    assert sketch.frequency("hot") >= 5
+    assert sketch.frequency("cold") >= 1
+    sketch.age()
+    assert sketch.frequency("hot") == 2
+
+
+def test_tinylfu_beats_lru_on_zipf_trace() -> None:
+    trace = _zipf_trace(30000, 5000)
+    lru = _hit_ratio(InMemoryExactCache(max_entries=200), trace)
+    tinylfu = _hit_ratio(InMemoryExactCache(max_entries=200, admission="tinylfu"), trace)
+    assert tinylfu > lru
+
+
+def test_tinylfu_resists_scans() -> None:
+    trace = _scan_heavy_trace(20000)
+    lru = _hit_ratio(InMemoryExactCache(max_entries=100), trace)
+    tinylfu = _hit_ratio(InMemoryExactCache(max_entries=100, admission="tinylfu"), trace)
+    assert tinylfu > lru + 0.05
+
+
+def test_tinylfu_respects_capacity_per_partition() -> None:
+    cache = InMemoryExactCache(partition_by="tenant", max_entries_per_partition=10, admission="tinylfu")
+    for index in range(100):
+        artifact = Artifact(type="intent_cache", payload={}, version="v1", scope={"tenant": "t"}, ttl_seconds=0)
+        cache.set(f"key-{index}", artifact)
+    assert len(cache) == 10
+
+
+def test_tinylfu_resists_scans_with_partitions_under_global_limit() -> None:
+    trace = _scan_heavy_trace(20000)
+    tenant = Artifact(type="intent_cache", payload={}, version="v1", scope={"tenant": "t"}, ttl_seconds=0)
+
+    def hit_ratio(cache: InMemoryExactCache) -> float:
+        hits = 0
+        for key in trace:
+            if cache.get(key) is not None:
+                hits += 1
+            else:
+                cache.set(key, tenant)
+        return hits / len(trace)
+
+    lru = hit_ratio(InMemoryExactCache(max_entries=100, partition_by="tenant"))
+    tinylfu = hit_ratio(InMemoryExactCache(max_entries=100, partition_by="tenant", admission="tinylfu"))
+    assert tinylfu > lru + 0.05
@@ -0,0 +1,18 @@
+from intent_cache_agent.bloom import BloomFilter
+
+
+def test_bloom_filter_has_no_false_negatives() -> None:
+    bloom = BloomFilter(capacity=1000, false_positive_rate=0.01)
+    keys = [f"key-{index}" for index in range(1000)]
+    bloom.update(keys)
+
+    assert all(key in bloom for key in keys)
+    assert len(bloom) == 1000
+
+
+def test_bloom_filter_false_positive_rate_is_bounded() -> None:
+    bloom = BloomFilter(capacity=2000, false_positive_rate=0.01)
+    bloom.update(f"present-{index}" for index in range(2000))
+
+    false_positives = sum(f"absent-{index}" in bloom for index in range(10000))
+    assert false_positives / 10000 < 0.03
@@ -1,4 +1,5 @@
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from intent_cache_agent.cache import InMemoryExactCache, InMemorySemanticCache
 from intent_cache_agent.models import Artifact
@@ -48,3 +49,213 @@ def test_inmemory_semantic_cache_search() -> None:
     result = cache.search([1.0, 0.0], min_score=0.5)
     assert result is not None
     assert result[0].payload["answer"] == "a"
+
+
+def _semantic_artifact(answer: str, ttl_seconds: int = 3600) -> Artifact:
+    return Artifact(
+        type="intent_cache",
+        payload={"answer": answer},
+        version="v1",
+        scope={},
+        ttl_seconds=ttl_seconds,
+    )
+
+
+def test_inmemory_semantic_cache_ttl(monkeypatch) -> None:
+    cache = InMemorySemanticCache(embedder=lambda intent, slots: [1.0, 0.0])
+
+    monkeypatch.setattr(time, "time", lambda: 1000.0)
+    cache.add([1.0, 0.0], _semantic_artifact("a", ttl_seconds=10))
+    assert cache.search([1.0, 0.0], min_score=0.5) is not None
+
+    monkeypatch.setattr(time, "time", lambda: 1011.0)
+    assert cache.search([1.0, 0.0], min_score=0.5) is None
+    assert len(cache) == 0
+
+
+def test_inmemory_semantic_cache_remove_and_invalidate() -> None:
+    cache = InMemorySemanticCache(embedder=lambda intent, slots: [1.0, 0.0])
+    cache.add([1.0, 0.0], _semantic_artifact("a"), key="a")
+    cache.add([0.0, 1.0], _semantic_artifact("b"), key="b")
+    cache.add([0.7, 0.7], _semantic_artifact("c"), key="c")
+
+    assert cache.remove("a") is True
+    assert cache.remove("a") is False
+    result = cache.search([1.0, 0.0], min_score=0.5)
+    assert result is not None
+    assert result[0].payload["answer"] == "c"
+
+    assert cache.invalidate(lambda artifact: artifact.payload["answer"] == "c") == 1
+    assert cache.search([1.0, 0.0], min_score=0.5) is None
+    assert cache.search([0.0, 1.0], min_score=0.5) is not None
+    assert len(cache) == 1
+
+
+def test_inmemory_semantic_cache_evicts_lru_and_compacts() -> None:
+    cache = InMemorySemanticCache(embedder=lambda intent, slots: [], max_entries=2, compact_ratio=0.5)
+    cache.add([1.0, 0.0, 0.0], _semantic_artifact("a"), key="a")
+    cache.add([0.0, 1.0, 0.0], _semantic_artifact("b"), key="b")
+    assert cache.search([1.0, 0.0, 0.0], min_score=0.9) is not None
+
+    cache.add([0.0, 0.0, 1.0], _semantic_artifact("c"), key="c")
+    assert len(cache) == 2
+    assert cache.search([0.0, 1.0, 0.0], min_score=0.9) is None
+
+    cache.add([0.0, 1.0, 0.0], _semantic_artifact("d"), key="d")
+    assert len(cache._entries) == len(cache) == 2
+    result = cache.search([0.0, 1.0, 0.0], min_score=0.9)
+    assert result is not None
+    assert result[0].payload["answer"] == "d"
+
+
+def test_inmemory_semantic_cache_search_top_k() -> None:
+    cache = InMemorySemanticCache(embedder=lambda intent, slots: [])
+    cache.add([1.0, 0.0], _semantic_artifact("a"), intent="sql", slots={"table": "sales"})
+    cache.add([0.9, 0.1], _semantic_artifact("b"), intent="sql", slots={"table": "events"})
+    cache.add([0.0, 1.0], _semantic_artifact("c"))
+
+    matches = cache.search_top_k([0.9, 0.1], min_score=0.5, k=3)
+    assert [match.artifact.payload["answer"] for match in matches] == ["b", "a"]
+    assert matches[0].score >= matches[1].score
+    assert matches[1].intent == "sql"
+    assert matches[1].slots == {"table": "sales"}
+
+
+def test_inmemory_semantic_cache_promotes_only_recorded_matches() -> None:
+    cache = InMemorySemanticCache(embedder=lambda intent, slots: [], max_entries=2)
+    cache.add([1.0, 0.0], _semantic_artifact("a"), key="a")
+    cache.add([0.8, 0.6], _semantic_artifact("b"), key="b")
+
+    matches = cache.peek_top_k([1.0, 0.0], min_score=0.5, k=2)
+    assert [match.artifact.payload["answer"] for match in matches] == ["a", "b"]
+    assert cache.partition_stats()[None].hits == 0
+    cache.record_hit(matches[1])
+    cache.add([0.0, 1.0], _semantic_artifact("c"), key="c")
+
+    assert cache.search([1.0, 0.0], min_score=0.99) is None
+    assert cache.search_top_k([0.8, 0.6], min_score=0.5, k=2)[0].artifact.payload["answer"] == "b"
+    assert cache.partition_stats()[None].hits == 2
+
+
+def test_inmemory_exact_cache_invalidate_by_index() -> None:
+    cache = InMemoryExactCache()
+    tenant_a = Artifact(type="intent_cache", payload={}, version="v1", scope={"tenant": "a"}, ttl_seconds=60)
+    tenant_b = Artifact(type="intent_cache", payload={}, version="v2", scope={"tenant": "b"}, ttl_seconds=60)
+    cache.set("a-faq", tenant_a, intent="faq", tags={"billing"})
+    cache.set("a-sql", tenant_a, intent="sql")
+    cache.set("b-faq", tenant_b, intent="faq", tags={"billing"})
+
+    assert cache.invalidate(intent="faq", tags={"billing"}, scope={"tenant": "a"}) == 1
+    assert cache.get("a-faq") is None
+    assert cache.invalidate(version="v2") == 1
+    assert cache.get("b-faq") is None
+    assert cache.get("a-sql") is not None
+
+    cache.set("a-sql", tenant_b, intent="sql")
+    assert cache.invalidate(scope={"tenant": "a"}) == 0
+    assert cache.invalidate(scope={"tenant": "b"}) == 1
+
+
+def test_inmemory_semantic_cache_invalidate_by_index() -> None:
+    cache = InMemorySemanticCache(embedder=lambda intent, slots: [], compact_ratio=1.0)
+    cache.add([1.0, 0.0], _semantic_artifact("a"), intent="faq", tags={"t"})
+    cache.add([0.0, 1.0], _semantic_artifact("b"), intent="sql")
+    cache.add([0.7, 0.7], _semantic_artifact("c"), intent="faq")
+
+    assert cache.invalidate(intent="faq", tags={"t"}) == 1
+    cache.compact()
+    assert cache.invalidate(intent="faq") == 1
+    assert len(cache) == 1
+    result = cache.search([0.0, 1.0], min_score=0.5)
+    assert result is not None
+    assert result[0].payload["answer"] == "b"
+
+
+def test_inmemory_exact_cache_partition_quotas_evict_within_tenant() -> None:
+    cache = InMemoryExactCache(partition_by="tenant", max_entries_per_partition=2)
+
+    def tenant_artifact(tenant: str) -> Artifact:
+        return Artifact(type="intent_cache", payload={}, version="v1", scope={"tenant": tenant}, ttl_seconds=60)
+
+    cache.set("quiet-1", tenant_artifact("quiet"))
+    for index in range(5):
+        cache.set(f"noisy-{index}", tenant_artifact("noisy"))
+        cache.get("noisy-0")
+
+    assert cache.get("quiet-1") is not None
+    assert cache.get("noisy-0") is not None
+    assert cache.get("noisy-3") is None
+    assert cache.get("noisy-4") is not None
+
+    stats = cache.partition_stats()
+    assert stats["noisy"].entries == 2
+    assert stats["noisy"].evictions == 3
+    assert stats["quiet"].entries == 1
+    assert stats["quiet"].hit_ratio == 1.0
+
+
+def test_inmemory_exact_cache_byte_quota_and_miss_attribution() -> None:
+    from intent_cache_agent.key_builder import build_cache_key
+
+    cache = InMemoryExactCache(partition_by="tenant", max_bytes_per_partition=400)
+    scope = {"tenant": "t1"}
+    keys = [
+        build_cache_key(intent="faq", slots={"n": n}, scope=scope, artifact_type="intent_cache", schema_version="v1")
+        for n in range(4)
+    ]
+    for key in keys:
+        cache.set(key, Artifact(type="intent_cache", payload="x" * 100, version="v1", scope=scope, ttl_seconds=60))
+
+    stats = cache.partition_stats()["t1"]
+    assert stats.bytes <= 400
+    assert stats.entries < 4
+    assert cache.get(keys[0]) is None
+    assert cache.partition_stats()["t1"].misses == 1
+
+
+def test_inmemory_semantic_cache_partition_quota() -> None:
+    cache = InMemorySemanticCache(embedder=lambda intent, slots: [], partition_by="tenant", max_entries_per_partition=1)
+    quiet = Artifact(type="intent_cache", payload="quiet", version="v1", scope={"tenant": "q"}, ttl_seconds=60)
+    noisy = Artifact(type="intent_cache", payload="noisy", version="v1", scope={"tenant": "n"}, ttl_seconds=60)
+    cache.add([1.0, 0.0], quiet)
+    cache.add([0.0, 1.0], noisy)
+    cache.add([0.1, 1.0], noisy)
+
+    assert len(cache) == 2
+    result = cache.search([1.0, 0.0], min_score=0.9)
+    assert result is not None
+    assert result[0].payload == "quiet"
+    stats = cache.partition_stats()
+    assert stats["n"].evictions == 1
+    assert stats["q"].hits == 1
+    assert not hasattr(stats["q"], "hit_ratio")
+
+
+def test_inmemory_semantic_cache_concurrent_searches_purge_safely(monkeypatch) -> None:
+    cache = InMemorySemanticCache(embedder=lambda intent, slots: [])
+    monkeypatch.setattr(time, "time", lambda: 1000.0)
+    for index in range(4000):
+        cache.add([1.0, index / 4000], _semantic_artifact(str(index), ttl_seconds=10 if index % 2 else 0))
+
+    monkeypatch.setattr(time, "time", lambda: 1011.0)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: cache.search_top_k([1.0, 0.0], 0.5, 3), range(64)))
+
+    assert len(cache) == 2000
+    assert all(len(matches) == 3 for matches in results)
+
+
+def test_inmemory_semantic_cache_expires_entries_in_deadline_order(monkeypatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    cache = InMemorySemanticCache(embedder=lambda intent, slots: [], compact_ratio=0.01)
+    for index, ttl in enumerate([30, 10, 0, 20]):
+        cache.add([1.0, float(index)], _semantic_artifact(str(index), ttl_seconds=ttl), key=str(index))
+    cache.remove("1")  # compacts; the expiry heap follows the new slots
+
+    now[0] = 1015.0
+    assert len(cache.search_top_k([1.0, 0.0], -1.0, 10)) == 3
+    now[0] = 1025.0
+    assert sorted(match.artifact.payload["answer"] for match in cache.search_top_k([1.0, 0.0], -1.0, 10)) == ["0", "2"]
+    now[0] = 1035.0
+    assert [match.artifact.payload["answer"] for match in cache.search_top_k([1.0, 0.0], -1.0, 10)] == ["2"]
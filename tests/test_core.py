@@ -1,10 +1,14 @@
 import asyncio
+import time
+from dataclasses import replace
 
-from intent_cache_agent.cache import InMemoryExactCache
+from intent_cache_agent.cache import InMemoryExactCache, InMemorySemanticCache
 from intent_cache_agent.core import CachedIntentAgent
 from intent_cache_agent.key_builder import build_cache_key
 from intent_cache_agent.models import Artifact, CacheOptions, NormalizedIntent
+from intent_cache_agent.normalizers import CallableNormalizer, CascadeNormalizer
 from intent_cache_agent.registry import SimpleIntentRegistry
+from intent_cache_agent.upgrades import UpgradeRegistry
 
 
 class StaticNormalizer:
@@ -148,3 +152,373 @@ def test_cached_agent_async_lookup() -> None:
     result = asyncio.run(agent.lookup_async("help"))
     assert result is not None
     assert result.payload["answer"] == "cached"
+
+
+def test_cached_agent_semantic_per_intent_threshold_and_rerank() -> None:
+    registry = SimpleIntentRegistry(
+        allowed_intents={"sql"},
+        required_slots={"sql": {"table"}},
+        semantic_thresholds={"sql": 0.99},
+    )
+    semantic_cache = InMemorySemanticCache(embedder=lambda intent, slots: [1.0, 0.05])
+    semantic_cache.add(
+        [1.0, 0.0],
+        Artifact(type="intent_cache", payload={"answer": "sales"}, version="v1", scope={}, ttl_seconds=3600),
+        intent="sql",
+        slots={"table": "sales"},
+    )
+    semantic_cache.add(
+        [1.0, 0.04],
+        Artifact(type="intent_cache", payload={"answer": "events"}, version="v1", scope={}, ttl_seconds=3600),
+        intent="sql",
+        slots={"table": "events"},
+    )
+
+    def build(options: CacheOptions) -> CachedIntentAgent:
+        return CachedIntentAgent(
+            normalizer=StaticNormalizer("sql", {"table": "sales"}),
+            registry=registry,
+            exact_cache=InMemoryExactCache(),
+            semantic_cache=semantic_cache,
+            default_options=options,
+        )
+
+    plain = build(CacheOptions(enable_semantic=True, min_score=0.5)).lookup("sales")
+    assert plain is not None
+    assert plain.payload["answer"] == "events"
+
+    reranked = build(CacheOptions(enable_semantic=True, semantic_top_k=5, semantic_rerank=True)).lookup("sales")
+    assert reranked is not None
+    assert reranked.payload["answer"] == "sales"
+
+    registry.semantic_thresholds["sql"] = 0.9999
+    assert build(CacheOptions(enable_semantic=True, semantic_top_k=5, semantic_rerank=True)).lookup("sales") is None
+
+
+def test_cached_agent_rerank_counts_only_served_match() -> None:
+    semantic_cache = InMemorySemanticCache(embedder=lambda intent, slots: [1.0, 0.0], max_entries=2)
+    for vector, table in (([1.0, 0.0], "events"), ([0.8, 0.6], "sales")):
+        artifact = Artifact("intent_cache", {"answer": table}, "v1", {}, 0)
+        semantic_cache.add(vector, artifact, intent="sql", slots={"table": table})
+    agent = CachedIntentAgent(
+        normalizer=StaticNormalizer("sql", {"table": "sales"}),
+        registry=SimpleIntentRegistry(allowed_intents={"sql"}, required_slots={"sql": {"table"}}),
+        exact_cache=InMemoryExactCache(),
+        semantic_cache=semantic_cache,
+        default_options=CacheOptions(enable_semantic=True, min_score=0.5, semantic_top_k=5, semantic_rerank=True),
+    )
+
+    assert agent.lookup("sales").payload["answer"] == "sales"
+    semantic_cache.add([0.0, 1.0], Artifact("intent_cache", {"answer": "new"}, "v1", {}, 0))
+
+    assert semantic_cache.partition_stats()[None].hits == 1
+    assert semantic_cache.search([1.0, 0.0], 0.99) is None
+
+
+def test_cached_agent_async_lookup_offloads_sync_backends() -> None:
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    calls: dict = {}
+
+    class RecordingExactCache(InMemoryExactCache):
+        def get(self, key: str):
+            calls["get"] = threading.get_ident()
+            return super().get(key)
+
+    class AsyncSemanticCache:
+        def embed(self, intent: str, slots: dict):
+            calls["embed"] = threading.get_ident()
+            return [1.0]
+
+        async def search_async(self, vector: list[float], min_score: float):
+            calls["search"] = threading.get_ident()
+            return Artifact(type="intent_cache", payload={"answer": "s"}, version="v1", scope={}, ttl_seconds=60), 0.9
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        agent = CachedIntentAgent(
+            normalizer=AsyncNormalizer(),
+            registry=SimpleIntentRegistry(allowed_intents={"faq"}),
+            exact_cache=RecordingExactCache(),
+            semantic_cache=AsyncSemanticCache(),
+            default_options=CacheOptions(enable_semantic=True),
+            executor=executor,
+            max_concurrent_offloads=1,
+        )
+        loop_thread = threading.get_ident()
+        result = asyncio.run(agent.lookup_async("help"))
+
+    assert result is not None
+    assert result.provenance["source"] == "semantic"
+    assert calls["get"] != loop_thread
+    assert calls["embed"] != loop_thread
+    assert calls["search"] == loop_thread
+
+
+def test_cached_agent_coerces_slots_before_key_build() -> None:
+    registry = SimpleIntentRegistry(
+        allowed_intents={"orders"},
+        slot_schemas={"orders": {"days": int}},
+    )
+    cache = InMemoryExactCache()
+    options = CacheOptions()
+    key = build_cache_key(
+        intent="orders",
+        slots={"days": 7},
+        scope=None,
+        artifact_type=options.artifact_type,
+        schema_version=options.schema_version,
+    )
+    cache.set(key, Artifact(type="intent_cache", payload={"answer": 7}, version="v1", scope={}, ttl_seconds=60))
+
+    agent = CachedIntentAgent(
+        normalizer=StaticNormalizer("orders", {"days": "7"}),
+        registry=registry,
+        exact_cache=cache,
+        default_options=options,
+    )
+
+    result = agent.lookup("orders last 7 days")
+    assert result is not None
+    assert result.provenance["key"] == key
+
+
+def test_cached_agent_hit_references_stored_artifact() -> None:
+    from dataclasses import asdict, replace
+
+    from intent_cache_agent.models import CacheHit
+
+    registry = SimpleIntentRegistry(allowed_intents={"faq"})
+    cache = InMemoryExactCache()
+    options = CacheOptions()
+    key = build_cache_key(
+        intent="faq",
+        slots={},
+        scope=None,
+        artifact_type=options.artifact_type,
+        schema_version=options.schema_version,
+    )
+    stored = Artifact(
+        type="intent_cache",
+        payload={"answer": "cached"},
+        version="v1",
+        scope={},
+        ttl_seconds=60,
+        provenance={"origin": "seed"},
+    )
+    cache.set(key, stored)
+    agent = CachedIntentAgent(
+        normalizer=StaticNormalizer("faq", {}),
+        registry=registry,
+        exact_cache=cache,
+        default_options=options,
+    )
+
+    result = agent.lookup("help")
+    assert isinstance(result, CacheHit)
+    assert isinstance(result, Artifact)
+    assert result.artifact is stored
+    assert result.payload is stored.payload
+    assert result.provenance == {"origin": "seed", "source": "cache", "key": key, "score": None}
+    assert stored.provenance == {"origin": "seed"}
+    assert asdict(result)["provenance"]["source"] == "cache"
+    assert type(replace(result, ttl_seconds=5)) is Artifact
+
+
+class SlowExactCache(InMemoryExactCache):
+    def __init__(self, delay: float) -> None:
+        super().__init__()
+        self.delay = delay
+        self.calls = 0
+
+    def get(self, key):
+        self.calls += 1
+        time.sleep(self.delay)
+        return super().get(key)
+
+
+class SlowAsyncNormalizer:
+    async def normalize_async(self, text: str, context=None):
+        await asyncio.sleep(1.0)
+        return NormalizedIntent(intent="faq", slots={}, meta=None)
+
+
+def test_cached_agent_latency_budget_turns_slow_stage_into_miss() -> None:
+    exact_cache = SlowExactCache(delay=0.02)
+    agent = CachedIntentAgent(
+        normalizer=StaticNormalizer("faq", {}),
+        registry=SimpleIntentRegistry(allowed_intents={"faq"}),
+        exact_cache=exact_cache,
+        default_options=CacheOptions(latency_budget_ms=5),
+        breaker_failure_threshold=2,
+        breaker_cooldown_seconds=60,
+    )
+    key = build_cache_key(intent="faq", slots={}, scope=None, artifact_type="intent_cache", schema_version="v1")
+    exact_cache.set(key, Artifact(type="intent_cache", payload={}, version="v1", scope={}, ttl_seconds=0))
+
+    assert agent.lookup("help", options=CacheOptions()) is not None
+    assert agent.lookup("help") is None
+    assert agent.lookup("help") is None
+    assert agent.lookup("help") is None
+
+    stats = agent.breaker_stats()["exact_cache"]
+    assert exact_cache.calls == 3
+    assert stats["state"] == "open"
+    assert (stats["timeouts"], stats["opened"], stats["short_circuits"]) == (2, 1, 1)
+
+
+def test_cached_agent_async_budget_cancels_slow_normalizer() -> None:
+    agent = CachedIntentAgent(
+        normalizer=SlowAsyncNormalizer(),
+        registry=SimpleIntentRegistry(allowed_intents={"faq"}),
+        exact_cache=InMemoryExactCache(),
+        default_options=CacheOptions(latency_budget_ms=20),
+    )
+
+    started = time.perf_counter()
+    result = asyncio.run(agent.lookup_async("help"))
+
+    assert result is None
+    assert time.perf_counter() - started < 0.5
+    assert agent.breaker_stats()["normalizer"]["timeouts"] == 1
+
+
+class RecordingLlmNormalizer:
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.started = 0
+        self.cancelled = 0
+
+    async def normalize_async(self, text: str, context=None):
+        self.started += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return NormalizedIntent(intent="faq", slots={"topic": "billing"}, meta=None)
+
+
+class AsyncExactCache(InMemoryExactCache):
+    async def get_async(self, key):
+        await asyncio.sleep(0.01)
+        return self.get(key)
+
+
+def test_cached_agent_cascade_speculative_probe_cancels_llm_on_hit() -> None:
+    llm = RecordingLlmNormalizer(delay=1.0)
+    guess = CallableNormalizer(lambda text, context: NormalizedIntent("faq", {"topic": "general"}, {"confidence": 0.5}))
+    cache = AsyncExactCache()
+    key = build_cache_key(
+        intent="faq", slots={"topic": "general"}, scope=None, artifact_type="intent_cache", schema_version="v1"
+    )
+    cache.set(key, Artifact(type="intent_cache", payload={"answer": "rule"}, version="v1", scope={}, ttl_seconds=0))
+    agent = CachedIntentAgent(
+        normalizer=CascadeNormalizer([guess], llm, min_confidence=0.9),
+        registry=SimpleIntentRegistry(allowed_intents={"faq"}),
+        exact_cache=cache,
+    )
+
+    started = time.perf_counter()
+    result = asyncio.run(agent.lookup_async("help"))
+
+    assert result is not None and result.payload["answer"] == "rule"
+    assert time.perf_counter() - started < 0.5
+    assert (llm.started, llm.cancelled) == (1, 1)
+
+
+def test_cached_agent_cascade_probe_hit_survives_failed_llm() -> None:
+    class RateLimitedLlm:
+        async def normalize_async(self, text: str, context=None):
+            raise RuntimeError("rate limited")
+
+    guess = CallableNormalizer(lambda text, context: NormalizedIntent("faq", {"topic": "general"}, {"confidence": 0.5}))
+    cache = AsyncExactCache()
+    key = build_cache_key(
+        intent="faq", slots={"topic": "general"}, scope=None, artifact_type="intent_cache", schema_version="v1"
+    )
+    cache.set(key, Artifact(type="intent_cache", payload={"answer": "rule"}, version="v1", scope={}, ttl_seconds=0))
+    agent = CachedIntentAgent(
+        normalizer=CascadeNormalizer([guess], RateLimitedLlm(), min_confidence=0.9),
+        registry=SimpleIntentRegistry(allowed_intents={"faq"}),
+        exact_cache=cache,
+    )
+
+    result = asyncio.run(agent.lookup_async("help"))
+
+    assert result is not None and result.payload["answer"] == "rule"
+    assert agent.breaker_stats()["normalizer"]["errors"] == 1
+
+
+def test_cached_agent_cascade_uses_llm_result_when_probe_misses() -> None:
+    llm = RecordingLlmNormalizer(delay=0.0)
+    guess = CallableNormalizer(lambda text, context: NormalizedIntent("faq", {"topic": "general"}, {"confidence": 0.5}))
+    cache = InMemoryExactCache()
+    key = build_cache_key(
+        intent="faq", slots={"topic": "billing"}, scope=None, artifact_type="intent_cache", schema_version="v1"
+    )
+    cache.set(key, Artifact(type="intent_cache", payload={"answer": "llm"}, version="v1", scope={}, ttl_seconds=0))
+    agent = CachedIntentAgent(
+        normalizer=CascadeNormalizer([guess], llm, min_confidence=0.9),
+        registry=SimpleIntentRegistry(allowed_intents={"faq"}),
+        exact_cache=cache,
+    )
+
+    result = asyncio.run(agent.lookup_async("help"))
+
+    assert result is not None and result.payload["answer"] == "llm"
+    assert (llm.started, llm.cancelled) == (1, 0)
+
+
+def _upgrade_agent(cache: InMemoryExactCache) -> CachedIntentAgent:
+    upgrades = UpgradeRegistry()
+    upgrades.register("v1", "v2", lambda a: replace(a, version="v2", payload={"text": a.payload["answer"]}))
+    old_key = build_cache_key(intent="faq", slots={}, scope=None, artifact_type="intent_cache", schema_version="v1")
+    cache.set(old_key, Artifact(type="intent_cache", payload={"answer": "old"}, version="v1", scope={}, ttl_seconds=0))
+    return CachedIntentAgent(
+        normalizer=StaticNormalizer("faq", {}),
+        registry=SimpleIntentRegistry(allowed_intents={"faq"}),
+        exact_cache=cache,
+        default_options=CacheOptions(schema_version="v2", fallback_schema_versions=("v1",)),
+        upgrades=upgrades,
+    )
+
+
+def test_cached_agent_upgrades_fallback_schema_version_and_writes_back() -> None:
+    cache = InMemoryExactCache()
+    agent = _upgrade_agent(cache)
+    new_key = build_cache_key(intent="faq", slots={}, scope=None, artifact_type="intent_cache", schema_version="v2")
+
+    result = agent.lookup("help")
+
+    assert result is not None
+    assert (result.version, result.payload) == ("v2", {"text": "old"})
+    assert result.provenance["source"] == "upgrade"
+    stored = cache.get(new_key)
+    assert stored is not None and stored.payload == {"text": "old"}
+    assert agent.lookup("help").provenance["source"] == "cache"
+    assert agent.lookup("help", options=CacheOptions(schema_version="v2")).provenance["source"] == "cache"
+
+
+def test_cached_agent_async_upgrade_writes_back_in_background() -> None:
+    cache = AsyncExactCache()
+    agent = _upgrade_agent(cache)
+    new_key = build_cache_key(intent="faq", slots={}, scope=None, artifact_type="intent_cache", schema_version="v2")
+
+    async def run():
+        result = await agent.lookup_async("help")
+        await agent.drain()
+        return result
+
+    result = asyncio.run(run())
+
+    assert result is not None and result.provenance["source"] == "upgrade"
+    assert cache.get(new_key).payload == {"text": "old"}
+
+
+def test_cached_agent_skips_fallback_versions_without_upgrade_path() -> None:
+    cache = InMemoryExactCache()
+    agent = _upgrade_agent(cache)
+
+    assert agent.lookup("help", options=CacheOptions(schema_version="v3", fallback_schema_versions=("v1",))) is None
+    assert agent.lookup("help", options=CacheOptions(schema_version="v2")) is None
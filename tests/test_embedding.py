@@ -0,0 +1,58 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from intent_cache_agent.cache import InMemorySemanticCache
+from intent_cache_agent.embedding import HashingEmbedder
+from intent_cache_agent.models import Artifact
+
+
+def _cosine(a, b) -> float:
+    return float(np.dot(a, b))
+
+
+def test_hashing_embedder_is_deterministic_and_normalised() -> None:
+    embedder = HashingEmbedder(dim=64)
+
+    vector = embedder("weather", {"city": "New York", "days": 3})
+
+    assert len(vector) == 64
+    assert vector == HashingEmbedder(dim=64)("weather", {"days": 3, "city": "new  york"})
+    assert abs(_cosine(vector, vector) - 1.0) < 1e-5
+    assert vector != HashingEmbedder(dim=64, seed=1)("weather", {"city": "New York", "days": 3})
+
+
+def test_hashing_embedder_ranks_near_duplicates_above_other_values() -> None:
+    embedder = HashingEmbedder()
+    base = embedder("weather", {"city": "new york", "days": 3})
+
+    near = _cosine(base, embedder("weather", {"city": "new york city", "days": 3}))
+    other = _cosine(base, embedder("weather", {"city": "boston", "days": 3}))
+    other_intent = _cosine(base, embedder("flights", {"city": "new york", "days": 3}))
+
+    assert near > other > other_intent
+    assert other_intent < 0.3
+
+
+def test_hashing_embedder_batch_matches_single_calls() -> None:
+    embedder = HashingEmbedder(dim=128)
+    items = [("weather", {"city": "oslo"}), ("faq", {}), ("orders", {"ids": [1, 2], "days": 7})]
+
+    batch = embedder.embed_batch(items)
+
+    assert batch.shape == (3, 128) and batch.dtype == np.float32
+    for row, item in zip(batch, items):
+        assert np.allclose(row, embedder(*item), atol=1e-6)
+    assert embedder.embed_batch([]).shape == (0, 128)
+
+
+def test_hashing_embedder_drives_semantic_cache() -> None:
+    embedder = HashingEmbedder()
+    cache = InMemorySemanticCache(embedder)
+    artifact = Artifact(type="intent_cache", payload={"city": "new york"}, version="v1", scope={}, ttl_seconds=0)
+    cache.add(cache.embed("weather", {"city": "new york", "days": 3}), artifact)
+
+    hit = cache.search(cache.embed("weather", {"city": "new york city", "days": 3}), 0.75)
+
+    assert hit is not None and hit[0].payload == {"city": "new york"}
+    assert cache.search(cache.embed("weather", {"city": "boston", "days": 3}), 0.75) is None
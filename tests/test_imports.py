@@ -0,0 +1,26 @@
+import subprocess
+import sys
+
+import intent_cache_agent
+
+
+def test_import_does_not_load_optional_integrations() -> None:
+    code = (
+        "import sys, intent_cache_agent\n"
+        "heavy = [name for name in ('google.adk', 'google.genai', 'redis', 'pydantic', 'numpy') "
+        "if name in sys.modules]\n"
+        "print(','.join(heavy))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+
+
+def test_lazy_attributes_resolve_or_raise_attribute_error() -> None:
+    for name in ("IntentCacheAgent", "RedisExactCache", "ReplicatedSemanticCache"):
+        try:
+            value = getattr(intent_cache_agent, name)
+        except AttributeError:
+            assert name not in intent_cache_agent.__all__
+        else:
+            assert value.__name__ == name
+    assert "RedisExactCache" in dir(intent_cache_agent)
@@ -0,0 +1,41 @@
+import random
+
+import pytest
+
+from intent_cache_agent.loadtest import Latency, LoadProfile, run_load
+
+
+def test_latency_parse_and_sample() -> None:
+    rng = random.Random(0)
+
+    assert Latency.parse("fixed:2").sample(rng) == 0.002
+    assert 0.001 <= Latency.parse("uniform:1,5").sample(rng) <= 0.005
+    assert Latency.parse("lognormal:3,0.5").sample(rng) > 0
+    with pytest.raises(ValueError):
+        Latency.parse("uniform:1")
+
+
+def test_run_load_reports_outcomes_and_percentiles() -> None:
+    profile = LoadProfile(
+        sessions=50,
+        requests_per_session=4,
+        exact_hit_ratio=0.5,
+        semantic_hit_ratio=0.25,
+        distinct_prompts=20,
+        normalize_latency=Latency("fixed", 1.0),
+        embed_latency=Latency("fixed", 0.0),
+        search_latency=Latency("fixed", 0.0),
+        lag_interval_ms=1.0,
+    )
+
+    report = run_load(profile)
+
+    assert report.requests == 200
+    assert report.errors == 0
+    assert report.exact_hits + report.semantic_hits + report.misses == 200
+    assert report.exact_hits > 0 and report.semantic_hits > 0 and report.misses > 0
+    assert report.latency_percentile(50) >= 1.0
+    assert report.latency_percentile(50) <= report.latency_percentile(99) <= max(report.latencies_ms)
+    assert report.throughput > 0
+    assert report.loop_lag_ms
+    assert set(report.summary()) >= {"throughput_rps", "p50_ms", "p95_ms", "p99_ms", "loop_lag_p99_ms"}
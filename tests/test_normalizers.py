@@ -1,6 +1,15 @@
 import asyncio
+import time
 
-from intent_cache_agent.normalizers import AdkLlmNormalizer
+from intent_cache_agent.models import NormalizedIntent
+from intent_cache_agent.normalizers import (
+    AdkLlmNormalizer,
+    BatchingNormalizer,
+    CallableNormalizer,
+    CascadeNormalizer,
+    RuleBasedNormalizer,
+    batch_prompt,
+)
 
 
 def test_adk_llm_normalizer_parses_json() -> None:
@@ -31,3 +40,120 @@ def test_adk_llm_normalizer_async() -> None:
     result = asyncio.run(normalizer.normalize_async("help", None))
     assert result is not None
     assert result.intent == "faq"
+
+
+def test_cascade_normalizer_prefers_confident_rules() -> None:
+    calls = []
+
+    def run_agent(text, context):
+        calls.append(text)
+        return {"intent": "llm", "slots": {}}
+
+    cascade = CascadeNormalizer(
+        [
+            CallableNormalizer(lambda text, context: NormalizedIntent("guess", {}, {"confidence": 0.4})),
+            RuleBasedNormalizer({"help": "faq"}),
+        ],
+        AdkLlmNormalizer(run_agent=run_agent),
+        min_confidence=0.8,
+    )
+
+    assert cascade.normalize("help me", None).intent == "faq"
+    assert calls == []
+    assert cascade.candidate("other", None)[0].intent == "guess"
+    assert cascade.normalize("other", None).intent == "llm"
+    assert asyncio.run(cascade.normalize_async("other", None)).intent == "llm"
+    assert calls == ["other", "other"]
+
+
+def test_cascade_normalizer_without_fallback_returns_best_candidate() -> None:
+    cascade = CascadeNormalizer(
+        [CallableNormalizer(lambda text, context: NormalizedIntent("guess", {}, {"confidence": 0.4}))],
+        min_confidence=0.8,
+    )
+
+    assert cascade.candidate("x", None) == (NormalizedIntent("guess", {}, {"confidence": 0.4}), True)
+    assert cascade.normalize("x", None).intent == "guess"
+
+
+def test_batching_normalizer_groups_concurrent_calls_and_demultiplexes() -> None:
+    batches = []
+
+    async def run_batch(items):
+        batches.append([text for text, _ in items])
+        # Reply out of order; results are matched by index.
+        results = [{"index": i, "intent": text, "slots": {}} for i, (text, _) in enumerate(items)]
+        return {"results": results[::-1]}
+
+    normalizer = BatchingNormalizer(run_batch=run_batch, max_batch_size=3, max_wait_ms=20)
+
+    async def run():
+        return await asyncio.gather(*(normalizer.normalize_async(f"q{i}", None) for i in range(5)))
+
+    results = asyncio.run(run())
+
+    assert [result.intent for result in results] == ["q0", "q1", "q2", "q3", "q4"]
+    assert batches == [["q0", "q1", "q2"], ["q3", "q4"]]
+
+
+def test_batching_normalizer_parses_json_list_and_propagates_errors() -> None:
+    async def run_batch(items):
+        if any(text == "boom" for text, _ in items):
+            raise RuntimeError("rate limited")
+        return '[{"intent": "faq", "slots": {}}, "not json"]'
+
+    normalizer = BatchingNormalizer(run_batch=run_batch, max_batch_size=2, max_wait_ms=1)
+
+    async def run():
+        first = await asyncio.gather(normalizer.normalize_async("a", None), normalizer.normalize_async("b", None))
+        failed = await asyncio.gather(normalizer.normalize_async("boom", None), return_exceptions=True)
+        return first, failed
+
+    (first, failed) = asyncio.run(run())
+
+    assert first[0].intent == "faq" and first[1] is None
+    assert isinstance(failed[0], RuntimeError)
+
+
+def test_batching_normalizer_limits_concurrent_batches() -> None:
+    active = []
+    peak = []
+
+    async def run_batch(items):
+        active.append(1)
+        peak.append(len(active))
+        await asyncio.sleep(0.01)
+        active.pop()
+        return [{"intent": "faq", "slots": {}} for _ in items]
+
+    normalizer = BatchingNormalizer(run_batch=run_batch, max_batch_size=1, max_concurrent_batches=2)
+
+    async def run():
+        return await asyncio.gather(*(normalizer.normalize_async(str(i), None) for i in range(6)))
+
+    assert all(result.intent == "faq" for result in asyncio.run(run()))
+    assert max(peak) == 2
+    assert normalizer.batches == 6
+
+
+def test_batch_prompt_lists_indexed_requests() -> None:
+    prompt = batch_prompt([("hi", None), ("bye", {"lang": "en"})], "Map to intents.")
+
+    assert prompt.startswith("Map to intents.")
+    assert '"index": 1, "text": "bye"' in prompt
+
+
+def test_batching_normalizer_throttles_tokens_per_second() -> None:
+    async def run_batch(items):
+        return [{"intent": "faq", "slots": {}} for _ in items]
+
+    normalizer = BatchingNormalizer(
+        run_batch=run_batch, max_batch_size=1, tokens_per_second=1000, token_burst=10, estimate_tokens=lambda text: 10
+    )
+
+    async def run():
+        started = time.perf_counter()
+        await asyncio.gather(*(normalizer.normalize_async(str(i), None) for i in range(3)))
+        return time.perf_counter() - started
+
+    assert asyncio.run(run()) >= 0.015
@@ -0,0 +1,350 @@
+import fnmatch
+import json
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("redis")
+lua51 = pytest.importorskip("lupa.lua51")
+
+from intent_cache_agent.models import Artifact, CacheWrite, LazyArtifact
+from intent_cache_agent.redis_cache import RedisExactCache
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.data: dict = {}
+        self.gets = 0
+        self.transactions: list = []
+        self.scripts = 0
+
+    def get(self, key):
+        self.gets += 1
+        return self.data.get(key)
+
+    def mget(self, keys):
+        self.gets += 1
+        return [self.data.get(key) for key in keys]
+
+    def getrange(self, key, start, end):
+        value = self.data.get(key)
+        return value[start : end + 1] if isinstance(value, (bytes, str)) else b""
+
+    def set(self, key, value):
+        self.data[key] = value
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def rpush(self, key, *values):
+        self.data.setdefault(key, []).extend(values)
+
+    def lindex(self, key, index):
+        self.gets += 1
+        values = self.data.get(key, [])
+        return values[index] if index < len(values) else None
+
+    def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(members)
+
+    def srem(self, key, *members):
+        self.data.get(key, set()).difference_update(members)
+
+    def sinter(self, keys):
+        sets = [self.data.get(key, set()) for key in keys]
+        return set.intersection(*sets) if sets else set()
+
+    def expire(self, key, ttl, nx=False, gt=False):
+        return True
+
+    def persist(self, key):
+        return True
+
+    def pipeline(self, transaction=True):
+        self.transactions.append(transaction)
+        return FakePipeline(self)
+
+    def eval(self, script, numkeys, *args):
+        self.scripts += 1
+        # Runs the real script on Lua 5.1 (as Redis does) against this fake's commands.
+        lua = lua51.LuaRuntime(encoding=None)
+        lua.execute(b"redis = {} cjson = {}")
+        lua.globals().redis.call = lambda command, key, *rest: self._lua_call(lua, command, key, *rest)
+        lua.globals().cjson.decode = lambda text: _lua_value(lua, json.loads(text))
+        run = lua.eval(b"function(KEYS, ARGV) " + script.encode() + b" end")
+        values = [_bulk(value) for value in args]
+        return run(lua.table_from(values[:numkeys]), lua.table_from(values[numkeys:]))
+
+    def _lua_call(self, lua, command, key, *args):
+        name, key = command.decode().lower(), key.decode()
+        members = [arg.decode() if isinstance(arg, bytes) else str(arg) for arg in args]
+        if name == "get":
+            return self.data.get(key)
+        if name == "del":
+            return self.delete(key, *members)
+        if name == "exists":
+            return int(key in self.data)
+        if name == "expire":
+            return self.expire(key, int(args[0]), nx=members[1:] == ["NX"], gt=members[1:] == ["GT"])
+        if name == "persist":
+            return self.persist(key)
+        if name == "rpush":
+            return self.rpush(key, *args)
+        if name == "set" and len(args) == 3:
+            return self.setex(key, int(args[2]), args[0])
+        if name == "set":
+            return self.set(key, args[0])
+        if name == "sadd":
+            return self.sadd(key, *members)
+        if name == "srem":
+            return self.srem(key, *members)
+        if name == "srandmember":
+            return lua.table_from([member.encode() for member in list(self.data.get(key, set()))[: int(args[0])]])
+        raise NotImplementedError(name)
+
+    def scan_iter(self, match=None, count=None):
+        return [key for key in list(self.data) if match is None or fnmatch.fnmatchcase(key, match)]
+
+
+class FakePipeline:
+    def __init__(self, client: FakeRedis) -> None:
+        self._client = client
+        self._calls: list = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self):
+        return [getattr(self._client, name)(*args, **kwargs) for name, args, kwargs in self._calls]
+
+
+def _lua_value(lua, value):
+    if isinstance(value, dict):
+        return lua.table_from({_lua_value(lua, k): _lua_value(lua, v) for k, v in value.items()})
+    if isinstance(value, list):
+        return lua.table_from([_lua_value(lua, item) for item in value])
+    return value.encode() if isinstance(value, str) else value
+
+
+def _bulk(value) -> bytes:
+    return value if isinstance(value, bytes) else str(value).encode()
+
+
+def _artifact(scope=None) -> Artifact:
+    return Artifact(type="intent_cache", payload={"answer": "ok"}, version="v1", scope=scope or {}, ttl_seconds=60)
+
+
+def test_redis_exact_cache_round_trip() -> None:
+    client = FakeRedis()
+    cache = RedisExactCache(client)
+    cache.set("key", _artifact())
+
+    result = cache.get("key")
+    assert result is not None
+    assert result.payload["answer"] == "ok"
+    assert cache.get("missing") is None
+
+
+def test_redis_exact_cache_bloom_filter_skips_definite_misses() -> None:
+    client = FakeRedis()
+    RedisExactCache(client).set("seeded", _artifact())
+
+    cache = RedisExactCache(client, bloom_capacity=100, bloom_resync_seconds=None)
+    assert cache.get("seeded") is not None
+    cache.set("fresh", _artifact())
+    assert cache.get("fresh") is not None
+    assert client.gets == 2
+
+    for index in range(50):
+        assert cache.get(f"missing-{index}") is None
+    assert client.gets == 2 + cache.bloom_stats.false_positives
+    assert cache.bloom_stats.avoided_round_trips + cache.bloom_stats.false_positives == 50
+    assert cache.bloom_stats.resyncs == 1
+
+
+def test_redis_exact_cache_invalidates_by_scope_and_tag() -> None:
+    client = FakeRedis()
+    cache = RedisExactCache(client)
+    cache.set("a", _artifact({"tenant": "t1"}), intent="faq", tags={"prompt-3"})
+    cache.set("b", _artifact({"tenant": "t1"}), intent="sql")
+    cache.set("c", _artifact({"tenant": "t2"}), intent="faq", tags={"prompt-3"})
+
+    assert cache.invalidate(scope={"tenant": "t1"}, tags={"prompt-3"}) == 1
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    assert cache.invalidate(intent="faq") == 1
+    assert cache.get("c") is None
+    assert cache.invalidate(version="v1") == 1
+    assert cache.get("b") is None
+
+
+def test_redis_exact_cache_get_many_uses_one_round_trip() -> None:
+    client = FakeRedis()
+    cache = RedisExactCache(client)
+    cache.set("a", _artifact())
+    cache.set("b", _artifact())
+
+    found = cache.get_many(["a", "missing", "b"])
+
+    assert sorted(found) == ["a", "b"]
+    assert found["a"].payload["answer"] == "ok"
+    assert client.gets == 1
+
+
+def test_redis_exact_cache_decodes_payload_lazily() -> None:
+    client = FakeRedis()
+    cache = RedisExactCache(client)
+    cache.set("key", _artifact({"tenant": "t1"}))
+
+    result = cache.get("key")
+
+    assert isinstance(result, LazyArtifact)
+    assert (result.type, result.scope, result.ttl_seconds) == ("intent_cache", {"tenant": "t1"}, 60)
+    assert not result.payload_decoded
+    assert result.payload == {"answer": "ok"}
+    assert result.payload_decoded
+
+
+def test_redis_exact_cache_chunks_and_streams_large_payloads() -> None:
+    client = FakeRedis()
+    cache = RedisExactCache(client, chunk_threshold=100, chunk_size=40)
+    payload = {"rows": ["x" * 30 for _ in range(10)]}
+    cache.set("big", Artifact(type="report", payload=payload, version="v1", scope={}, ttl_seconds=0))
+
+    (chunk_key,) = [key for key in client.data if key.startswith("intent_cache:chunks:big:")]
+    assert len(client.data[chunk_key]) > 2
+    assert b"rows" not in client.data["intent_cache:big"]
+
+    result = cache.get("big")
+    client.gets = 0
+    stream = result.payload_chunks()
+    first = next(stream)
+    assert first == client.data[chunk_key][0]
+    assert client.gets == 1
+    assert json.loads(first + b"".join(stream)) == payload
+    assert result.payload == payload
+
+    assert cache.delete("big")
+    assert chunk_key not in client.data
+
+
+def test_redis_exact_cache_rewrite_keeps_held_chunks_for_grace_period() -> None:
+    client = FakeRedis()
+    expiring = {}
+    client.expire = lambda key, ttl, nx=False, gt=False: expiring.__setitem__(key, ttl)
+    cache = RedisExactCache(client, chunk_threshold=10, chunk_size=8, chunk_grace_seconds=30)
+    cache.set("key", Artifact(type="report", payload="x" * 50, version="v1", scope={}, ttl_seconds=0))
+    held = cache.get("key")
+    (old_chunks,) = [key for key in client.data if key.startswith("intent_cache:chunks:key:")]
+
+    cache.set("key", Artifact(type="report", payload="y" * 50, version="v1", scope={}, ttl_seconds=0))
+
+    assert client.transactions[-1] is True
+    assert expiring == {old_chunks: 30}
+    assert held.payload == "x" * 50
+    assert cache.get("key").payload == "y" * 50
+    del client.data[old_chunks]  # the grace period ran out
+    with pytest.raises(LookupError, match="overwritten or deleted"):
+        b"".join(held.payload_chunks())
+    assert cache.get("key").payload == "y" * 50
+
+    cache.set("key", Artifact(type="report", payload="ok", version="v1", scope={}, ttl_seconds=0))
+    assert len(expiring) == 2
+    assert cache.get("key").payload == "ok"
+
+
+def test_redis_exact_cache_reads_chunks_written_without_generation() -> None:
+    client = FakeRedis()
+    header = {"envelope": 1, "type": "report", "version": "v1", "scope": {}, "ttl_seconds": 0}
+    header.update(provenance={}, payload_bytes=6, chunks=2)
+    client.data["intent_cache:old"] = json.dumps(header).encode()
+    client.data["intent_cache:chunks:old"] = [b'"ab', b'cd"']
+
+    assert RedisExactCache(client).get("old").payload == "abcd"
+
+
+def test_redis_exact_cache_reads_legacy_json_values() -> None:
+    client = FakeRedis()
+    client.data["intent_cache:old"] = json.dumps(
+        {"type": "intent_cache", "payload": {"answer": "old"}, "version": "v1", "scope": {}, "ttl_seconds": 60}
+    )
+
+    result = RedisExactCache(client).get("old")
+
+    assert result is not None and result.payload == {"answer": "old"}
+
+
+def test_redis_exact_cache_set_many_pipelines_writes() -> None:
+    client = FakeRedis()
+    cache = RedisExactCache(client, bloom_capacity=10)
+    cache.set_many([CacheWrite("a", _artifact(), intent="faq"), CacheWrite("b", _artifact(), ttl_seconds=5)])
+
+    assert cache.get("a").payload == {"answer": "ok"}
+    assert cache.get("b") is not None
+    assert cache.invalidate(intent="faq") == 1
+
+
+def test_redis_exact_cache_writes_in_one_round_trip() -> None:
+    client = FakeRedis()
+    RedisExactCache(client, chunk_threshold=100, chunk_size=40).set("key", _artifact())
+    assert client.transactions == [True] and client.scripts == 1
+
+    plain = FakeRedis()
+    cache = RedisExactCache(plain, chunk_threshold=None)
+    cache.set("key", Artifact(type="report", payload="x" * 1000, version="v1", scope={}, ttl_seconds=0))
+    assert cache.get("key").payload == "x" * 1000
+    assert plain.transactions == [True]
+    assert not [key for key in plain.data if key.startswith("intent_cache:chunks:")]
+
+
+def test_redis_exact_cache_unindexes_deleted_replaced_and_expired_keys() -> None:
+    client = FakeRedis()
+    cache = RedisExactCache(client)
+    cache.set("a", _artifact(), intent="faq", tags={"t"})
+    cache.set("b", _artifact(), intent="faq")
+    cache.set("c", _artifact(), intent="faq")
+
+    assert cache.delete("a")
+    assert client.data["intent_cache:idx:tag:t"] == set()
+    cache.set("b", _artifact(), intent="sql")
+    assert client.data["intent_cache:idx:intent:faq"] == {"c"}
+    assert cache.invalidate(intent="faq") == 1 and cache.get("b") is not None
+
+    for key in ("d", "e", "f"):
+        cache.set(key, _artifact())
+        del client.data["intent_cache:" + key]  # expired in Redis
+    cache.set("g", _artifact())
+    assert client.data["intent_cache:idx:version:v1"] == {"b", "g"}
+
+
+def test_redis_exact_cache_resyncs_bloom_filter_in_the_background() -> None:
+    client = FakeRedis()
+    cache = RedisExactCache(client, bloom_capacity=100, bloom_resync_seconds=0)
+    gate = threading.Event()
+    scan = client.scan_iter
+
+    def slow_scan(match=None, count=None):
+        keys = scan(match, count)  # taken before "during" is written
+        gate.wait(5)
+        return keys
+
+    client.scan_iter = slow_scan
+    assert cache.get("missing") is None  # starts the resync without waiting for it
+    assert cache.bloom_stats.resyncs == 1
+    cache.set("during", _artifact())
+    gate.set()
+    deadline = time.monotonic() + 5
+    while cache.bloom_stats.resyncs < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert cache.bloom_stats.resyncs == 2
+    client.scan_iter = scan
+    assert cache.get("during") is not None
@@ -0,0 +1,156 @@
+import pytest
+
+redis = pytest.importorskip("redis")
+
+from intent_cache_agent.cache import InMemorySemanticCache
+from intent_cache_agent.models import Artifact
+from intent_cache_agent.redis_replication import ReplicatedSemanticCache
+
+
+class FakeStreamRedis:
+    def __init__(self) -> None:
+        self.data: dict = {}
+        self.streams: dict = {}
+        self.sequence = 0
+        self.xreads = 0
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value):
+        self.data[key] = value
+
+    def xadd(self, name, fields, maxlen=None, approximate=True):
+        self.sequence += 1
+        message_id = f"{self.sequence}-0"
+        entries = self.streams.setdefault(name, [])
+        entries.append((message_id.encode(), {k.encode(): v.encode() for k, v in fields.items()}))
+        if maxlen is not None:
+            del entries[: max(0, len(entries) - maxlen)]
+        return message_id
+
+    def xread(self, streams, count=None):
+        self.xreads += 1
+        ((name, after),) = streams.items()
+        messages = [m for m in self.streams.get(name, []) if _id(m[0]) > _id(after)][:count]
+        return [[name.encode(), messages]] if messages else []
+
+    def xrange(self, name, min="-", max="+", count=None):
+        entries = self.streams.get(name, [])
+        if min != "-":
+            floor = _id(min.lstrip("("))
+            entries = [m for m in entries if _id(m[0]) > floor]
+        return entries[:count]
+
+
+def _id(value) -> int:
+    text = value.decode() if isinstance(value, bytes) else value
+    return int(text.split("-")[0])
+
+
+def _embedder(intent, slots):
+    return [1.0, 0.0]
+
+
+def _artifact(answer: str, ttl_seconds: int = 0) -> Artifact:
+    return Artifact(type="intent_cache", payload={"answer": answer}, version="v1", scope={}, ttl_seconds=ttl_seconds)
+
+
+def _node(client, node_id: str, **kwargs) -> ReplicatedSemanticCache:
+    return ReplicatedSemanticCache(InMemorySemanticCache(_embedder), client, node_id=node_id, **kwargs)
+
+
+def test_replicated_semantic_cache_shares_entries_between_nodes() -> None:
+    client = FakeStreamRedis()
+    first = _node(client, "a")
+    second = _node(client, "b")
+
+    first.add([1.0, 0.0], _artifact("shared"), key="k", intent="faq", tags=("faq",))
+    first.poll()
+
+    artifact, score = second.search([1.0, 0.0], 0.9)
+    assert artifact.payload == {"answer": "shared"}
+    assert score == pytest.approx(1.0)
+    assert len(first) == 1 and first.applied == 0
+    assert client.data["intent_cache:semantic:offsets:b"] == second.offset == "1-0"
+    assert second.invalidate(tags=["faq"]) == 1
+
+
+def test_replicated_semantic_cache_polls_at_most_once_per_interval() -> None:
+    now = [0.0]
+    client = FakeStreamRedis()
+    node = _node(client, "a", poll_interval_seconds=5, clock=lambda: now[0])
+
+    node.search([1.0, 0.0], 0.9)
+    node.search([1.0, 0.0], 0.9)
+    now[0] = 6.0
+    node.search([1.0, 0.0], 0.9)
+
+    assert client.xreads == 2
+
+
+def test_replicated_semantic_cache_restarted_node_replays_earlier_entries() -> None:
+    client = FakeStreamRedis()
+    writer = _node(client, "writer")
+    writer.add([1.0, 0.0], _artifact("one"))
+    reader = _node(client, "reader")
+    assert reader.poll() == 1
+
+    writer.add([0.0, 1.0], _artifact("two"))
+    restarted_reader = _node(client, "reader")
+    restarted_writer = _node(client, "writer")
+
+    assert restarted_reader.poll() == 2
+    assert restarted_reader.search([1.0, 0.0], 0.9)[0].payload == {"answer": "one"}
+    assert restarted_writer.poll() == 2
+    assert restarted_writer.search([0.0, 1.0], 0.9)[0].payload == {"answer": "two"}
+
+
+def test_replicated_semantic_cache_keeps_provenance() -> None:
+    client = FakeStreamRedis()
+    first = _node(client, "a")
+    second = _node(client, "b")
+    artifact = Artifact(
+        type="intent_cache", payload="p", version="v1", scope={}, ttl_seconds=0, provenance={"model": "m1"}
+    )
+
+    first.add([1.0, 0.0], artifact)
+
+    assert second.search([1.0, 0.0], 0.9)[0].provenance == {"model": "m1"}
+
+
+def test_replicated_semantic_cache_bootstraps_new_node_from_snapshot() -> None:
+    now = [100.0]
+    client = FakeStreamRedis()
+    writer = _node(client, "writer", max_stream_length=2, clock=lambda: now[0])
+    writer.add([1.0, 0.0], _artifact("old"), key="k")
+    writer.add([1.0, 0.0], _artifact("new"), key="k")
+    writer.add([0.0, 1.0], _artifact("short", ttl_seconds=10))
+    assert writer.publish_snapshot() == 2
+    writer.add([0.6, 0.8], _artifact("after"))
+    now[0] = 200.0
+    assert writer.publish_snapshot() == 2
+
+    fresh = _node(client, "fresh", clock=lambda: now[0])
+    fresh.poll()
+
+    assert len(fresh) == 2
+    assert fresh.search([1.0, 0.0], 0.99)[0].payload == {"answer": "new"}
+    assert fresh.search([0.6, 0.8], 0.99)[0].payload == {"answer": "after"}
+
+
+def test_replicated_semantic_cache_against_local_redis_server() -> None:
+    client = redis.Redis(socket_connect_timeout=0.2)
+    try:
+        client.ping()
+    except redis.exceptions.ConnectionError:
+        pytest.skip("no local redis-server")
+    stream = "intent_cache_test:semantic"
+    client.delete(stream, f"{stream}:snapshot", f"{stream}:offsets:a", f"{stream}:offsets:b")
+    first = ReplicatedSemanticCache(InMemorySemanticCache(_embedder), client, stream, node_id="a")
+    second = ReplicatedSemanticCache(InMemorySemanticCache(_embedder), client, stream, node_id="b")
+
+    first.add([1.0, 0.0], _artifact("live"))
+
+    assert second.search([1.0, 0.0], 0.9)[0].payload == {"answer": "live"}
+    client.delete(stream, f"{stream}:snapshot", f"{stream}:offsets:a", f"{stream}:offsets:b")
@@ -0,0 +1,28 @@
+from intent_cache_agent.registry import SimpleIntentRegistry
+
+
+def test_registry_validates_allowed_and_required_slots() -> None:
+    registry = SimpleIntentRegistry(
+        allowed_intents={"faq"},
+        allowed_slots={"faq": {"topic", "lang"}},
+        required_slots={"faq": {"topic"}},
+    )
+
+    assert registry.validate_slots("faq", {"topic": "billing"})
+    assert not registry.validate_slots("faq", {"lang": "en"})
+    assert not registry.validate_slots("faq", {"topic": "billing", "extra": 1})
+    assert not registry.validate_slots("other", {})
+
+
+def test_registry_coerces_slots_with_schema() -> None:
+    registry = SimpleIntentRegistry(
+        allowed_intents={"orders"},
+        required_slots={"orders": {"days"}},
+        slot_schemas={"orders": {"days": int, "region": str}},
+    )
+
+    assert registry.coerce_slots("orders", {"days": "7"}) == {"days": 7}
+    assert registry.coerce_slots("orders", {"days": 7, "region": "eu"}) == {"days": 7, "region": "eu"}
+    assert registry.coerce_slots("orders", {"days": "seven"}) is None
+    assert registry.coerce_slots("orders", {"region": "eu"}) is None
+    assert registry.coerce_slots("orders", {"days": 7, "unknown": True}) is None
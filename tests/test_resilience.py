@@ -0,0 +1,52 @@
+import pytest
+
+from intent_cache_agent.resilience import CircuitBreaker, LatencyBudget
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_latency_budget_carries_unused_time_forward() -> None:
+    clock = FakeClock()
+    budget = LatencyBudget(100, clock=clock)
+
+    assert budget.timeout_for("normalize") == pytest.approx(0.04)
+    clock.now = 0.01
+    assert budget.timeout_for("exact_get") == pytest.approx(0.09 * 0.2 / 0.6)
+    assert budget.timeout_for("search") == pytest.approx(0.09)
+    clock.now = 0.2
+    assert budget.timeout_for("search") == 0.0
+
+
+def test_latency_budget_rejects_unknown_stage_shares() -> None:
+    with pytest.raises(ValueError):
+        LatencyBudget(100, {"render": 1.0})
+
+
+def test_circuit_breaker_opens_cools_down_and_probes() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, cooldown_seconds=10, clock=clock)
+
+    breaker.record_failure(timed_out=True)
+    assert breaker.allow()
+    breaker.record_failure(timed_out=False)
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    clock.now = 10
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure(timed_out=True)
+    assert breaker.state == "open"
+
+    clock.now = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.stats() == {"state": "closed", "timeouts": 2, "errors": 1, "short_circuits": 2, "opened": 2}
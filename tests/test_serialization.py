@@ -0,0 +1,129 @@
+import json
+import pickle
+from dataclasses import asdict, fields, replace
+
+from intent_cache_agent.cache import InMemoryExactCache
+from intent_cache_agent.models import Artifact, CacheHit, LazyArtifact
+from intent_cache_agent.serialization import (
+    artifact_json,
+    artifact_to_dict,
+    decode_envelope,
+    encode_artifact,
+    encode_envelope,
+)
+
+
+def _artifact() -> Artifact:
+    return Artifact(
+        type="intent_cache",
+        payload={"answer": "café", "rows": [1, 2, 3]},
+        version="v1",
+        scope={"tenant": "demo"},
+        ttl_seconds=3600,
+    )
+
+
+def test_artifact_json_splices_provenance_into_pre_encoded_body() -> None:
+    artifact = replace(_artifact(), provenance={"source": "cache", "key": "k", "score": None})
+    encoded = encode_artifact(artifact)
+
+    assert encoded.encoded_json is not None
+    assert artifact_json(encoded) == artifact_json(artifact)
+    assert json.loads(artifact_json(encoded)) == artifact_to_dict(artifact)
+
+
+def test_exact_cache_pre_encodes_on_set() -> None:
+    cache = InMemoryExactCache(pre_encode=True)
+    cache.set("key", _artifact())
+
+    stored = cache.get("key")
+    assert stored is not None
+    assert stored.encoded_json is not None
+    assert stored == _artifact()
+
+
+def test_replace_drops_pre_encoded_body_of_cached_and_lazy_artifacts() -> None:
+    cache = InMemoryExactCache(pre_encode=True)
+    cache.set("key", replace(_artifact(), payload={"answer": "old"}))
+    raw, _ = encode_envelope(replace(_artifact(), payload={"answer": "old"}))
+
+    for stored in (cache.get("key"), decode_envelope(raw, lambda count, generation: iter(()))):
+        upgraded = replace(stored, version="v2", payload={"text": "new"})
+
+        assert upgraded.encoded_json is None
+        body = json.loads(artifact_json(upgraded))
+        assert (body["version"], body["payload"]) == ("v2", {"text": "new"})
+        assert json.loads(artifact_json(encode_artifact(upgraded)))["payload"] == {"text": "new"}
+
+
+def test_pre_encoded_body_is_not_a_dataclass_field() -> None:
+    encoded = encode_artifact(_artifact())
+
+    assert "encoded_json" not in {field.name for field in fields(encoded)}
+    assert Artifact(**asdict(encoded)) == encoded
+    assert json.dumps(asdict(encoded)).count("rows") == 1
+
+
+def test_envelope_round_trip_keeps_payload_encoded_until_read() -> None:
+    artifact = Artifact(
+        type="report", payload={"rows": [1, 2]}, version=2, scope={"tenant": "t1"}, ttl_seconds=5, provenance={"a": 1}
+    )
+
+    raw, chunks = encode_envelope(artifact)
+    lazy = decode_envelope(raw, lambda count, generation: iter(()))
+
+    assert chunks == []
+    assert isinstance(lazy, LazyArtifact) and not lazy.payload_decoded
+    assert json.loads(artifact_json(lazy)) == json.loads(artifact_json(artifact))
+    assert not lazy.payload_decoded
+    assert lazy.payload == {"rows": [1, 2]}
+    assert lazy.provenance == {"a": 1}
+    assert replace(lazy, ttl_seconds=1) == replace(artifact, ttl_seconds=1)
+    assert pickle.loads(pickle.dumps(lazy)) == artifact
+
+
+def test_envelope_splits_large_payloads_into_chunks() -> None:
+    artifact = Artifact(type="report", payload="x" * 100, version="v1", scope={}, ttl_seconds=0)
+
+    raw, chunks = encode_envelope(artifact, chunk_threshold=50, chunk_size=30)
+    lazy = decode_envelope(raw, lambda count, generation: iter(chunks[:count]))
+
+    assert b"xxx" not in raw
+    assert [len(chunk) for chunk in chunks] == [30, 30, 30, 12]
+    assert lazy.payload_size == 102
+    assert b"".join(lazy.payload_chunks()) == b"".join(chunks)
+    assert lazy.payload == "x" * 100
+
+
+def test_chunked_envelope_names_its_generation_first() -> None:
+    raw, chunks = encode_envelope(_artifact(), chunk_threshold=10, chunk_size=16, generation="ab12")
+    inline, _ = encode_envelope(_artifact(), generation="ab12")
+
+    assert chunks and raw.startswith(b'{"envelope": 1, "generation": "ab12", ')
+    assert b"generation" not in inline
+
+
+def test_artifact_json_of_cache_hit_skips_provenance_dict() -> None:
+    stored = encode_artifact(replace(_artifact(), provenance={"origin": "seed"}))
+    hit = CacheHit(artifact=stored, source="cache", key="k", score=None)
+    clashing = CacheHit(artifact=replace(stored, provenance={"score": 1}), source="semantic", key="k", score=0.9)
+
+    encoded = artifact_json(hit)
+
+    assert hit._provenance is None
+    assert encoded == artifact_json(replace(stored, provenance=dict(hit.provenance)))
+    assert json.loads(encoded)["provenance"] == {"origin": "seed", "source": "cache", "key": "k", "score": None}
+    assert json.loads(artifact_json(clashing))["provenance"] == {"score": 0.9, "source": "semantic", "key": "k"}
+
+
+def test_cache_hits_and_lazy_artifacts_compare_equal_to_artifacts() -> None:
+    stored = encode_artifact(_artifact())
+    hit = CacheHit(artifact=stored, source="cache", key="k", score=None)
+    expected = replace(stored, provenance={"source": "cache", "key": "k", "score": None})
+    raw, _ = encode_envelope(stored)
+    lazy = decode_envelope(raw, lambda count, generation: iter(()))
+
+    assert hit == expected and expected == hit
+    assert hit != stored and hit != replace(expected, payload="other")
+    assert lazy == stored and stored == lazy
+    assert lazy != hit
@@ -0,0 +1,113 @@
+from intent_cache_agent.cache import InMemoryExactCache
+from intent_cache_agent.models import Artifact
+from intent_cache_agent.sharding import HashRing, ShardedExactCache
+
+
+def _artifact(scope=None) -> Artifact:
+    return Artifact(type="intent_cache", payload={"answer": "ok"}, version="v1", scope=scope or {}, ttl_seconds=60)
+
+
+class CountingCache(InMemoryExactCache):
+    def __init__(self) -> None:
+        super().__init__()
+        self.gets = 0
+        self.batches: list = []
+
+    def get(self, key):
+        self.gets += 1
+        return super().get(key)
+
+    def get_many(self, keys):
+        self.batches.append(list(keys))
+        found = {key: InMemoryExactCache.get(self, key) for key in keys}
+        return {key: hit for key, hit in found.items() if hit is not None}
+
+
+def test_hash_ring_spreads_keys_and_moves_few_on_add() -> None:
+    ring = HashRing(["a", "b", "c", "d"])
+    keys = [f"key-{i}" for i in range(4000)]
+    before = {key: ring.lookup(key)[0] for key in keys}
+
+    counts = {node: list(before.values()).count(node) for node in ring.nodes}
+    assert min(counts.values()) > 600
+
+    ring.add("e")
+    after = {key: ring.lookup(key)[0] for key in keys}
+    moved = [key for key in keys if before[key] != after[key]]
+    assert all(after[key] == "e" for key in moved)
+    assert 0.1 < len(moved) / len(keys) < 0.3
+
+    ring.remove("e")
+    assert {key: ring.lookup(key)[0] for key in keys} == before
+
+
+def test_hash_ring_returns_distinct_replicas() -> None:
+    ring = HashRing(["a", "b", "c"], virtual_nodes=8)
+
+    owners = ring.lookup("key", 2)
+
+    assert len(owners) == 2 and len(set(owners)) == 2
+    assert ring.lookup("key", 5) == ring.lookup("key", 3)
+
+
+def test_sharded_cache_routes_keys_to_single_node() -> None:
+    nodes = {name: InMemoryExactCache() for name in ("a", "b", "c")}
+    cache = ShardedExactCache(nodes)
+
+    for i in range(30):
+        cache.set(f"k{i}", _artifact())
+
+    assert sum(len(node) for node in nodes.values()) == 30
+    assert all(len(node) > 0 for node in nodes.values())
+    assert cache.get("k7") is not None
+    assert cache.delete("k7")
+    assert cache.get("k7") is None
+
+
+def test_sharded_cache_replicates_and_spreads_reads() -> None:
+    nodes = {name: CountingCache() for name in ("a", "b", "c")}
+    cache = ShardedExactCache(nodes, replicas=2)
+    cache.set("hot", _artifact())
+
+    for _ in range(10):
+        assert cache.get("hot") is not None
+
+    owners = cache.nodes_for("hot")
+    assert sum(len(node) for node in nodes.values()) == 2
+    assert [nodes[name].gets for name in owners] == [5, 5]
+
+
+def test_sharded_cache_batches_gets_per_node() -> None:
+    nodes = {name: CountingCache() for name in ("a", "b")}
+    cache = ShardedExactCache(nodes)
+    keys = [f"k{i}" for i in range(20)]
+    for key in keys[:10]:
+        cache.set(key, _artifact())
+
+    found = cache.get_many(keys)
+
+    assert set(found) == set(keys[:10])
+    assert sum(len(node.batches) for node in nodes.values()) == 2
+    assert all(node.gets == 0 for node in nodes.values())
+
+
+def test_sharded_cache_invalidates_every_node() -> None:
+    cache = ShardedExactCache({name: InMemoryExactCache() for name in ("a", "b", "c")})
+    for i in range(12):
+        cache.set(f"k{i}", _artifact({"tenant": "t1" if i % 2 else "t2"}), intent="faq")
+
+    assert cache.invalidate(scope={"tenant": "t1"}) == 6
+    assert cache.get("k1") is None
+    assert cache.get("k2") is not None
+
+
+def test_sharded_cache_add_node_keeps_most_keys_reachable() -> None:
+    cache = ShardedExactCache({name: InMemoryExactCache() for name in ("a", "b", "c")})
+    keys = [f"k{i}" for i in range(300)]
+    for key in keys:
+        cache.set(key, _artifact())
+
+    cache.add_node("d", InMemoryExactCache())
+
+    hits = sum(cache.get(key) is not None for key in keys)
+    assert 0.6 * len(keys) < hits < len(keys)
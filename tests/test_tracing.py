@@ -0,0 +1,137 @@
+import io
+import math
+
+from intent_cache_agent.cache import InMemoryExactCache, InMemorySemanticCache
+from intent_cache_agent.core import CachedIntentAgent
+from intent_cache_agent.models import Artifact, CacheOptions, NormalizedIntent
+from intent_cache_agent.registry import SimpleIntentRegistry
+from intent_cache_agent.replay import ReplayConfig, replay
+from intent_cache_agent.tracing import LookupOutcome, LookupTrace, TraceEvent, TraceRecorder, hash_key, read_trace
+
+
+class SlotNormalizer:
+    def normalize(self, text: str, context=None):
+        if text == "?":
+            return None
+        return NormalizedIntent(intent="faq", slots={"topic": text}, meta=None)
+
+
+def _event(timestamp: float, key: str, outcome=LookupOutcome.MISS, score=math.nan) -> TraceEvent:
+    return TraceEvent(timestamp, hash_key(key), "faq", "", outcome, score, 0, 0, 0)
+
+
+def test_trace_recorder_round_trip() -> None:
+    buffer = io.BytesIO()
+    recorder = TraceRecorder(buffer, buffer_events=2)
+    for index in range(5):
+        recorder.record(
+            LookupTrace(
+                timestamp=float(index),
+                key=f"k{index % 2}",
+                intent="faq" if index else None,
+                scope={"tenant": "t1"},
+                outcome=LookupOutcome.SEMANTIC_HIT,
+                semantic_score=0.5,
+                exact_us=index,
+            )
+        )
+    recorder.flush()
+
+    events = list(read_trace(io.BytesIO(buffer.getvalue())))
+
+    assert [event.timestamp for event in events] == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert events[1].key_hash == events[3].key_hash == hash_key("k1")
+    assert [event.intent for event in events[:2]] == ["", "faq"]
+    assert events[4].scope == '{"tenant":"t1"}'
+    assert events[4].outcome is LookupOutcome.SEMANTIC_HIT
+    assert events[4].semantic_score == 0.5
+    assert events[4].exact_us == 4
+    assert len(buffer.getvalue()) < 5 * 64
+
+
+def test_cached_agent_records_lookup_outcomes() -> None:
+    buffer = io.BytesIO()
+    recorder = TraceRecorder(buffer)
+    exact_cache = InMemoryExactCache()
+    semantic_cache = InMemorySemanticCache(lambda intent, slots: [1.0, 0.0] if slots["topic"] == "a" else [0.6, 0.8])
+    artifact = Artifact(type="intent_cache", payload={}, version="v1", scope={}, ttl_seconds=0)
+    semantic_cache.add([1.0, 0.0], artifact)
+    agent = CachedIntentAgent(
+        normalizer=SlotNormalizer(),
+        registry=SimpleIntentRegistry(allowed_intents={"faq"}),
+        exact_cache=exact_cache,
+        semantic_cache=semantic_cache,
+        default_options=CacheOptions(enable_semantic=True, min_score=0.9),
+        trace_recorder=recorder,
+    )
+
+    assert agent.lookup("?") is None
+    assert agent.lookup("a") is not None
+    assert agent.lookup("b") is None
+    assert agent.lookup("b", options=CacheOptions(cache_bypass=True)) is None
+    recorder.flush()
+
+    events = list(read_trace(io.BytesIO(buffer.getvalue())))
+    assert [event.outcome for event in events] == [
+        LookupOutcome.NO_INTENT,
+        LookupOutcome.SEMANTIC_HIT,
+        LookupOutcome.MISS,
+        LookupOutcome.BYPASS,
+    ]
+    assert events[1].intent == "faq"
+    assert events[1].semantic_score == 1.0
+    assert abs(events[2].semantic_score - 0.6) < 1e-6
+    assert math.isnan(events[0].semantic_score)
+
+
+def test_tracing_does_not_change_semantic_cache_state() -> None:
+    vectors = {"a": [1.0, 0.0], "b": [0.0, 1.0], "near": [0.6, 0.8]}
+
+    def run(recorder):
+        semantic_cache = InMemorySemanticCache(lambda intent, slots: vectors[slots["topic"]], max_entries=2)
+        for topic in ("a", "b"):
+            semantic_cache.add(vectors[topic], Artifact("intent_cache", {"topic": topic}, "v1", {}, 0), key=topic)
+        agent = CachedIntentAgent(
+            normalizer=SlotNormalizer(),
+            registry=SimpleIntentRegistry(allowed_intents={"faq"}),
+            exact_cache=InMemoryExactCache(),
+            semantic_cache=semantic_cache,
+            default_options=CacheOptions(enable_semantic=True, min_score=0.9),
+            trace_recorder=recorder,
+        )
+        agent.lookup("b")
+        agent.lookup("a")
+        assert agent.lookup("near") is None  # best match "b" at 0.8, below the threshold
+        semantic_cache.add([0.6, 0.8], Artifact("intent_cache", {"topic": "c"}, "v1", {}, 0), key="c")
+        return sorted(semantic_cache._keys), semantic_cache.partition_stats()[None].hits
+
+    buffer = io.BytesIO()
+    with TraceRecorder(buffer) as recorder:
+        traced = run(recorder)
+        assert run(None) == traced == (["a", "c"], 2)
+
+
+def test_replay_compares_capacities_and_thresholds() -> None:
+    events = [_event(float(t), key) for t, key in enumerate(["a", "b", "a", "c", "a", "b"])]
+    events.append(_event(6.0, "", LookupOutcome.NO_INTENT))
+
+    unbounded = replay(events, ReplayConfig())
+    tiny = replay(events, ReplayConfig(capacity=1))
+
+    assert (unbounded.exact_hits, unbounded.misses, unbounded.uncacheable) == (3, 3, 1)
+    assert unbounded.peak_entries == 3
+    assert unbounded.projected_bytes == 3 * 2048
+    assert tiny.exact_hits == 0
+    assert tiny.peak_entries == 1
+
+    semantic = [_event(0.0, "a"), _event(1.0, "b", score=0.95), _event(2.0, "c", score=0.5)]
+    report = replay(semantic, ReplayConfig(semantic_threshold=0.9))
+    assert (report.semantic_hits, report.misses, report.calls_saved) == (1, 2, 1)
+
+
+def test_replay_expires_entries_on_trace_time() -> None:
+    events = [_event(0.0, "a"), _event(5.0, "a"), _event(20.0, "a")]
+
+    report = replay(events, ReplayConfig(ttl_seconds=10))
+
+    assert (report.exact_hits, report.misses) == (1, 2)
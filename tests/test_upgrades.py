@@ -0,0 +1,34 @@
+from dataclasses import replace
+
+from intent_cache_agent.models import Artifact
+from intent_cache_agent.upgrades import UpgradeRegistry
+
+
+def _artifact(version: str, payload: dict) -> Artifact:
+    return Artifact(type="intent_cache", payload=payload, version=version, scope={}, ttl_seconds=0)
+
+
+def test_upgrade_registry_chains_steps_through_intermediate_versions() -> None:
+    registry = UpgradeRegistry()
+    registry.register("v1", "v2", lambda a: replace(a, version="v2", payload={"text": a.payload["answer"]}))
+
+    @registry.register("v2", "v3")
+    def add_format(artifact: Artifact) -> Artifact:
+        return replace(artifact, version="v3", payload={**artifact.payload, "format": "plain"})
+
+    upgraded = registry.upgrade(_artifact("v1", {"answer": "hi"}), "v1", "v3")
+
+    assert upgraded is not None
+    assert upgraded.version == "v3"
+    assert upgraded.payload == {"text": "hi", "format": "plain"}
+    assert registry.can_upgrade("v1", "v3")
+    assert not registry.can_upgrade("v3", "v1")
+    assert registry.upgrade(_artifact("v3", {}), "v3", "v1") is None
+
+
+def test_upgrade_registry_step_can_reject_artifact() -> None:
+    registry = UpgradeRegistry()
+    registry.register("v1", "v2", lambda a: None if "answer" not in a.payload else replace(a, version="v2"))
+
+    assert registry.upgrade(_artifact("v1", {}), "v1", "v2") is None
+    assert registry.upgrade(_artifact("v1", {"answer": "ok"}), "v1", "v2") is not None
@@ -0,0 +1,121 @@
+import math
+import random
+
+import pytest
+
+from intent_cache_agent.cache import InMemorySemanticCache
+from intent_cache_agent.models import Artifact
+from intent_cache_agent.vector_store import (
+    Float32VectorStore,
+    Int8VectorStore,
+    ListVectorStore,
+    ProductQuantizedVectorStore,
+)
+
+
+def _random_vectors(count: int, dim: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [[rng.uniform(-1.0, 1.0) for _ in range(dim)] for _ in range(count)]
+
+
+def _artifact(answer: str) -> Artifact:
+    return Artifact(type="intent_cache", payload={"answer": answer}, version="v1", scope={}, ttl_seconds=3600)
+
+
+def test_float32_store_matches_list_store() -> None:
+    vectors = _random_vectors(20, 16)
+    exact = ListVectorStore()
+    packed = Float32VectorStore()
+    for vector in vectors:
+        exact.add(vector)
+        packed.add(vector)
+
+    query = vectors[3]
+    for a, b in zip(exact.scores(query), packed.scores(query)):
+        assert math.isclose(a, b, abs_tol=1e-5)
+
+
+def test_int8_store_approximates_cosine() -> None:
+    vectors = _random_vectors(50, 32)
+    exact = ListVectorStore()
+    quantized = Int8VectorStore()
+    for vector in vectors:
+        exact.add(vector)
+        quantized.add(vector)
+
+    query = vectors[10]
+    for a, b in zip(exact.scores(query), quantized.scores(query)):
+        assert abs(a - b) < 0.02
+
+
+def test_int8_store_rejects_dimension_mismatch() -> None:
+    store = Int8VectorStore()
+    store.add([1.0, 0.0])
+    with pytest.raises(ValueError):
+        store.add([1.0, 0.0, 0.0])
+    assert store.scores([1.0, 0.0, 0.0]) == [-1.0]
+
+
+def test_semantic_cache_rescores_quantized_candidates() -> None:
+    vectors = _random_vectors(40, 16)
+    cache = InMemorySemanticCache(
+        embedder=lambda intent, slots: [],
+        vector_store=Int8VectorStore(keep_originals=True),
+        rescore_k=4,
+    )
+    for index, vector in enumerate(vectors):
+        cache.add(vector, _artifact(str(index)))
+
+    result = cache.search(vectors[25], min_score=0.9)
+    assert result is not None
+    assert result[0].payload["answer"] == "25"
+    assert math.isclose(result[1], 1.0, abs_tol=1e-5)
+
+
+def test_product_quantized_store_trains_and_searches() -> None:
+    pytest.importorskip("numpy")
+    vectors = _random_vectors(64, 16)
+    store = ProductQuantizedVectorStore(num_subvectors=4, num_centroids=16, train_size=32, keep_originals=True)
+    cache = InMemorySemanticCache(embedder=lambda intent, slots: [], vector_store=store, rescore_k=8)
+    for index, vector in enumerate(vectors):
+        cache.add(vector, _artifact(str(index)))
+
+    assert store.trained
+    result = cache.search(vectors[50], min_score=0.9)
+    assert result is not None
+    assert result[0].payload["answer"] == "50"
+
+
+def test_int8_store_compact_keeps_selected_slots() -> None:
+    vectors = _random_vectors(6, 8)
+    store = Int8VectorStore(keep_originals=True)
+    for vector in vectors:
+        store.add(vector)
+
+    store.compact([1, 4])
+    assert len(store) == 2
+    scores = store.rescore(vectors[4], [0, 1])
+    assert math.isclose(scores[1], 1.0, abs_tol=1e-5)
+
+
+@pytest.mark.parametrize("store_type", [Float32VectorStore, Int8VectorStore])
+def test_numpy_scoring_matches_pure_python(store_type) -> None:
+    pytest.importorskip("numpy")
+    vectors = _random_vectors(30, 12)
+    fast, slow = store_type(), store_type()
+    slow._np = None
+    for vector in vectors + [[0.0] * 12]:
+        fast.add(vector)
+        slow.add(vector)
+
+    query = vectors[5]
+    for a, b in zip(fast.scores(query), slow.scores(query)):
+        assert math.isclose(a, b, abs_tol=1e-5)
+    slots = [7, 30, 2]
+    for a, b in zip(fast.rescore(query, slots), slow.rescore(query, slots)):
+        assert math.isclose(a, b, abs_tol=1e-5)
+
+
+def test_int8_store_without_originals_skips_rescoring() -> None:
+    assert not Int8VectorStore().approximate
+    assert Int8VectorStore(keep_originals=True).approximate
@@ -0,0 +1,124 @@
+import threading
+import time
+
+from intent_cache_agent.cache import InMemoryExactCache, InMemorySemanticCache
+from intent_cache_agent.models import Artifact
+from intent_cache_agent.write_behind import WriteBehindCache
+
+
+def _artifact(answer: str) -> Artifact:
+    return Artifact(type="intent_cache", payload={"answer": answer}, version="v1", scope={}, ttl_seconds=0)
+
+
+class BatchingExactCache(InMemoryExactCache):
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches = []
+
+    def set_many(self, writes):
+        self.batches.append([write.key for write in writes])
+        for write in writes:
+            self.set(write.key, write.artifact, write.ttl_seconds, intent=write.intent, tags=write.tags)
+
+
+class GatedExactCache(InMemoryExactCache):
+    def __init__(self) -> None:
+        super().__init__()
+        self.gate = threading.Event()
+
+    def set(self, key, artifact, ttl_seconds=None, **labels):
+        self.gate.wait(5)
+        super().set(key, artifact, ttl_seconds, **labels)
+
+
+def test_write_behind_batches_coalesces_and_reads_queued_writes() -> None:
+    backend = BatchingExactCache()
+    with WriteBehindCache(backend, batch_size=10, flush_interval_ms=50) as cache:
+        cache.set("a", _artifact("first"))
+        cache.set("b", _artifact("b"), intent="faq")
+        cache.set("a", _artifact("second"))
+
+        assert cache.get("a").payload == {"answer": "second"}
+        assert cache.flush(timeout=5)
+
+    assert backend.get("a").payload == {"answer": "second"}
+    assert backend.batches == [["b", "a"]]
+    assert (cache.stats.queued, cache.stats.coalesced, cache.stats.written) == (2, 1, 2)
+    assert backend.invalidate(intent="faq") == 1
+
+
+def test_write_behind_drops_writes_when_queue_stays_full() -> None:
+    backend = GatedExactCache()
+    cache = WriteBehindCache(backend, max_pending=1, batch_size=1, flush_interval_ms=0, block_timeout_seconds=0)
+    try:
+        assert cache.set("a", _artifact("a"))
+        cache.flush(timeout=0.05)  # the worker is now blocked writing "a"
+        assert cache.set("b", _artifact("b"))
+        assert not cache.set("c", _artifact("c"))
+        assert cache.get("a") is not None and cache.get("b") is not None
+    finally:
+        backend.gate.set()
+        cache.close()
+
+    assert cache.stats.dropped == 1
+    assert backend.get("b") is not None and backend.get("c") is None
+
+
+def test_write_behind_embeds_semantic_adds_on_the_worker() -> None:
+    threads = []
+
+    def embedder(intent, slots):
+        threads.append(threading.current_thread().name)
+        return [1.0, 0.0]
+
+    semantic = InMemorySemanticCache(embedder)
+    with WriteBehindCache(InMemoryExactCache(), semantic) as cache:
+        cache.add_semantic("faq", {"topic": "billing"}, _artifact("s"), key="k")
+
+    assert semantic.search([1.0, 0.0], 0.9)[0].payload == {"answer": "s"}
+    assert threads == ["intent-cache-write-behind"]
+
+
+def test_write_behind_counts_failed_flushes_and_keeps_running() -> None:
+    class FailingCache(InMemoryExactCache):
+        def set(self, key, artifact, ttl_seconds=None, **labels):
+            if key == "bad":
+                raise ConnectionError("down")
+            super().set(key, artifact, ttl_seconds, **labels)
+
+    backend = FailingCache()
+    with WriteBehindCache(backend, batch_size=1) as cache:
+        cache.set("bad", _artifact("x"))
+        cache.flush(timeout=5)
+        cache.set("good", _artifact("y"))
+
+    assert cache.stats.errors == 1 and isinstance(cache.last_error, ConnectionError)
+    assert backend.get("good") is not None
+
+
+def test_write_behind_flushes_a_partial_batch_after_the_interval() -> None:
+    backend = InMemoryExactCache()
+    with WriteBehindCache(backend, flush_interval_ms=5) as cache:
+        cache.set("k", _artifact("v"))
+        deadline = time.monotonic() + 2
+        while backend.get("k") is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert backend.get("k") is not None
+        assert cache.stats.written == 1
+
+
+def test_write_behind_semantic_adds_do_not_break_concurrent_searches() -> None:
+    semantic = InMemorySemanticCache(lambda intent, slots: [1.0, float(slots["n"])], max_entries=200)
+    errors = []
+    with WriteBehindCache(InMemoryExactCache(), semantic, batch_size=50) as cache:
+        for index in range(2000):
+            cache.add_semantic("faq", {"n": index}, _artifact(str(index)), ttl_seconds=0)
+        while len(cache):
+            try:
+                semantic.search_top_k([1.0, 0.0], 0.1, 5)
+            except Exception as exc:  # pragma: no cover - reported below
+                errors.append(exc)
+
+    assert errors == []
+    assert len(semantic) == 200